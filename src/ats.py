@@ -2,9 +2,11 @@
 # THIS IS YET UNDER DEVELOPMENT.
 # I AM JUST ADDING IT TO GITHUB TO KEEP A COPY ON REMOTE SERVER.
 import re
-import spacy
-from sentence_transformers import SentenceTransformer
-from text_cleaner import TextCleaner
+import argparse
+import registry
+import streaming
+from embedding_cache import EmbeddingCache, encode_with_cache
+from segmenter import SectionSegmenter
 
 class ATS:
     """
@@ -23,16 +25,31 @@ class ATS:
         "Teaching Experience",
     ]
 
-    def __init__(self):
+    # Compiled once for the class; every instance shares it
+    SEGMENTER = SectionSegmenter(RESUME_SECTIONS)
+
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+
+    def __init__(self, cache_dir=None):
         """
         Initializes the ATS.
+
+        :param cache_dir: Optional directory of the persistent embedding cache
         """
-        self.nlp = spacy.load('en_core_web_sm')
+        self.model = None
+        self.embedding_cache = EmbeddingCache(cache_dir, self.MODEL_NAME) if cache_dir else None
         # self.resume_content = None
         # self.jd_content = None
         # self.cleaned_experience = None
         # self.cleaned_skills = None
 
+    @property
+    def nlp(self):
+        """
+        The shared spaCy pipeline, loaded on first use.
+        """
+        return registry.get_nlp()
+
     def load_resume(self, resume_content):
         """
         Loads the resume content from a string.
@@ -40,6 +57,7 @@ class ATS:
         :param resume_content: Resume content as a string
         """
         self.resume_content = resume_content
+        self.sections = self.SEGMENTER.segment(resume_content)
 
     def load_job_description(self, jd_content):
         """
@@ -55,13 +73,10 @@ class ATS:
 
         :return: List of extracted skills
         """
-        skills_pattern = re.compile(r'Skills\s*[:\n]', re.IGNORECASE)
-        skills_match = skills_pattern.search(self.resume_content)
+        skills_match = self.SEGMENTER.find(self.sections, "Skills")
 
         if skills_match:
-            skills_start = skills_match.end()
-            skills_end = self.resume_content.find('\n\n', skills_start)
-            skills_section = self.resume_content[skills_start:skills_end].strip()
+            skills_section = self.resume_content[skills_match.body_start:skills_match.end].strip()
             skills_lines = skills_section.split('\n')
 
             extracted_skills = []
@@ -79,18 +94,11 @@ class ATS:
 
         :return: Experience section as a string
         """
-        experience_start = self.resume_content.find("Experience")
-        if experience_start == -1:
+        experience = self.SEGMENTER.find(self.sections, "Experience")
+        if experience is None:
             return ""
 
-        experience_end = len(self.resume_content)
-        for section in self.RESUME_SECTIONS:
-            if section != "Experience":
-                section_start = self.resume_content.find(section, experience_start)
-                if section_start != -1:
-                    experience_end = min(experience_end, section_start)
-
-        experience_section = self.resume_content[experience_start:experience_end].strip()
+        experience_section = self.resume_content[experience.body_start:experience.end].strip()
         return experience_section
 
     def clean_experience(self, experience):
@@ -102,7 +110,7 @@ class ATS:
         experience : str
             The raw experience text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_experience = cleaner.clean_text(experience)
 
     def clean_skills(self, skills):
@@ -114,7 +122,7 @@ class ATS:
         skills : str
             The raw skills text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_skills = cleaner.clean_text(skills)
 
     def clean_jd(self):
@@ -124,7 +132,7 @@ class ATS:
         Returns:
             str: The cleaned job description text.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         cleaned_jd = cleaner.clean_text(self.jd_content)
         return cleaned_jd
 
@@ -135,37 +143,73 @@ class ATS:
         Returns:
             float: The similarity score between the cleaned resume and cleaned job description text.
         """
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        if self.model is None:
+            self.model = registry.get_sentence_model(self.MODEL_NAME)
         cleaned_resume = self.cleaned_experience + self.cleaned_skills
         cleaned_jd_text = self.clean_jd()
         sentences = [cleaned_resume, cleaned_jd_text]
-        embeddings1 = model.encode(sentences[0])
-        embeddings2 = model.encode(sentences[1])
+        # Consult the embedding cache before calling model.encode
+        embeddings = encode_with_cache(self.model, sentences, self.embedding_cache, normalize_embeddings=True)
+        embeddings1 = embeddings[0]
+        embeddings2 = embeddings[1]
         
-        similarity_score = model.similarity(embeddings1, embeddings2)
+        similarity_score = self.model.similarity(embeddings1, embeddings2)
 
         return similarity_score
 
+    def score_pairs(self, resume_contents, jd_contents):
+        """
+        Scores resume/job description pairs, encoding the whole batch in one call.
+
+        :param resume_contents: List of resume contents as strings
+        :param jd_contents: List of job description contents as strings, one per resume
+        :return: List of similarity scores, one per pair
+        """
+        if self.model is None:
+            self.model = registry.get_sentence_model(self.MODEL_NAME)
+        cleaner = registry.get_text_cleaner()
+        cleaned_resumes = []
+        for resume_content in resume_contents:
+            self.load_resume(resume_content)
+            self.clean_experience(self.extract_experience())
+            self.clean_skills(" ".join(self.extract_skills()))
+            cleaned_resumes.append(self.cleaned_experience + self.cleaned_skills)
+        cleaned_jds = cleaner.clean_many(jd_contents)
+
+        embeddings = encode_with_cache(self.model, cleaned_resumes + cleaned_jds, self.embedding_cache,
+                                       normalize_embeddings=True)
+        n_pairs = len(cleaned_resumes)
+        return [float(resume.dot(jd)) for resume, jd in zip(embeddings[:n_pairs], embeddings[n_pairs:])]
+
 if __name__ == "__main__":
-    # Get user input for resume and job description
-    resume_content = input("Please enter the resume content: ")
-    jd_content = input("Please enter the job description content: ")
-    
+    arg_parser = argparse.ArgumentParser(description="Score a resume against a job description.")
+    arg_parser.add_argument('--cache-dir', default=None)
+    streaming.add_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
     # Create an instance of ATS
-    ats = ATS()
-    
-    # Load and process data
-    ats.load_resume(resume_content)
-    ats.load_job_description(jd_content)
-    
-    # Extract and clean experience
-    experience = ats.extract_experience()
-    ats.clean_experience(experience)
-    
-    # Extract and clean skills
-    skills = " ".join(ats.extract_skills())
-    ats.clean_skills(skills)
-    
-    # Compute and print the similarity score
-    similarity_score = ats.compute_similarity()
-    print(f"The similarity score between the resume and job description is: {round(similarity_score.item() * 100, 2)}%")
\ No newline at end of file
+    ats = ATS(cache_dir=args.cache_dir)
+
+    if args.stream:
+        # Score JSON-lines records in batches instead of prompting for one pair
+        streaming.stream(ats.score_pairs, args.stream, batch_size=args.batch_size)
+    else:
+        # Get user input for resume and job description
+        resume_content = input("Please enter the resume content: ")
+        jd_content = input("Please enter the job description content: ")
+
+        # Load and process data
+        ats.load_resume(resume_content)
+        ats.load_job_description(jd_content)
+
+        # Extract and clean experience
+        experience = ats.extract_experience()
+        ats.clean_experience(experience)
+
+        # Extract and clean skills
+        skills = " ".join(ats.extract_skills())
+        ats.clean_skills(skills)
+
+        # Compute and print the similarity score
+        similarity_score = ats.compute_similarity()
+        print(f"The similarity score between the resume and job description is: {round(similarity_score.item() * 100, 2)}%")
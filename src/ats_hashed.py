@@ -0,0 +1,381 @@
+"""
+Out-of-core TF-IDF scoring for resume archives larger than memory.
+
+``HashedTfidfIndex`` is the streaming counterpart of ``ats_tfidf.TfidfCorpus``.
+Terms are mapped to columns with feature hashing, so there is no vocabulary to
+fit or hold in memory. Resumes are consumed lazily in a single pass: each chunk
+of ``chunk_size`` resumes is vectorized, its raw term counts are written to disk
+as one sparse file, and its document frequencies are added to a fixed
+``n_features`` array. IDF weighting and L2 normalisation are applied when a chunk
+is read back, so resumes can be appended later without rewriting earlier chunks;
+an append only rewrites the last chunk, to fill it up to ``chunk_size``.
+
+Scoring streams the chunks back one at a time and keeps only a running top-k per
+job description. Peak memory is one chunk, the document frequency array and one
+``chunk_size`` x JD score block, whatever the size of the archive. Apart from rare
+hash collisions, scores match ``TfidfCorpus`` (same tokenizer, smoothed IDF and
+cosine similarity).
+
+Usage:
+    python src/ats_hashed.py build resumes .ats_hashed --workers 8
+    python src/ats_hashed.py query .ats_hashed job_descriptions/jd_1.txt --top-k 20
+"""
+
+import argparse
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+import registry
+from ranking import top_k
+from streaming import batched
+
+# Upper bound on the dense chunk x JD score block built while scoring
+SCORE_BLOCK_BYTES = 64 * 2 ** 20
+
+
+class HashedTfidfIndex:
+    """
+    Hashed TF-IDF resume vectors stored on disk in fixed-size sparse chunks.
+
+    Attributes:
+    -----------
+    directory : str
+        The directory holding the index.
+    n_features : int
+        The number of hash buckets (columns).
+    chunk_size : int
+        The number of resumes per chunk file.
+    n_documents : int
+        The number of indexed resumes.
+    n_chunks : int
+        The number of chunk files.
+    document_frequencies : numpy.ndarray
+        The number of resumes containing each hashed term.
+    """
+
+    META_FILE = 'meta.json'
+    DF_FILE = 'df.npy'
+    CHUNK_FILE = 'chunk_{:06d}.npz'
+
+    def __init__(self, directory, n_features=2 ** 20, chunk_size=10000):
+        """
+        Opens (or prepares) the index under ``directory``.
+
+        Parameters:
+        -----------
+        directory : str
+            The directory of the index.
+        n_features : int
+            The number of hash buckets. Ignored when an existing index is reopened.
+        chunk_size : int
+            The number of resumes per chunk. Ignored when an existing index is reopened.
+        """
+        self.directory = directory
+        self.n_features = n_features
+        self.chunk_size = chunk_size
+        self.n_documents = 0
+        self.n_chunks = 0
+
+        meta_path = os.path.join(directory, self.META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as file:
+                meta = json.load(file)
+            self.n_features = meta['n_features']
+            self.chunk_size = meta['chunk_size']
+            self.n_documents = meta['n_documents']
+            self.n_chunks = meta['n_chunks']
+            self.document_frequencies = np.load(os.path.join(directory, self.DF_FILE))
+        else:
+            self.document_frequencies = np.zeros(self.n_features, dtype=np.int64)
+        self._vectorizer = None
+
+    @property
+    def vectorizer(self):
+        """
+        The stateless ``HashingVectorizer`` producing raw term counts.
+        """
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            # Same tokenization as TfidfVectorizer; no sign flipping or normalisation
+            # so the counts can be IDF-weighted later
+            self._vectorizer = HashingVectorizer(n_features=self.n_features, alternate_sign=False, norm=None,
+                                                 dtype=np.float32)
+        return self._vectorizer
+
+    def idf(self):
+        """
+        Returns the smoothed IDF weights, ``ln((1 + n) / (1 + df)) + 1`` as in ``TfidfVectorizer``.
+        """
+        return (np.log((1 + self.n_documents) / (1 + self.document_frequencies)) + 1).astype(np.float32)
+
+    def add(self, documents, ids):
+        """
+        Appends resumes to the index in one streaming pass.
+
+        Parameters:
+        -----------
+        documents : iterable of str
+            The cleaned resume texts; consumed lazily, ``chunk_size`` at a time.
+        ids : iterable of str
+            The id of each resume, in the same order.
+
+        Returns:
+        --------
+        int
+            The number of resumes added.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        pairs = iter(zip(ids, documents))
+        added = 0
+
+        # Fill the last chunk before opening a new one, so small appends do not leave a trail of tiny files
+        last = self.n_chunks - 1
+        free = self.chunk_size - self._chunk_rows(last) if last >= 0 else 0
+        batch = list(islice(pairs, max(free, 0)))
+        if batch:
+            import scipy.sparse
+
+            chunk_ids, texts = zip(*batch)
+            last_ids, last_counts = self._read_chunk(last)
+            self._write_chunk(last, np.concatenate([last_ids, np.array(chunk_ids, dtype=str)]),
+                              scipy.sparse.vstack([last_counts, self._count(texts)], format='csr'))
+            self.n_documents += len(batch)
+            added += len(batch)
+            self.save()
+
+        for batch in batched(pairs, self.chunk_size):
+            chunk_ids, texts = zip(*batch)
+            self._write_chunk(self.n_chunks, np.array(chunk_ids, dtype=str), self._count(texts))
+            self.n_chunks += 1
+            self.n_documents += len(batch)
+            added += len(batch)
+            # Persist after every chunk so an interrupted build keeps what it wrote
+            self.save()
+        return added
+
+    def _count(self, texts):
+        """
+        Returns the raw term counts of cleaned texts and adds their document frequencies.
+        """
+        counts = self.vectorizer.transform(texts).tocsr()
+        counts.sort_indices()
+        # Each row lists a term once, so bincount over the indices is the texts' DF
+        self.document_frequencies += np.bincount(counts.indices, minlength=self.n_features)
+        return counts
+
+    def _chunk_rows(self, chunk):
+        """
+        Returns the number of resumes stored in one chunk file, reading only its ids.
+        """
+        with np.load(os.path.join(self.directory, self.CHUNK_FILE.format(chunk))) as arrays:
+            return arrays['ids'].size
+
+    def _read_chunk(self, chunk):
+        """
+        Returns the resume ids and the raw term counts stored in one chunk file.
+        """
+        import scipy.sparse
+
+        with np.load(os.path.join(self.directory, self.CHUNK_FILE.format(chunk))) as arrays:
+            ids = arrays['ids']
+            counts = scipy.sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                             shape=(ids.size, self.n_features))
+        return ids, counts
+
+    def _write_chunk(self, chunk, ids, counts):
+        """
+        Writes one chunk file, replacing any previous version atomically.
+        """
+        path = os.path.join(self.directory, self.CHUNK_FILE.format(chunk))
+        with open(path + '.tmp', 'wb') as file:
+            np.savez(file, data=counts.data, indices=counts.indices.astype(np.int32),
+                     indptr=counts.indptr.astype(np.int64), ids=ids)
+        os.replace(path + '.tmp', path)
+
+    def add_directory(self, resume_dir, skills_path, workers=None, manifest=None):
+        """
+        Cleans and indexes every ``.txt`` resume of a directory.
+
+        Parameters:
+        -----------
+        resume_dir : str
+            The directory containing the resume text files.
+        skills_path : str
+            The path to the skills file.
+        workers : int, optional
+            The number of cleaning processes; see ``pipeline.ingest``.
+        manifest : CorpusManifest, optional
+            Reuses the cleaned text of unchanged resumes; see ``pipeline.ingest``.
+
+        Returns:
+        --------
+        int
+            The number of resumes added.
+        """
+        from pipeline import ingest, list_resumes
+
+        paths = list_resumes(resume_dir)
+        records = ingest(paths, skills_path, workers=workers, manifest=manifest)
+        documents = (record['cleaned_experience'] + record['cleaned_skills'] for record in records)
+        return self.add(documents, (os.path.basename(path) for path in paths))
+
+    def chunks(self):
+        """
+        Reads the chunks back one at a time.
+
+        Yields:
+        -------
+        tuple of (numpy.ndarray, scipy.sparse.csr_matrix)
+            The resume ids of the chunk and their raw term counts.
+        """
+        for chunk in range(self.n_chunks):
+            yield self._read_chunk(chunk)
+
+    def jd_vectors(self, jd_texts):
+        """
+        Vectorizes cleaned job descriptions into L2-normalised TF-IDF rows.
+        """
+        from sklearn.preprocessing import normalize
+
+        # Terms no resume contains are dropped, as TfidfVectorizer drops words outside its vocabulary
+        weights = np.where(self.document_frequencies > 0, self.idf(), 0).astype(np.float32)
+        return normalize(self.vectorizer.transform(jd_texts).multiply(weights).tocsr())
+
+    def iter_scores(self, jd_texts):
+        """
+        Scores cleaned job descriptions against the index, one chunk at a time.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The cleaned job description texts.
+
+        Yields:
+        -------
+        tuple of (numpy.ndarray, numpy.ndarray)
+            The resume ids of a chunk and their ``(chunk_rows, n_jds)`` cosine similarities.
+        """
+        idf = self.idf()
+        squared_idf = idf * idf
+        # Weighting the JD side by the IDF once more turns raw resume counts into TF-IDF dot products
+        jd_vectors = self.jd_vectors(jd_texts).multiply(idf).T.tocsc()
+        for ids, counts in self.chunks():
+            norms = np.sqrt(counts.multiply(counts) @ squared_idf)
+            scores = (counts @ jd_vectors).toarray()
+            scores /= np.maximum(norms, np.finfo(np.float32).tiny)[:, None]
+            yield ids, scores
+
+    def rank(self, jd_texts, top_k_resumes=10):
+        """
+        Finds the best resumes for each cleaned job description.
+
+        Job descriptions are scored in groups small enough to keep the chunk x JD
+        score block under ``SCORE_BLOCK_BYTES``; each group streams over the chunks.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The cleaned job description texts.
+        top_k_resumes : int
+            The number of best resumes to return per job description.
+
+        Returns:
+        --------
+        list of list of (str, float)
+            For each job description, ``(resume_id, score)`` pairs ordered from best to worst.
+        """
+        group_size = max(1, SCORE_BLOCK_BYTES // (8 * self.chunk_size))
+        rankings = []
+        for group in batched(jd_texts, group_size):
+            best = [([], np.empty(0, dtype=np.float64)) for _ in group]
+            for ids, scores in self.iter_scores(group):
+                for column, (best_ids, best_scores) in enumerate(best):
+                    # Merge the chunk's top-k with the running top-k; only 2k candidates are kept
+                    chunk_top = top_k(scores[:, column], top_k_resumes)
+                    candidate_ids = best_ids + [ids[index] for index, _ in chunk_top]
+                    candidate_scores = np.concatenate([best_scores, [score for _, score in chunk_top]])
+                    merged = top_k(candidate_scores, top_k_resumes)
+                    best[column] = ([candidate_ids[index] for index, _ in merged],
+                                    np.array([score for _, score in merged]))
+            rankings.extend([(str(id_), float(score)) for id_, score in zip(best_ids, best_scores)]
+                            for best_ids, best_scores in best)
+        return rankings
+
+    def rank_file(self, jd_path, top_k_resumes=10):
+        """
+        Finds the best resumes for a job description file.
+
+        Parameters:
+        -----------
+        jd_path : str
+            The path to the job description file.
+        top_k_resumes : int
+            The number of best resumes to return.
+
+        Returns:
+        --------
+        list of (str, float)
+            ``(resume_id, score)`` pairs ordered from best to worst.
+        """
+        with open(jd_path, 'r') as file:
+            jd = registry.get_text_cleaner().clean_text(file.read())
+        return self.rank([jd], top_k_resumes)[0]
+
+    def save(self):
+        """
+        Writes the document frequencies and the metadata to disk.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        df_path = os.path.join(self.directory, self.DF_FILE)
+        # Write to temporary files first so an interrupted run never corrupts the index
+        with open(df_path + '.tmp', 'wb') as file:
+            np.save(file, self.document_frequencies)
+        os.replace(df_path + '.tmp', df_path)
+        meta = {
+            'n_features': self.n_features,
+            'chunk_size': self.chunk_size,
+            'n_documents': self.n_documents,
+            'n_chunks': self.n_chunks,
+        }
+        meta_path = os.path.join(self.directory, self.META_FILE)
+        with open(meta_path + '.tmp', 'w') as file:
+            json.dump(meta, file)
+        os.replace(meta_path + '.tmp', meta_path)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Build or query an out-of-core hashed TF-IDF index.")
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="append a directory of resumes to the index")
+    build_parser.add_argument('resume_dir')
+    build_parser.add_argument('directory')
+    build_parser.add_argument('--skills', default='meta/skills.txt')
+    build_parser.add_argument('--workers', type=int, default=None)
+    build_parser.add_argument('--n-features', type=int, default=2 ** 20)
+    build_parser.add_argument('--chunk-size', type=int, default=10000)
+    build_parser.add_argument('--manifest', default=None, help="corpus manifest reused across builds")
+
+    query_parser = subparsers.add_parser('query', help="list the best resumes for a job description file")
+    query_parser.add_argument('directory')
+    query_parser.add_argument('jd')
+    query_parser.add_argument('--top-k', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        index = HashedTfidfIndex(args.directory, n_features=args.n_features, chunk_size=args.chunk_size)
+        manifest = None
+        if args.manifest:
+            from manifest import CorpusManifest, current_versions
+            manifest = CorpusManifest(args.manifest, current_versions(args.skills))
+        added = index.add_directory(args.resume_dir, args.skills, workers=args.workers, manifest=manifest)
+        if manifest is not None:
+            manifest.save()
+        print(f"Indexed {added} resumes ({index.n_documents} in {index.n_chunks} chunks)")
+    else:
+        for resume_id, score in HashedTfidfIndex(args.directory).rank_file(args.jd, args.top_k):
+            print(f"{score:.4f}\t{resume_id}")
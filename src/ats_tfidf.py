@@ -1,18 +1,37 @@
+import os
+import json
+import pickle
+import argparse
+
+import numpy as np
+
+import registry
+import streaming
+from dedup import representatives
+from document import Document
 from extractor import ResumeParser
-from text_cleaner import TextCleaner
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from instrumentation import NULL_INSTRUMENTATION
+from ranking import top_k
 
 class ATS:
     """
     A class to match a resume with a job description using TF-IDF vectorization and cosine similarity.
     """
     
-    def __init__(self):
+    def __init__(self, instrumentation=None):
         """
         Initializes the ATS with necessary attributes.
+
+        Parameters:
+        -----------
+        instrumentation : Instrumentation, optional
+            Records per-stage timings and memory; disabled when omitted.
         """
         self.parser = ResumeParser()
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.document = None
+        self.resume_document = None
+        self.jd_document = None
         self.cleaned_experience = None
         self.cleaned_skills = None
         self.jd = None
@@ -30,24 +49,41 @@ class ATS:
         skills_path : str
             The path to the skills file.
         """
-        # Load job description
-        with open(jd_path, 'r') as file:
-            self.jd = file.read()
+        instrumentation = self.instrumentation
+
+        with instrumentation.stage('reading', resume_path):
+            # Read each file once; the parser shares the same Documents
+            self.load_documents(Document.from_file(resume_path), Document.from_file(jd_path))
+            self.parser.load_skills(skills_path)
+
+        with instrumentation.stage('extraction', resume_path):
+            # Segment the resume and split its skills section; both are kept on the Document
+            self.parser.get_sections()
+            self.parser.extract_skills()
 
-        # Load resume and skills into the parser
-        self.parser.load_resume(resume_path)
-        self.parser.load_job_description(jd_path)
-        self.parser.load_skills(skills_path)
+        with instrumentation.stage('cleaning', resume_path):
+            # Clean the extracted experience and skills text once per document
+            self.cleaned_experience = self.resume_document.cleaned_experience
+            self.cleaned_skills = self.resume_document.cleaned_skills
 
-        # Extract experience section from the resume
-        experience = self.parser.extract_experience()        
-        # Clean the extracted experience text
-        self.clean_experience(experience)
+    def load_documents(self, resume_document, jd_document):
+        """
+        Loads a resume and a job description that are already wrapped in Documents.
 
-        # Extract skills from the resume section
-        skills = " ".join(self.parser.extract_skills())
-        # clean the extracted skills text
-        self.clean_skills(skills)
+        Parameters:
+        -----------
+        resume_document : Document
+            The resume.
+        jd_document : Document
+            The job description.
+        """
+        self.resume_document = resume_document
+        self.jd_document = jd_document
+        self.jd = jd_document.text
+        # Per-document stages are attributed to the resume file; resumes given as text have none
+        self.document = resume_document.path
+        self.parser.load_resume_document(resume_document)
+        self.parser.load_job_description_document(jd_document)
 
     def clean_experience(self, experience):
         """
@@ -58,7 +94,7 @@ class ATS:
         experience : str
             The raw experience text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_experience = cleaner.clean_text(experience)
 
     def clean_skills(self, skills):
@@ -70,50 +106,324 @@ class ATS:
         skills : str
             The raw skills text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_skills = cleaner.clean_text(skills)
 
     def compute_similarity(self):
         """
-        Computes the cosine similarity between the cleaned resume experience and the job description.
+        Computes the cosine similarity between the cleaned resume and the cleaned job description.
         
         Returns:
         --------
         float
-            The cosine similarity score between the resume experience and the job description.
+            The cosine similarity score between the resume experience and the job description,
+            0.0 when both are empty after cleaning.
         """
-        # Initialize the TF-IDF Vectorizer
-        vectorizer = TfidfVectorizer()
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
 
-        # concatenating cleaned experience and cleaned skills
-        cleaned_resume = self.cleaned_experience + self.cleaned_skills
-        
-        # Fit and transform the cleaned experience and job description texts
-        tfidf_matrix = vectorizer.fit_transform([cleaned_resume, self.jd])
-        
-        # Extract the TF-IDF vectors for the resume experience and job description
-        resume_tfidf = tfidf_matrix[0]
-        jd_tfidf = tfidf_matrix[1]
-        
-        # Calculate the cosine similarity between the resume experience and job description
-        similarity_score = cosine_similarity(resume_tfidf, jd_tfidf)[0][0]
+        with self.instrumentation.stage('cleaning', self.document):
+            # Clean the job description the same way as the transformer engine does
+            cleaned_jd_text = self.clean_jd()
+
+        with self.instrumentation.stage('vectorizing', self.document):
+            # Initialize the TF-IDF Vectorizer
+            vectorizer = TfidfVectorizer()
+
+            # concatenating cleaned experience and cleaned skills
+            cleaned_resume = self.cleaned_experience + self.cleaned_skills
+
+            # Fit and transform the cleaned experience and job description texts
+            try:
+                tfidf_matrix = vectorizer.fit_transform([cleaned_resume, cleaned_jd_text])
+            except ValueError:  # both documents are empty after cleaning
+                return 0.0
+
+        with self.instrumentation.stage('similarity', self.document):
+            # Extract the TF-IDF vectors for the resume experience and job description
+            resume_tfidf = tfidf_matrix[0]
+            jd_tfidf = tfidf_matrix[1]
+
+            # Calculate the cosine similarity between the resume experience and job description
+            similarity_score = cosine_similarity(resume_tfidf, jd_tfidf)[0][0]
         
         return similarity_score
 
+    def clean_jd(self):
+        """
+        Cleans the job description text, once per job description document.
+
+        Returns:
+        --------
+        str
+            The cleaned job description text.
+        """
+        if self.jd_document is not None:
+            return self.jd_document.cleaned
+        cleaner = registry.get_text_cleaner()
+        return cleaner.clean_text(self.jd)
+
+    def score_pairs(self, resume_texts, jd_texts):
+        """
+        Scores resume/job description pairs given as text, one pair at a time.
+
+        Parameters:
+        -----------
+        resume_texts : list of str
+            The raw resume texts.
+        jd_texts : list of str
+            The raw job description texts, one per resume.
+
+        Returns:
+        --------
+        list of float
+            The similarity score of each pair.
+        """
+        scores = []
+        for resume_text, jd_text in zip(resume_texts, jd_texts):
+            self.load_documents(Document(resume_text), Document(jd_text))
+            self.cleaned_experience = self.resume_document.cleaned_experience
+            self.cleaned_skills = self.resume_document.cleaned_skills
+            scores.append(float(self.compute_similarity()))
+        return scores
+
+
+class TfidfCorpus:
+    """
+    A TF-IDF model fitted once over a whole resume directory.
+
+    The vocabulary and IDF weights come from the full corpus and the resume vectors
+    are kept as a CSR matrix, so each job description is scored against every
+    resume with a single sparse matrix-vector product and no per-pair refitting.
+
+    Attributes:
+    -----------
+    vectorizer : TfidfVectorizer
+        The fitted vectorizer.
+    matrix : scipy.sparse.csr_matrix
+        One L2-normalised TF-IDF row per resume.
+    resume_ids : list of str
+        The resume file names, in corpus order.
+    rows : numpy.ndarray or None
+        With a deduplicator, the matrix row of each resume; near-duplicates share the
+        row of their cluster representative. ``None`` when every resume has its own row.
+    """
+
+    VECTORIZER_FILE = 'vectorizer.pkl'
+    MATRIX_FILE = 'matrix.npz'
+    IDS_FILE = 'resume_ids.json'
+    ROWS_FILE = 'rows.npy'
+
+    def __init__(self, deduplicator=None):
+        """
+        Initializes an empty, unfitted corpus model.
+
+        Parameters:
+        -----------
+        deduplicator : MinHashDeduplicator, optional
+            Collapses near-duplicate resumes to one row when fitting.
+        """
+        self.cleaner = registry.get_text_cleaner()
+        self.deduplicator = deduplicator
+        self.vectorizer = None
+        self.matrix = None
+        self.resume_ids = []
+        self.rows = None
+
+    def clean_resume(self, resume_path):
+        """
+        Extracts and cleans the experience and skills of one resume, as ``ATS.load_data`` does.
+
+        Parameters:
+        -----------
+        resume_path : str
+            The path to the resume file.
+
+        Returns:
+        --------
+        str
+            The cleaned experience followed by the cleaned skills.
+        """
+        return Document.from_file(resume_path).cleaned_resume
+
+    def fit(self, resume_dir, skills_path, manifest=None):
+        """
+        Fits the vocabulary and IDF weights over every ``.txt`` resume in a directory.
+
+        Parameters:
+        -----------
+        resume_dir : str
+            The directory containing the resume text files.
+        skills_path : str
+            The path to the skills file.
+        manifest : CorpusManifest, optional
+            Reuses the cleaned text of unchanged resumes; see ``pipeline.ingest``.
+        """
+        resume_ids = sorted(name for name in os.listdir(resume_dir) if name.endswith('.txt'))
+        resume_paths = [os.path.join(resume_dir, name) for name in resume_ids]
+        if manifest is None:
+            documents = [self.clean_resume(resume_path) for resume_path in resume_paths]
+        else:
+            from pipeline import ingest
+            records = ingest(resume_paths, skills_path, workers=1, manifest=manifest)
+            documents = [record['cleaned_experience'] + record['cleaned_skills'] for record in records]
+        self.fit_texts(documents, resume_ids)
+
+    def fit_texts(self, documents, resume_ids=None):
+        """
+        Fits the vocabulary and IDF weights over already cleaned resume texts.
+
+        With a deduplicator only one resume per near-duplicate cluster is vectorised.
+        Clustering runs on the cleaned texts, so the copies have still been extracted
+        and cleaned; what is saved is their vectorisation and their weight in the IDF.
+
+        Parameters:
+        -----------
+        documents : list of str
+            The cleaned resume texts.
+        resume_ids : list of str, optional
+            The id of each resume; defaults to its position in ``documents``.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.resume_ids = list(resume_ids) if resume_ids is not None else [str(index) for index in range(len(documents))]
+        self.rows = None
+        if self.deduplicator is not None:
+            # Fit on one representative per near-duplicate cluster so copies do not skew the IDF
+            unique, self.rows = representatives(self.deduplicator.cluster(documents))
+            documents = [documents[index] for index in unique]
+        self.vectorizer = TfidfVectorizer()
+        self.matrix = self.vectorizer.fit_transform(documents).tocsr()
+
+    def score(self, jd_texts):
+        """
+        Scores cleaned job descriptions against every resume in the corpus.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The cleaned job description texts.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The ``(n_resumes, n_jds)`` cosine similarity matrix.
+        """
+        jd_vectors = self.vectorizer.transform(jd_texts)
+        # Rows are L2-normalised, so the dot product is the cosine similarity
+        scores = (self.matrix @ jd_vectors.T).toarray()
+        # Give every near-duplicate the score of its representative
+        return scores if self.rows is None else scores[self.rows]
+
+    def rank(self, jd, top_k_resumes=10):
+        """
+        Scores a job description against every resume in the corpus.
+
+        Parameters:
+        -----------
+        jd : str
+            The raw job description text.
+        top_k_resumes : int
+            The number of best resumes to return.
+
+        Returns:
+        --------
+        list of (str, float)
+            ``(resume_id, score)`` pairs ordered from best to worst.
+        """
+        scores = self.score([self.cleaner.clean_text(jd)]).ravel()
+        return [(self.resume_ids[index], score) for index, score in top_k(scores, top_k_resumes)]
+
+    def rank_file(self, jd_path, top_k_resumes=10):
+        """
+        Scores a job description file against every resume in the corpus.
+
+        Parameters:
+        -----------
+        jd_path : str
+            The path to the job description file.
+        top_k_resumes : int
+            The number of best resumes to return.
+
+        Returns:
+        --------
+        list of (str, float)
+            See ``rank``.
+        """
+        with open(jd_path, 'r') as file:
+            return self.rank(file.read(), top_k_resumes)
+
+    def save(self, directory):
+        """
+        Saves the fitted vectorizer, the CSR matrix, the resume ids and the row map to a directory.
+
+        Parameters:
+        -----------
+        directory : str
+            The directory to write the model files to.
+        """
+        import scipy.sparse
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, self.VECTORIZER_FILE), 'wb') as file:
+            pickle.dump(self.vectorizer, file)
+        scipy.sparse.save_npz(os.path.join(directory, self.MATRIX_FILE), self.matrix)
+        with open(os.path.join(directory, self.IDS_FILE), 'w') as file:
+            json.dump(self.resume_ids, file)
+        rows_path = os.path.join(directory, self.ROWS_FILE)
+        if self.rows is not None:
+            np.save(rows_path, self.rows)
+        elif os.path.exists(rows_path):
+            os.remove(rows_path)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads a corpus model previously written by ``save``.
+
+        Parameters:
+        -----------
+        directory : str
+            The directory containing the model files.
+
+        Returns:
+        --------
+        TfidfCorpus
+            The fitted corpus model.
+        """
+        import scipy.sparse
+
+        corpus = cls()
+        with open(os.path.join(directory, cls.VECTORIZER_FILE), 'rb') as file:
+            corpus.vectorizer = pickle.load(file)
+        corpus.matrix = scipy.sparse.load_npz(os.path.join(directory, cls.MATRIX_FILE)).tocsr()
+        with open(os.path.join(directory, cls.IDS_FILE), 'r') as file:
+            corpus.resume_ids = json.load(file)
+        rows_path = os.path.join(directory, cls.ROWS_FILE)
+        if os.path.exists(rows_path):
+            corpus.rows = np.load(rows_path)
+        return corpus
+
 
 # Example usage:
 if __name__ == "__main__":
-    # Define the file paths
-    resume_path = 'resumes/resume_0.txt'
-    jd_path = 'job_descriptions/jd_2.txt'
-    skills_path = 'meta/skills.txt'
-    
+    arg_parser = argparse.ArgumentParser(description="Score a resume against a job description with TF-IDF.")
+    arg_parser.add_argument('--resume', default='resumes/resume_0.txt')
+    arg_parser.add_argument('--jd', default='job_descriptions/jd_2.txt')
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    streaming.add_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
     # Create an instance of ATS
     ats = ATS()
-    
-    # Load and process data
-    ats.load_data(resume_path, jd_path, skills_path)
-    
-    # Compute and print the similarity score
-    similarity_score = ats.compute_similarity()
-    print(f"The similarity score between the resume and job description is: {similarity_score}")
\ No newline at end of file
+
+    if args.stream:
+        # Score JSON-lines records in batches, reusing the same engine
+        streaming.stream(ats.score_pairs, args.stream, batch_size=args.batch_size)
+    else:
+        # Load and process data
+        ats.load_data(args.resume, args.jd, args.skills)
+
+        # Compute and print the similarity score
+        similarity_score = ats.compute_similarity()
+        print(f"The similarity score between the resume and job description is: {similarity_score}")
@@ -1,11 +1,51 @@
-from extractor import ResumeParser
-from text_cleaner import TextCleaner
+import argparse
+
+import numpy as np
 
-from sentence_transformers import SentenceTransformer # type: ignore
+import registry
+import streaming
+from chunked_encoder import ChunkedEncoder
+from dedup import representatives
+from document import Document
+from embedding_cache import EmbeddingCache, encode_with_cache
+from extractor import ResumeParser
+from instrumentation import NULL_INSTRUMENTATION
+from ranking import top_k_per_column
+from vector_index import FlatIndex, IVFIndex, load_index
 
 class ATSTransformer:
-    def __init__(self):
+    """
+    A class to match resumes with job descriptions using sentence embeddings.
+
+    The embedding model is loaded once per instance and both sides are encoded in
+    batches, so a whole resume set can be ranked against a whole JD set in one call.
+    """
+
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+    BATCH_SIZE = 64
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=BATCH_SIZE, cache_dir=None, instrumentation=None,
+                 chunked=False, backend='fp32', deduplicator=None):
         self.parser = ResumeParser()
+        # Per-stage timings and memory are only recorded when an Instrumentation is given
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.document = None
+        self.model_name = model_name
+        self.batch_size = batch_size
+        # 'int8' runs the model with dynamic quantization on CPU (see inference_backend.py)
+        self.backend = backend
+        self.model = None
+        self.index = None
+        # Long documents are split into token windows instead of being truncated when chunked is set
+        self.chunked = chunked
+        # Embeddings of unchanged documents are reused across runs when a cache directory is given;
+        # chunked, truncated and quantized embeddings differ, so they are stored apart
+        cache_name = model_name + ('-chunked' if chunked else '') + ('' if backend == 'fp32' else '-' + backend)
+        self.embedding_cache = EmbeddingCache(cache_dir, cache_name) if cache_dir else None
+        # With a MinHashDeduplicator, near-duplicate resumes share their cluster representative's embedding
+        self.deduplicator = deduplicator
+        self.resume_document = None
+        self.jd_document = None
         self.cleaned_experience = None
         self.cleaned_skills = None
         self.jd = None
@@ -23,24 +63,41 @@ class ATSTransformer:
         skills_path : str
             The path to the skills file.
         """
-        # Load job description
-        with open(jd_path, 'r') as file:
-            self.jd = file.read()
+        instrumentation = self.instrumentation
 
-        # Load resume and skills into the parser
-        self.parser.load_resume(resume_path)
-        self.parser.load_job_description(jd_path)
-        self.parser.load_skills(skills_path)
+        with instrumentation.stage('reading', resume_path):
+            # Read each file once; the parser shares the same Documents
+            self.load_documents(Document.from_file(resume_path), Document.from_file(jd_path))
+            self.parser.load_skills(skills_path)
 
-        # Extract experience section from the resume
-        experience = self.parser.extract_experience()        
-        # Clean the extracted experience text
-        self.clean_experience(experience)
+        with instrumentation.stage('extraction', resume_path):
+            # Segment the resume and split its skills section; both are kept on the Document
+            self.parser.get_sections()
+            self.parser.extract_skills()
 
-        # Extract skills from the resume section
-        skills = " ".join(self.parser.extract_skills())
-        # clean the extracted skills text
-        self.clean_skills(skills)
+        with instrumentation.stage('cleaning', resume_path):
+            # Clean the extracted experience and skills text once per document
+            self.cleaned_experience = self.resume_document.cleaned_experience
+            self.cleaned_skills = self.resume_document.cleaned_skills
+
+    def load_documents(self, resume_document, jd_document):
+        """
+        Loads a resume and a job description that are already wrapped in Documents.
+
+        Parameters:
+        -----------
+        resume_document : Document
+            The resume.
+        jd_document : Document
+            The job description.
+        """
+        self.resume_document = resume_document
+        self.jd_document = jd_document
+        self.jd = jd_document.text
+        # Per-document stages are attributed to the resume file; resumes given as text have none
+        self.document = resume_document.path
+        self.parser.load_resume_document(resume_document)
+        self.parser.load_job_description_document(jd_document)
 
     def clean_experience(self, experience):
         """
@@ -51,7 +108,7 @@ class ATSTransformer:
         experience : str
             The raw experience text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_experience = cleaner.clean_text(experience)
 
     def clean_skills(self, skills):
@@ -63,9 +120,209 @@ class ATSTransformer:
         skills : str
             The raw skills text extracted from the resume.
         """
-        cleaner = TextCleaner()
+        cleaner = registry.get_text_cleaner()
         self.cleaned_skills = cleaner.clean_text(skills)
 
+    def get_model(self):
+        """
+        Returns the SentenceTransformer model, loading it on first use.
+
+        Returns:
+        --------
+        SentenceTransformer
+            The embedding model, shared by every instance in the process.
+        """
+        if self.model is None:
+            self.model = registry.get_sentence_model(self.model_name, self.backend)
+        return self.model
+
+    def encode(self, texts):
+        """
+        Encodes a list of texts into L2-normalised embeddings in batches.
+
+        Texts already present in the embedding cache are not re-encoded. In chunked
+        mode every text is split into windows that are encoded and pooled by ``ChunkedEncoder``.
+
+        Parameters:
+        -----------
+        texts : list of str
+            The texts to encode.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(len(texts), dim)`` float32 matrix of unit-length embeddings.
+        """
+        encoder = self.get_model()
+        if self.chunked:
+            encoder = ChunkedEncoder(encoder)
+        return encode_with_cache(
+            encoder,
+            texts,
+            self.embedding_cache,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+        )
+
+    def rank(self, resume_texts, jd_texts, top_k=10):
+        """
+        Scores every resume against every job description.
+
+        Both sides are encoded once in large batches; because the embeddings are
+        normalised, the cosine similarity matrix is a single matrix product. With a
+        deduplicator only one resume per near-duplicate cluster is encoded, and its
+        scores are given to every member. Clustering runs on the cleaned texts, so
+        only the encoding of the copies is saved; they are still extracted and cleaned.
+
+        Parameters:
+        -----------
+        resume_texts : list of str
+            The cleaned resume texts.
+        jd_texts : list of str
+            The cleaned job description texts.
+        top_k : int
+            The number of best resumes to return per job description.
+
+        Returns:
+        --------
+        tuple of (numpy.ndarray, list)
+            The ``(n_resumes, n_jds)`` score matrix, and for each job description
+            a list of ``(resume_index, score)`` pairs ordered from best to worst.
+        """
+        # Batch stages cover many documents, so they only count towards the per-stage totals
+        if self.deduplicator is not None:
+            with self.instrumentation.stage('dedup'):
+                unique, inverse = representatives(self.deduplicator.cluster(resume_texts))
+            resume_texts = [resume_texts[index] for index in unique]
+        with self.instrumentation.stage('encoding'):
+            resume_embeddings = self.encode(resume_texts)
+            jd_embeddings = self.encode(jd_texts)
+        if self.deduplicator is not None:
+            resume_embeddings = resume_embeddings[inverse]
+        with self.instrumentation.stage('similarity'):
+            scores = resume_embeddings @ jd_embeddings.T
+            ranking = top_k_per_column(scores, top_k)
+        return scores, ranking
+
+    def score_pairs(self, resume_texts, jd_texts):
+        """
+        Scores resume/job description pairs given as raw text.
+
+        Every resume of the batch is extracted and cleaned, then all resumes and job
+        descriptions are encoded together in one batched call.
+
+        Parameters:
+        -----------
+        resume_texts : list of str
+            The raw resume texts.
+        jd_texts : list of str
+            The raw job description texts, one per resume.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The cosine similarity of each pair.
+        """
+        with self.instrumentation.stage('cleaning'):
+            cleaned_resumes = [Document(resume_text).cleaned_resume for resume_text in resume_texts]
+            cleaned_jds = [Document(jd_text).cleaned for jd_text in jd_texts]
+        with self.instrumentation.stage('encoding'):
+            embeddings = self.encode(cleaned_resumes + cleaned_jds)
+        with self.instrumentation.stage('similarity'):
+            n_pairs = len(cleaned_resumes)
+            return np.einsum('ij,ij->i', embeddings[:n_pairs], embeddings[n_pairs:])
+
+    def build_index(self, resume_texts, resume_ids=None, n_lists=None, n_probe=8):
+        """
+        Encodes resumes and stores them in a vector index for repeated top-k queries.
+
+        Parameters:
+        -----------
+        resume_texts : list of str
+            The cleaned resume texts.
+        resume_ids : list of int, optional
+            The id of each resume; defaults to its position in ``resume_texts``.
+        n_lists : int, optional
+            The number of IVF partitions. When omitted an exact ``FlatIndex`` is built.
+        n_probe : int
+            The number of partitions scanned per query by an IVF index.
+        """
+        embeddings = self.encode(resume_texts)
+        if resume_ids is None:
+            resume_ids = np.arange(len(resume_texts))
+        if n_lists:
+            self.index = IVFIndex(embeddings.shape[1], n_lists=n_lists, n_probe=n_probe)
+            self.index.train(embeddings)
+        else:
+            self.index = FlatIndex(embeddings.shape[1])
+        self.index.add(resume_ids, embeddings)
+
+    def load_index(self, path):
+        """
+        Loads a vector index previously saved with ``self.index.save(path)``.
+
+        Parameters:
+        -----------
+        path : str
+            The ``.npz`` index file.
+        """
+        self.index = load_index(path)
+
+    def search_index(self, jd_texts, top_k=10):
+        """
+        Queries the vector index for the best resumes of each job description.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The cleaned job description texts.
+        top_k : int
+            The number of resumes to return per job description.
+
+        Returns:
+        --------
+        list of list of (int, float)
+            For each job description, ``(resume_id, score)`` pairs ordered from best to worst.
+        """
+        return self.index.search(self.encode(jd_texts), top_k)
+
+    def rank_files(self, resume_paths, jd_paths, skills_path, top_k=10, score_store=None, manifest=None):
+        """
+        Loads, cleans and ranks a set of resume files against a set of job description files.
+
+        Parameters:
+        -----------
+        resume_paths : list of str
+            The paths to the resume files.
+        jd_paths : list of str
+            The paths to the job description files.
+        skills_path : str
+            The path to the skills file.
+        top_k : int
+            The number of best resumes to return per job description.
+        score_store : ScoreStore, optional
+            Where the score matrix is persisted, keyed by the file paths.
+        manifest : CorpusManifest, optional
+            Reuses the cleaned text of unchanged resumes; see ``pipeline.ingest``.
+
+        Returns:
+        --------
+        tuple of (numpy.ndarray, list)
+            See ``rank``.
+        """
+        if manifest is None:
+            resume_texts = [Document.from_file(resume_path).cleaned_resume for resume_path in resume_paths]
+        else:
+            from pipeline import ingest
+            records = ingest(list(resume_paths), skills_path, workers=1, manifest=manifest)
+            resume_texts = [record['cleaned_experience'] + record['cleaned_skills'] for record in records]
+        jd_texts = [Document.from_file(jd_path).cleaned for jd_path in jd_paths]
+
+        scores, ranking = self.rank(resume_texts, jd_texts, top_k=top_k)
+        if score_store is not None:
+            score_store.write(list(resume_paths), list(jd_paths), scores)
+        return scores, ranking
+
     def compute_similarity(self):
         """
         Computes the similarity score between the cleaned resume and cleaned job description text using the SentenceTransformer model.
@@ -73,41 +330,49 @@ class ATSTransformer:
         Returns:
             float: The similarity score between the cleaned resume and cleaned job description text.
         """
-        model = SentenceTransformer('all-MiniLM-L6-v2')
         cleaned_resume = self.cleaned_experience + self.cleaned_skills
-        cleaned_jd_text = self.clean_jd()
-        sentences = [cleaned_resume, cleaned_jd_text]
-        embeddings1 = model.encode(sentences[0])
-        embeddings2 = model.encode(sentences[1])
-        
-        similarity_score = model.similarity(embeddings1, embeddings2)
+        with self.instrumentation.stage('cleaning', self.document):
+            cleaned_jd_text = self.clean_jd()
+        with self.instrumentation.stage('encoding', self.document):
+            resume_embedding, jd_embedding = self.encode([cleaned_resume, cleaned_jd_text])
+        with self.instrumentation.stage('similarity', self.document):
+            similarity_score = resume_embedding @ jd_embedding
 
         return similarity_score
     
     def clean_jd(self):
         """
-        Cleans the job description text by applying text cleaning techniques.
+        Cleans the job description text by applying text cleaning techniques, once per job description document.
 
         Returns:
             str: The cleaned job description text.
         """
-        cleaner = TextCleaner()
+        if self.jd_document is not None:
+            return self.jd_document.cleaned
+        cleaner = registry.get_text_cleaner()
         cleaned_jd = cleaner.clean_text(self.jd)
         return cleaned_jd
 
 # Example usage:
 if __name__ == "__main__":
-    # Define the file paths
-    resume_path = 'resumes/resume_0.txt'
-    jd_path = 'job_descriptions/jd_1.txt'
-    skills_path = 'meta/skills.txt'
-    
+    arg_parser = argparse.ArgumentParser(description="Score a resume against a job description with sentence embeddings.")
+    arg_parser.add_argument('--resume', default='resumes/resume_0.txt')
+    arg_parser.add_argument('--jd', default='job_descriptions/jd_1.txt')
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--cache-dir', default=None)
+    streaming.add_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
     # Create an instance of ATS
-    ats = ATSTransformer()
-    
-    # Load and process data
-    ats.load_data(resume_path, jd_path, skills_path)
-    
-    # Compute and print the similarity score
-    similarity_score = ats.compute_similarity()
-    print(f"The similarity score between the resume and job description is: {round(similarity_score.item() * 100, 2)}%")
\ No newline at end of file
+    ats = ATSTransformer(cache_dir=args.cache_dir)
+
+    if args.stream:
+        # Score JSON-lines records in batches; the model is loaded once for the whole stream
+        streaming.stream(ats.score_pairs, args.stream, batch_size=args.batch_size)
+    else:
+        # Load and process data
+        ats.load_data(args.resume, args.jd, args.skills)
+
+        # Compute and print the similarity score
+        similarity_score = ats.compute_similarity()
+        print(f"The similarity score between the resume and job description is: {round(similarity_score.item() * 100, 2)}%")
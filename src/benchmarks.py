@@ -0,0 +1,474 @@
+"""
+Micro-benchmarks for the hot paths of the ATS.
+
+Every benchmark prints a JSON report so results can be compared across commits.
+
+Usage:
+    python src/benchmarks.py suite --resumes 500 --jds 10 --output bench.json
+    python src/benchmarks.py cleaner --input-dir resumes
+    python src/benchmarks.py startup
+    python src/benchmarks.py chunks --documents 200
+"""
+
+import argparse
+import json
+import os
+import platform
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry-point modules whose cold import time is tracked by the startup benchmark
+ENTRY_MODULES = ['extractor', 'text_cleaner', 'ats_tfidf', 'ats_transformer', 'pipeline']
+
+
+def load_texts(input_dir):
+    """
+    Reads every ``.txt`` file of a directory.
+
+    Parameters:
+    -----------
+    input_dir : str
+        The directory to read.
+
+    Returns:
+    --------
+    list of str
+        The file contents, in sorted file name order.
+    """
+    texts = []
+    for name in sorted(os.listdir(input_dir)):
+        if name.endswith('.txt'):
+            with open(os.path.join(input_dir, name), 'r') as file:
+                texts.append(file.read())
+    return texts
+
+
+def _latency_summary(latencies, total_seconds):
+    """
+    Summarises per-item latencies of one benchmark stage.
+
+    Parameters:
+    -----------
+    latencies : list of float
+        Seconds spent on each item.
+    total_seconds : float
+        Wall time of the whole stage.
+
+    Returns:
+    --------
+    dict
+        Item count, total seconds, items/second and p50/p95/max latency in milliseconds.
+    """
+    ordered = sorted(latencies)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000 if ordered else None
+
+    return {
+        'items': len(latencies),
+        'seconds': total_seconds,
+        'items_per_second': len(latencies) / total_seconds if total_seconds else None,
+        'latency_ms': {'p50': percentile(0.50), 'p95': percentile(0.95), 'max': percentile(1.0)},
+    }
+
+
+def _time_each(items, function):
+    """
+    Applies ``function`` to every item, timing each call.
+
+    Returns:
+    --------
+    tuple of (list, dict)
+        The results and their ``_latency_summary``.
+    """
+    results, latencies = [], []
+    stage_start = time.perf_counter()
+    for item in items:
+        start = time.perf_counter()
+        results.append(function(item))
+        latencies.append(time.perf_counter() - start)
+    return results, _latency_summary(latencies, time.perf_counter() - stage_start)
+
+
+def _run_command(command):
+    """
+    Runs a command from the ``src`` directory and returns its stdout.
+    """
+    result = subprocess.run(command, cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def _git_commit():
+    """
+    Returns the current commit hash, so reports can be compared across commits.
+    """
+    try:
+        return _run_command(['git', 'rev-parse', 'HEAD'])
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(n_resumes, n_jds, skills_path, seed=0, include_transformer=True):
+    """
+    Measures throughput and latency of every pipeline stage on a synthetic corpus.
+
+    Stages: file load, cleaning, section extraction, skill extraction, TF-IDF scoring
+    (corpus fit plus one ranking per JD) and transformer scoring (skipped when
+    sentence-transformers is not installed).
+
+    Parameters:
+    -----------
+    n_resumes : int
+        The number of synthetic resumes.
+    n_jds : int
+        The number of synthetic job descriptions.
+    skills_path : str
+        The path to the skills file.
+    seed : int
+        The corpus seed.
+    include_transformer : bool
+        Whether to run the transformer stage.
+
+    Returns:
+    --------
+    dict
+        ``meta`` (commit, sizes, seed, platform) and one ``_latency_summary`` per stage;
+        ``transformer_scoring`` is batched, so it reports throughput only.
+    """
+    import registry
+    from ats_tfidf import TfidfCorpus
+    from extractor import ResumeParser
+    from synthetic_corpus import generate_corpus, write_corpus
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'resumes': n_resumes,
+            'jds': n_jds,
+            'seed': seed,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        },
+        'stages': {},
+    }
+    stages = report['stages']
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        resume_dir, jd_dir = write_corpus(corpus_dir, *generate_corpus(n_resumes, n_jds, skills_path, seed))
+        resume_paths = [os.path.join(resume_dir, name) for name in sorted(os.listdir(resume_dir))]
+        jd_paths = [os.path.join(jd_dir, name) for name in sorted(os.listdir(jd_dir))]
+
+        def read(path):
+            with open(path, 'r') as file:
+                return file.read()
+
+        resumes, stages['file_load'] = _time_each(resume_paths, read)
+        jds = [read(path) for path in jd_paths]
+
+        parser = ResumeParser()
+        parser.load_skills(skills_path)
+
+        def extract_sections(text):
+            parser.load_resume_text(text)
+            return parser.extract_experience(), parser.extract_skills()
+
+        sections, stages['section_extraction'] = _time_each(resumes, extract_sections)
+        _, stages['skill_extraction'] = _time_each(
+            sections, lambda section: parser.skill_matcher.find(" ".join(section[1]))
+        )
+
+        cleaner = registry.get_text_cleaner()
+        cleaned, stages['cleaning'] = _time_each(
+            sections, lambda section: cleaner.clean_text(section[0]) + cleaner.clean_text(" ".join(section[1]))
+        )
+
+        corpus = TfidfCorpus()
+        start = time.perf_counter()
+        corpus.fit(resume_dir, skills_path)
+        stages['tfidf_fit'] = _latency_summary([time.perf_counter() - start], time.perf_counter() - start)
+        _, stages['tfidf_scoring'] = _time_each(jds, lambda jd: corpus.rank(jd, 10))
+
+        if include_transformer:
+            try:
+                from ats_transformer import ATSTransformer
+
+                transformer = ATSTransformer()
+                transformer.get_model()
+                cleaned_jds = cleaner.clean_many(jds)
+                start = time.perf_counter()
+                transformer.rank(cleaned, cleaned_jds, top_k=10)
+                elapsed = time.perf_counter() - start
+                # rank() encodes and scores everything in batches, so there is no per-pair
+                # latency to report; only the throughput over resume x JD pairs
+                pairs = len(cleaned) * len(cleaned_jds)
+                stages['transformer_scoring'] = {
+                    'pairs': pairs,
+                    'seconds': elapsed,
+                    'pairs_per_second': pairs / elapsed if elapsed else None,
+                }
+            except ImportError as error:
+                stages['transformer_scoring'] = {'skipped': str(error)}
+
+    return report
+
+
+def bench_cleaner(texts):
+    """
+    Measures TextCleaner throughput in tokens/second before and after lemma memoization.
+
+    ``baseline`` re-implements the original per-token ``WordNetLemmatizer`` path,
+    ``compat_cold``/``compat_warm`` run ``clean_many`` with an empty/filled lemma cache,
+    and ``fast`` uses the regex tokenizer.
+
+    Parameters:
+    -----------
+    texts : list of str
+        The raw documents to clean.
+
+    Returns:
+    --------
+    dict
+        Tokens/second per variant and whether compatibility mode matched the baseline output.
+    """
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+
+    import text_cleaner
+    from text_cleaner import TextCleaner
+
+    n_tokens = sum(len(word_tokenize(text.lower())) for text in texts)
+
+    def baseline(raw_texts):
+        set_of_stopwords = set(stopwords.words("english") + list(string.punctuation))
+        lemmatizer = WordNetLemmatizer()
+        results = []
+        for raw_text in raw_texts:
+            tokens = [token for token in word_tokenize(raw_text.lower()) if token not in set_of_stopwords]
+            results.append(" ".join(lemmatizer.lemmatize(token) for token in tokens))
+        return results
+
+    def timed(function):
+        start = time.perf_counter()
+        output = function()
+        return output, time.perf_counter() - start
+
+    expected, baseline_seconds = timed(lambda: baseline(texts))
+    text_cleaner.lemmatize.cache_clear()
+    compat, cold_seconds = timed(lambda: TextCleaner().clean_many(texts))
+    _, warm_seconds = timed(lambda: TextCleaner().clean_many(texts))
+    _, fast_seconds = timed(lambda: TextCleaner(fast_tokenizer=True).clean_many(texts))
+
+    return {
+        'documents': len(texts),
+        'tokens': n_tokens,
+        'tokens_per_second': {
+            'baseline': n_tokens / baseline_seconds,
+            'compat_cold': n_tokens / cold_seconds,
+            'compat_warm': n_tokens / warm_seconds,
+            'fast': n_tokens / fast_seconds,
+        },
+        'compat_identical': compat == expected,
+        'lemma_cache': text_cleaner.lemmatize.cache_info()._asdict(),
+    }
+
+
+def _run_fresh(code):
+    """
+    Runs Python code in a new interpreter with ``src`` on the path and returns its stdout.
+    """
+    return _run_command([sys.executable, '-c', code])
+
+
+def bench_startup(skills_path, repeat=5, documents=100):
+    """
+    Measures cold-start and per-document construction cost.
+
+    Each import is timed in a fresh interpreter so earlier imports cannot hide its cost.
+
+    Parameters:
+    -----------
+    skills_path : str
+        The path to the skills file.
+    repeat : int
+        The number of fresh interpreters per measurement; the median is reported.
+    documents : int
+        The number of per-document ``ResumeParser``/``TextCleaner`` constructions timed.
+
+    Returns:
+    --------
+    dict
+        Import seconds per entry module, first-use seconds per registry resource, and
+        mean construction microseconds per document.
+    """
+    def median(values):
+        return sorted(values)[len(values) // 2]
+
+    imports = {}
+    for module in ENTRY_MODULES:
+        code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+        imports[module] = median([float(_run_fresh(code)) for _ in range(repeat)])
+
+    skills_path = os.path.abspath(skills_path)
+    first_use = {}
+    for name, call in [
+        ('stopwords', "registry.get_stopwords()"),
+        ('lemmatizer', "registry.get_lemmatizer()"),
+        ('skill_matcher', f"registry.get_skill_matcher({skills_path!r})"),
+        ('nlp', "registry.get_nlp()"),
+    ]:
+        code = f"import time, registry; start = time.perf_counter(); {call}; print(time.perf_counter() - start)"
+        try:
+            first_use[name] = median([float(_run_fresh(code)) for _ in range(repeat)])
+        except subprocess.CalledProcessError:
+            first_use[name] = None  # resource not installed on this host
+
+    code = (
+        "import time, registry\n"
+        "from extractor import ResumeParser\n"
+        f"registry.get_text_cleaner(); registry.get_skill_matcher({skills_path!r})\n"
+        "start = time.perf_counter()\n"
+        f"for _ in range({documents}):\n"
+        "    parser = ResumeParser()\n"
+        f"    parser.load_skills({skills_path!r})\n"
+        "    cleaner = registry.get_text_cleaner()\n"
+        f"print((time.perf_counter() - start) / {documents})"
+    )
+    per_document = float(_run_fresh(code))
+
+    return {
+        'import_seconds': imports,
+        'first_use_seconds': first_use,
+        'construction_microseconds_per_document': per_document * 1e6,
+    }
+
+
+def bench_chunks(n_documents, skills_path, model_name='all-MiniLM-L6-v2', batch_size=64, seed=0):
+    """
+    Compares chunked, length-bucketed encoding with the one-call-per-document approach.
+
+    Documents are synthetic resumes concatenated in threes so most exceed the model's
+    maximum sequence length.
+
+    Parameters:
+    -----------
+    n_documents : int
+        The number of long documents.
+    skills_path : str
+        The path to the skills file.
+    model_name : str
+        The SentenceTransformer model.
+    batch_size : int
+        The number of chunks per forward pass.
+    seed : int
+        The corpus seed.
+
+    Returns:
+    --------
+    dict
+        Tokens per document, the share of tokens the truncating approach actually
+        encodes, and documents/second and chunks/second for each approach.
+    """
+    import registry
+    from chunked_encoder import ChunkedEncoder
+    from synthetic_corpus import generate_corpus
+
+    resumes = generate_corpus(n_documents * 3, 0, skills_path, seed)[0]
+    documents = ["\n".join(resumes[index:index + 3]) for index in range(0, len(resumes), 3)]
+
+    model = registry.get_sentence_model(model_name)
+    encoder = ChunkedEncoder(model)
+    chunks = encoder.split(documents)
+    n_tokens = sum(n for _, _, n in chunks) - encoder.overlap * (len(chunks) - len(documents))
+    truncated_tokens = sum(min(n, model.max_seq_length - 2) for n in (
+        len(ids) for ids in model.tokenizer(documents, add_special_tokens=False)['input_ids']
+    ))
+
+    model.encode(documents[:2])  # warm up
+    start = time.perf_counter()
+    for document in documents:
+        model.encode(document)
+    per_document_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.encode(documents, batch_size=batch_size)
+    batched_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoder.encode(documents, batch_size=batch_size)
+    chunked_seconds = time.perf_counter() - start
+
+    return {
+        'documents': len(documents),
+        'chunks': len(chunks),
+        'mean_tokens_per_document': n_tokens / len(documents),
+        'truncated_token_coverage': truncated_tokens / n_tokens,
+        'per_document_truncated': {
+            'documents_per_second': len(documents) / per_document_seconds,
+        },
+        'batched_truncated': {
+            'documents_per_second': len(documents) / batched_seconds,
+        },
+        'chunked': {
+            'documents_per_second': len(documents) / chunked_seconds,
+            'chunks_per_second': len(chunks) / chunked_seconds,
+        },
+    }
+
+
+if __name__ == "__main__":
+    # Options accepted after every benchmark name
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument('--output', default=None, help="also write the JSON report to this file")
+
+    arg_parser = argparse.ArgumentParser(description="Run ATS micro-benchmarks.")
+    subparsers = arg_parser.add_subparsers(dest='benchmark', required=True)
+
+    suite_parser = subparsers.add_parser('suite', parents=[common_parser],
+                                         help="per-stage throughput and latency on a synthetic corpus")
+    suite_parser.add_argument('--resumes', type=int, default=500)
+    suite_parser.add_argument('--jds', type=int, default=10)
+    suite_parser.add_argument('--skills', default='meta/skills.txt')
+    suite_parser.add_argument('--seed', type=int, default=0)
+    suite_parser.add_argument('--no-transformer', action='store_true')
+
+    cleaner_parser = subparsers.add_parser('cleaner', parents=[common_parser],
+                                           help="TextCleaner tokens/second before and after")
+    cleaner_parser.add_argument('--input-dir', default=None, help="defaults to a synthetic corpus")
+    cleaner_parser.add_argument('--skills', default='meta/skills.txt')
+
+    startup_parser = subparsers.add_parser('startup', parents=[common_parser],
+                                           help="cold import and per-document construction cost")
+    startup_parser.add_argument('--skills', default='meta/skills.txt')
+    startup_parser.add_argument('--repeat', type=int, default=5)
+
+    chunks_parser = subparsers.add_parser('chunks', parents=[common_parser],
+                                          help="chunked encoding chunks/second against truncation")
+    chunks_parser.add_argument('--documents', type=int, default=200)
+    chunks_parser.add_argument('--skills', default='meta/skills.txt')
+    chunks_parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    chunks_parser.add_argument('--batch-size', type=int, default=64)
+
+    args = arg_parser.parse_args()
+    if args.benchmark == 'suite':
+        report = bench_suite(args.resumes, args.jds, args.skills, args.seed, include_transformer=not args.no_transformer)
+    elif args.benchmark == 'cleaner':
+        if args.input_dir:
+            texts = load_texts(args.input_dir)
+        else:
+            from synthetic_corpus import generate_corpus
+            texts = generate_corpus(500, 0, args.skills)[0]
+        report = bench_cleaner(texts)
+    elif args.benchmark == 'startup':
+        report = bench_startup(args.skills, repeat=args.repeat)
+    elif args.benchmark == 'chunks':
+        report = bench_chunks(args.documents, args.skills, args.model, args.batch_size)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,340 @@
+"""
+Array-backed BM25 inverted index over cleaned resume tokens.
+
+Postings are stored CSR-style: ``offsets[t]:offsets[t + 1]`` delimits the postings of
+term ``t`` in ``doc_indices`` (sorted per term) and ``impacts``, the precomputed BM25
+contribution of the term to each document. Each term also keeps its largest impact,
+an upper bound on what it can add to any document's score.
+
+Queries use MaxScore-style early termination. Terms are processed from the highest
+upper bound down, scanning their postings in full, until the bounds of the remaining
+terms together can no longer lift a document that has not been seen yet into the
+current top k. Only the documents touched so far are tracked, and the k-th best score
+is selected among them. The remaining terms are then only probed for the surviving
+candidate documents (or scanned, when their postings list is shorter than the cost of
+probing), and candidates are dropped as soon as their upper bound falls below the
+k-th best score. The result is identical to exhaustive scoring.
+
+Usage:
+    python src/bm25.py --resumes 5000 --jds 20
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+
+import numpy as np
+
+from ranking import top_k
+
+# Tolerance for float32 rounding when comparing upper bounds with the threshold
+BOUND_EPSILON = 1e-6
+
+# Rough cost of probing one candidate with a binary search, relative to scanning one posting
+PROBE_COST = 4
+
+
+class BM25Index:
+    """
+    An immutable BM25 index built over a fixed set of documents.
+
+    Attributes:
+    -----------
+    k1 : float
+        The term-frequency saturation parameter.
+    b : float
+        The document-length normalisation parameter.
+    terms : dict of str to int
+        The term id of every indexed term.
+    ids : numpy.ndarray
+        The id (str) of each document, in index order.
+    offsets : numpy.ndarray
+        ``n_terms + 1`` int64 postings boundaries.
+    doc_indices : numpy.ndarray
+        The int32 document index of every posting, sorted within each term.
+    impacts : numpy.ndarray
+        The float32 BM25 contribution of every posting.
+    max_impacts : numpy.ndarray
+        The float32 largest impact of each term.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Initializes an empty index.
+
+        Parameters:
+        -----------
+        k1 : float
+            The term-frequency saturation parameter.
+        b : float
+            The document-length normalisation parameter.
+        """
+        self.k1 = k1
+        self.b = b
+        self.terms = {}
+        self.ids = np.empty(0, dtype=str)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.doc_indices = np.empty(0, dtype=np.int32)
+        self.impacts = np.empty(0, dtype=np.float32)
+        self.max_impacts = np.empty(0, dtype=np.float32)
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def build(self, documents, ids=None):
+        """
+        Indexes a set of cleaned documents, replacing any previous content.
+
+        Parameters:
+        -----------
+        documents : list of str
+            The cleaned texts, whose tokens are separated by whitespace.
+        ids : list of str, optional
+            The id of each document; defaults to its position in ``documents``.
+        """
+        self.terms = {}
+        term_ids, doc_indices, term_freqs = [], [], []
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+        for doc_index, document in enumerate(documents):
+            tokens = document.split()
+            doc_lengths[doc_index] = len(tokens)
+            for term, count in Counter(tokens).items():
+                term_ids.append(self.terms.setdefault(term, len(self.terms)))
+                doc_indices.append(doc_index)
+                term_freqs.append(count)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_indices = np.asarray(doc_indices, dtype=np.int32)
+        term_freqs = np.asarray(term_freqs, dtype=np.float32)
+        # Group postings by term; documents were visited in order, so a stable sort keeps them sorted
+        order = np.argsort(term_ids, kind='stable')
+        term_ids, doc_indices, term_freqs = term_ids[order], doc_indices[order], term_freqs[order]
+
+        n_terms, n_docs = len(self.terms), len(documents)
+        document_freqs = np.bincount(term_ids, minlength=n_terms)
+        self.offsets = np.concatenate([[0], np.cumsum(document_freqs)]).astype(np.int64)
+        self.doc_indices = doc_indices
+
+        # Lucene's non-negative IDF keeps every impact >= 0, which the pruning relies on
+        idf = np.log1p((n_docs - document_freqs + 0.5) / (document_freqs + 0.5)).astype(np.float32)
+        average_length = max(float(doc_lengths.mean()), 1.0) if n_docs else 1.0
+        norms = self.k1 * (1 - self.b + self.b * doc_lengths[doc_indices] / average_length)
+        self.impacts = (idf[term_ids] * term_freqs * (self.k1 + 1) / (term_freqs + norms)).astype(np.float32)
+        self.max_impacts = np.zeros(n_terms, dtype=np.float32)
+        np.maximum.at(self.max_impacts, term_ids, self.impacts)
+
+        self.ids = np.asarray(ids if ids is not None else [str(index) for index in range(n_docs)], dtype=str)
+
+    def _query_terms(self, query):
+        """
+        Returns ``(term_id, weight)`` for each distinct indexed query term, best bound first.
+        """
+        counts = Counter(token for token in query.split() if token in self.terms)
+        weighted = [(self.terms[token], float(count)) for token, count in counts.items()]
+        return sorted(weighted, key=lambda item: -item[1] * self.max_impacts[item[0]])
+
+    def _search(self, query, k, exhaustive=False):
+        """
+        Scores one query and returns ``(results, postings_scored)``.
+        """
+        query_terms = self._query_terms(query)
+        k = min(k, len(self))
+        if not query_terms or k <= 0:
+            return [], 0
+
+        bounds = np.array([weight * self.max_impacts[term_id] for term_id, weight in query_terms])
+        # remaining[i] is the most the terms from position i onwards can still add
+        remaining = np.concatenate([np.cumsum(bounds[::-1])[::-1], [0.0]])
+        # Dense scratch arrays, but only the entries of touched documents are ever read back
+        scores = np.zeros(len(self), dtype=np.float32)
+        seen = np.zeros(len(self), dtype=bool)
+        touched = np.empty(0, dtype=np.int32)
+        threshold = 0.0
+        postings_scored = 0
+
+        # Essential terms: scan the whole postings list
+        position = 0
+        while position < len(query_terms):
+            if not exhaustive and position > 0 and remaining[position] < threshold - BOUND_EPSILON:
+                break
+            term_id, weight = query_terms[position]
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            postings = self.doc_indices[start:end]
+            scores[postings] += weight * self.impacts[start:end]
+            fresh = postings[~seen[postings]]
+            seen[fresh] = True
+            touched = np.concatenate([touched, fresh])
+            postings_scored += end - start
+            position += 1
+            if not exhaustive and touched.shape[0] >= k:
+                threshold = float(np.partition(scores[touched], -k)[-k])
+
+        # Sorted candidates keep ties broken by document index
+        candidates = np.sort(touched)
+        if position < len(query_terms):
+            # No unseen document can reach the top k any more; only probe the candidates
+            candidates = candidates[scores[candidates] + remaining[position] >= threshold - BOUND_EPSILON]
+            for position in range(position, len(query_terms)):
+                term_id, weight = query_terms[position]
+                start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                postings = self.doc_indices[start:end]
+                if postings.shape[0] <= candidates.shape[0] * PROBE_COST:
+                    # Scanning the list is cheaper than probing; only candidate scores are read later
+                    scores[postings] += weight * self.impacts[start:end]
+                    postings_scored += postings.shape[0]
+                else:
+                    found = np.minimum(np.searchsorted(postings, candidates), postings.shape[0] - 1)
+                    hit = postings[found] == candidates
+                    scores[candidates[hit]] += weight * self.impacts[start + found[hit]]
+                    postings_scored += candidates.shape[0]
+
+                candidate_scores = scores[candidates]
+                if candidates.shape[0] >= k:
+                    threshold = max(threshold, float(np.partition(candidate_scores, -k)[-k]))
+                candidates = candidates[candidate_scores + remaining[position + 1] >= threshold - BOUND_EPSILON]
+
+        results = [(str(self.ids[candidates[index]]), score) for index, score in top_k(scores[candidates], k)]
+        return results, int(postings_scored)
+
+    def search(self, query, k=10):
+        """
+        Finds the k best documents for a query.
+
+        Parameters:
+        -----------
+        query : str
+            The cleaned query text, e.g. a cleaned job description.
+        k : int
+            The number of results.
+
+        Returns:
+        --------
+        list of (str, float)
+            ``(document_id, score)`` pairs ordered from best to worst; documents sharing
+            no term with the query are never returned.
+        """
+        return self._search(query, k)[0]
+
+    def postings_length(self, query):
+        """
+        Returns the total number of postings of the indexed query terms.
+        """
+        return int(sum(
+            self.offsets[term_id + 1] - self.offsets[term_id] for term_id, _ in self._query_terms(query)
+        ))
+
+    def save(self, path):
+        """
+        Saves the index to a ``.npz`` file.
+
+        Parameters:
+        -----------
+        path : str
+            The file to write.
+        """
+        terms = np.empty(len(self.terms), dtype=object)
+        for term, term_id in self.terms.items():
+            terms[term_id] = term
+        np.savez(
+            path,
+            params=np.array([self.k1, self.b]),
+            terms=terms.astype(str),
+            ids=self.ids,
+            offsets=self.offsets,
+            doc_indices=self.doc_indices,
+            impacts=self.impacts,
+            max_impacts=self.max_impacts,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index previously written by ``save``.
+
+        Parameters:
+        -----------
+        path : str
+            The ``.npz`` index file.
+
+        Returns:
+        --------
+        BM25Index
+            The loaded index.
+        """
+        with np.load(path) as arrays:
+            k1, b = arrays['params']
+            index = cls(float(k1), float(b))
+            index.terms = {term: term_id for term_id, term in enumerate(arrays['terms'].tolist())}
+            index.ids = arrays['ids']
+            index.offsets = arrays['offsets']
+            index.doc_indices = arrays['doc_indices']
+            index.impacts = arrays['impacts']
+            index.max_impacts = arrays['max_impacts']
+        return index
+
+
+def pruning_report(index, queries, k=10):
+    """
+    Compares early-terminated search with exhaustive scoring.
+
+    Parameters:
+    -----------
+    index : BM25Index
+        The index to query.
+    queries : list of str
+        The cleaned queries.
+    k : int
+        The number of results per query.
+
+    Returns:
+    --------
+    dict
+        ``postings_fraction`` (postings scored with pruning over all postings of the
+        query terms), ``identical_results`` (queries whose pruned top k matches the
+        exhaustive one), and ``ms_per_query`` / ``exhaustive_ms_per_query``.
+    """
+    start = time.perf_counter()
+    exhaustive = [index._search(query, k, exhaustive=True)[0] for query in queries]
+    exhaustive_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    start = time.perf_counter()
+    pruned = [index._search(query, k) for query in queries]
+    pruned_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    total = sum(index.postings_length(query) for query in queries)
+    scored = sum(postings_scored for _, postings_scored in pruned)
+    identical = sum(
+        [id_ for id_, _ in expected] == [id_ for id_, _ in results]
+        for expected, (results, _) in zip(exhaustive, pruned)
+    )
+    return {
+        'queries': len(queries),
+        'postings_fraction': scored / total if total else 0.0,
+        'identical_results': identical,
+        'ms_per_query': pruned_ms,
+        'exhaustive_ms_per_query': exhaustive_ms,
+    }
+
+
+if __name__ == "__main__":
+    import registry
+    from synthetic_corpus import generate_corpus
+
+    arg_parser = argparse.ArgumentParser(description="Build a BM25 index on a synthetic corpus and report pruning.")
+    arg_parser.add_argument('--resumes', type=int, default=5000)
+    arg_parser.add_argument('--jds', type=int, default=20)
+    arg_parser.add_argument('--top-k', type=int, default=10)
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--output', default=None, help="also save the index to this .npz file")
+    args = arg_parser.parse_args()
+
+    resumes, jds = generate_corpus(args.resumes, args.jds, args.skills)
+    cleaner = registry.get_text_cleaner()
+    resumes, jds = cleaner.clean_many(resumes), cleaner.clean_many(jds)
+
+    bm25 = BM25Index()
+    bm25.build(resumes)
+    if args.output:
+        bm25.save(args.output)
+    print(json.dumps(pruning_report(bm25, jds, args.top_k), indent=2))
@@ -0,0 +1,134 @@
+"""
+Length-bucketed, chunked encoding of long documents.
+
+MiniLM silently truncates input after ``max_seq_length`` tokens and pads every
+sequence of a batch to the longest one. ``ChunkedEncoder`` splits each document into
+overlapping token windows, pools the windows of all documents, sorts them by length
+so each batch holds windows of similar size, encodes them in large batches and
+averages the window embeddings back into one vector per document.
+"""
+
+import numpy as np
+
+
+class ChunkedEncoder:
+    """
+    Wraps a SentenceTransformer so long documents are encoded window by window.
+
+    The object exposes the same ``encode`` signature as the model, so it can be passed
+    anywhere a model is expected (e.g. ``encode_with_cache``).
+
+    Attributes:
+    -----------
+    model : SentenceTransformer
+        The underlying embedding model.
+    window : int
+        The number of tokens per chunk, excluding special tokens.
+    overlap : int
+        The number of tokens shared by consecutive chunks.
+    """
+
+    def __init__(self, model, window=None, overlap=32):
+        """
+        Initializes the encoder.
+
+        Parameters:
+        -----------
+        model : SentenceTransformer
+            The embedding model.
+        window : int, optional
+            Tokens per chunk; defaults to the model's ``max_seq_length`` minus the two
+            special tokens.
+        overlap : int
+            Tokens shared by consecutive chunks.
+        """
+        self.model = model
+        self.window = window or max(8, model.max_seq_length - 2)
+        self.overlap = min(overlap, self.window // 2)
+
+    def split(self, texts):
+        """
+        Splits documents into token windows.
+
+        Windows are cut on token boundaries using the tokenizer's character offsets,
+        and returned as substrings of the original text.
+
+        Parameters:
+        -----------
+        texts : list of str
+            The documents.
+
+        Returns:
+        --------
+        list of (int, str, int)
+            ``(document_index, chunk_text, n_tokens)`` for every chunk. Every document
+            yields at least one chunk, even if it is empty.
+        """
+        encoded = self.model.tokenizer(
+            list(texts), add_special_tokens=False, return_offsets_mapping=True, return_attention_mask=False,
+        )
+        step = self.window - self.overlap
+        chunks = []
+        for document_index, (text, offsets) in enumerate(zip(texts, encoded['offset_mapping'])):
+            if len(offsets) <= self.window:
+                chunks.append((document_index, text, len(offsets)))
+                continue
+            for start in range(0, len(offsets) - self.overlap, step):
+                window = offsets[start:start + self.window]
+                chunks.append((document_index, text[window[0][0]:window[-1][1]], len(window)))
+        return chunks
+
+    def encode(self, texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True, **encode_kwargs):
+        """
+        Encodes documents by encoding their chunks and mean-pooling them.
+
+        Parameters:
+        -----------
+        texts : list of str
+            The documents.
+        batch_size : int
+            The number of chunks per forward pass.
+        normalize_embeddings : bool
+            Whether the pooled document embeddings are L2-normalised.
+        convert_to_numpy : bool
+            Accepted for compatibility with ``SentenceTransformer.encode``; the result
+            is always a NumPy array.
+        **encode_kwargs
+            Extra keyword arguments passed to ``model.encode``.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(len(texts), dim)`` float32 matrix.
+        """
+        texts = list(texts)
+        dim = self.model.get_sentence_embedding_dimension()
+        if not texts:
+            return np.empty((0, dim), dtype=np.float32)
+
+        chunks = self.split(texts)
+        # Length buckets: consecutive chunks of the sorted list have similar lengths,
+        # so each batch is padded to little more than its own longest chunk
+        order = sorted(range(len(chunks)), key=lambda index: chunks[index][2])
+
+        pooled = np.zeros((len(texts), dim), dtype=np.float32)
+        weights = np.zeros(len(texts), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = [chunks[index] for index in order[start:start + batch_size]]
+            embeddings = self.model.encode(
+                [chunk_text for _, chunk_text, _ in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                **encode_kwargs,
+            )
+            for (document_index, _, n_tokens), embedding in zip(batch, embeddings):
+                # Longer chunks carry more of the document, so they weigh more
+                weight = max(n_tokens, 1)
+                pooled[document_index] += weight * embedding
+                weights[document_index] += weight
+
+        pooled /= weights[:, None]
+        if normalize_embeddings:
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled
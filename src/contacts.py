@@ -0,0 +1,130 @@
+"""
+Corpus-wide contact extraction: names, email addresses and phone numbers.
+
+Candidate names sit in the resume header, so named entity recognition only runs on
+that region: the "Contact Information" section (with any text above it) when the
+segmenter finds one near the top, otherwise the first ``max_lines`` lines. Headers are
+fed through ``nlp.pipe`` in batches, optionally across several processes. Emails and
+phone numbers are matched over the whole resume with precompiled patterns.
+
+Usage:
+    python src/contacts.py resumes --batch-size 256 --n-process 4 > contacts.jsonl
+"""
+
+import argparse
+import json
+import sys
+
+import registry
+from extractor import EMAIL_PATTERN, PHONE_PATTERN, ResumeParser
+from pipeline import list_resumes
+
+# Lines treated as the header of a resume without a contact section
+HEADER_LINES = 10
+
+
+def header_text(text, max_lines=HEADER_LINES):
+    """
+    Returns the header region of a resume.
+
+    Parameters:
+    -----------
+    text : str
+        The resume text.
+    max_lines : int
+        The number of leading lines used when there is no contact section.
+
+    Returns:
+    --------
+    str
+        Everything up to the end of the "Contact Information" section when it is the
+        first section, that section alone when it comes later, or else the first
+        ``max_lines`` lines.
+    """
+    sections = ResumeParser.SEGMENTER.segment(text)
+    contact = ResumeParser.SEGMENTER.find(sections, "Contact Information")
+    if contact is not None:
+        start = 0 if contact is sections[0] else contact.start
+        return text[start:contact.end]
+    end = -1
+    for _ in range(max_lines):
+        end = text.find('\n', end + 1)
+        if end < 0:
+            return text
+    return text[:end]
+
+
+def extract_contacts(texts, batch_size=256, n_process=1, max_lines=HEADER_LINES):
+    """
+    Extracts the contact details of many resumes.
+
+    Parameters:
+    -----------
+    texts : iterable of str
+        The resume texts; consumed lazily.
+    batch_size : int
+        The number of headers per ``nlp.pipe`` batch.
+    n_process : int
+        The number of spaCy worker processes.
+    max_lines : int
+        See ``header_text``.
+
+    Yields:
+    -------
+    dict
+        ``names`` (PERSON entities of the header, deduplicated in order), ``emails``
+        and ``phone_numbers`` for each text, in input order.
+    """
+    headers = ((header_text(text, max_lines), text) for text in texts)
+    # as_tuples carries each full text alongside its header through the (multi-process) pipe
+    for doc, text in registry.get_nlp().pipe(headers, as_tuples=True, batch_size=batch_size, n_process=n_process):
+        names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+        yield {
+            'names': list(dict.fromkeys(names)),
+            'emails': EMAIL_PATTERN.findall(text),
+            'phone_numbers': PHONE_PATTERN.findall(text),
+        }
+
+
+def _read_texts(paths):
+    for path in paths:
+        with open(path, 'r') as file:
+            yield file.read()
+
+
+def extract_contacts_from_files(paths, batch_size=256, n_process=1, max_lines=HEADER_LINES):
+    """
+    Extracts the contact details of resume files.
+
+    Parameters:
+    -----------
+    paths : list of str
+        The resume files.
+    batch_size : int
+        The number of headers per ``nlp.pipe`` batch.
+    n_process : int
+        The number of spaCy worker processes.
+    max_lines : int
+        See ``header_text``.
+
+    Yields:
+    -------
+    dict
+        An ``extract_contacts`` record with the ``path`` added, in input order.
+    """
+    records = extract_contacts(_read_texts(paths), batch_size=batch_size, n_process=n_process, max_lines=max_lines)
+    for path, record in zip(paths, records):
+        yield dict(record, path=path)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Extract names, emails and phone numbers from a directory of resumes.")
+    arg_parser.add_argument('resume_dir', nargs='?', default='resumes')
+    arg_parser.add_argument('--batch-size', type=int, default=256)
+    arg_parser.add_argument('--n-process', type=int, default=1)
+    arg_parser.add_argument('--header-lines', type=int, default=HEADER_LINES)
+    args = arg_parser.parse_args()
+
+    paths = list_resumes(args.resume_dir)
+    for record in extract_contacts_from_files(paths, args.batch_size, args.n_process, args.header_lines):
+        sys.stdout.write(json.dumps(record) + '\n')
@@ -0,0 +1,198 @@
+"""
+Shared, lazily computed representation of one resume or job description.
+
+A ``Document`` is created once per file or text and handed to ``ResumeParser``, the
+scoring engines and ``SkillMatcher``. Every derived view (section offsets, skill
+items, tokens, lemmas, cleaned text, matched skills) is computed on first access and
+kept, so no step runs twice for the same document, and every consumer sees the same
+result.
+"""
+
+import re
+
+import registry
+from segmenter import RESUME_SEGMENTER
+
+# Separators between the items of a skills section
+SKILL_ITEM_PATTERN = re.compile(r'[:,-]')
+
+
+class Document:
+    """
+    A resume or job description with its derived views computed once.
+
+    Attributes:
+    -----------
+    path : str or None
+        The file the text is read from, if any.
+    """
+
+    __slots__ = ('path', '_text', '_sections', '_skill_items', '_tokens', '_lemmas', '_cleaned',
+                 '_cleaned_experience', '_cleaned_skills', '_matched_skills')
+
+    def __init__(self, text=None, path=None):
+        """
+        Creates a document from its text or from a file that is read on first use.
+
+        Parameters:
+        -----------
+        text : str, optional
+            The raw text.
+        path : str, optional
+            The file holding the raw text; ignored when ``text`` is given.
+        """
+        if text is None and path is None:
+            raise ValueError("A Document needs a text or a path")
+        self.path = path
+        self._text = text
+        self._sections = None
+        self._skill_items = None
+        self._tokens = None
+        self._lemmas = None
+        self._cleaned = None
+        self._cleaned_experience = None
+        self._cleaned_skills = None
+        self._matched_skills = None
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Reads a document from a file.
+        """
+        with open(path, 'r') as file:
+            return cls(file.read(), path)
+
+    def __repr__(self):
+        return f"Document(path={self.path!r})" if self.path else f"Document(text={self.text[:40]!r})"
+
+    @property
+    def text(self):
+        """
+        The raw text, read from the file once.
+        """
+        if self._text is None:
+            with open(self.path, 'r') as file:
+                self._text = file.read()
+        return self._text
+
+    @property
+    def sections(self):
+        """
+        The ``Section`` offsets of every recognised resume section.
+        """
+        if self._sections is None:
+            self._sections = RESUME_SEGMENTER.segment(self.text)
+        return self._sections
+
+    def section_text(self, suffix):
+        """
+        Returns the body of the first section whose name ends with ``suffix``, or ''.
+        """
+        section = RESUME_SEGMENTER.find(self.sections, suffix)
+        if section is None:
+            return ''
+        return self.text[section.body_start:section.end].strip()
+
+    @property
+    def experience(self):
+        """
+        The body of the experience section.
+        """
+        return self.section_text("Experience")
+
+    @property
+    def skill_items(self):
+        """
+        The distinct items of the skills section, split on ':', ',' and '-', in order of appearance.
+        """
+        if self._skill_items is None:
+            items = []
+            for line in self.section_text("Skills").split('\n'):
+                items.extend(item.strip() for item in SKILL_ITEM_PATTERN.split(line) if item.strip())
+            self._skill_items = list(dict.fromkeys(items))
+        return self._skill_items
+
+    @property
+    def tokens(self):
+        """
+        The lowercase tokens of the whole text.
+        """
+        if self._tokens is None:
+            self._tokens = registry.get_text_cleaner().tokenize(self.text.lower())
+        return self._tokens
+
+    @property
+    def lemmas(self):
+        """
+        The tokens without stopwords and punctuation, lemmatized.
+        """
+        if self._lemmas is None:
+            self._lemmas = registry.get_text_cleaner().clean_tokens(self.tokens)
+        return self._lemmas
+
+    @property
+    def cleaned(self):
+        """
+        The cleaned whole text, as scored for job descriptions.
+        """
+        if self._cleaned is None:
+            self._cleaned = " ".join(self.lemmas)
+        return self._cleaned
+
+    @property
+    def cleaned_experience(self):
+        """
+        The cleaned experience section.
+        """
+        if self._cleaned_experience is None:
+            self._cleaned_experience = registry.get_text_cleaner().clean_text(self.experience)
+        return self._cleaned_experience
+
+    @property
+    def cleaned_skills(self):
+        """
+        The cleaned skills section items.
+        """
+        if self._cleaned_skills is None:
+            self._cleaned_skills = registry.get_text_cleaner().clean_text(" ".join(self.skill_items))
+        return self._cleaned_skills
+
+    @property
+    def cleaned_resume(self):
+        """
+        The cleaned experience followed by the cleaned skills, as scored for resumes.
+        """
+        return self.cleaned_experience + self.cleaned_skills
+
+    @property
+    def scored_resume(self):
+        """
+        The text the engines score for a resume: ``cleaned_resume``, or ``cleaned`` when
+        the resume has neither an experience nor a skills section.
+        """
+        if not self.experience and not self.skill_items:
+            return self.cleaned
+        return self.cleaned_resume
+
+    def matched_skills(self, matcher, skills_only=False):
+        """
+        Returns the dictionary skills a matcher finds in the document, computed once per matcher.
+
+        Parameters:
+        -----------
+        matcher : SkillMatcher
+            The compiled skill dictionary.
+        skills_only : bool
+            Match the items of the skills section instead of the whole text.
+
+        Returns:
+        --------
+        set of str
+            The canonical skill names.
+        """
+        if self._matched_skills is None:
+            self._matched_skills = {}
+        key = (matcher, skills_only)
+        if key not in self._matched_skills:
+            self._matched_skills[key] = matcher.find(" ".join(self.skill_items) if skills_only else self.text)
+        return self._matched_skills[key]
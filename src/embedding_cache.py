@@ -0,0 +1,299 @@
+"""
+Persistent, content-addressed store for sentence embeddings.
+
+Embeddings are keyed by a hash of the model name and the (cleaned) text, so a rerun
+only has to encode documents that are new or were edited. Vectors live in a
+memory-mapped float32 file and only the small key index is read at start-up.
+"""
+
+import hashlib
+import json
+import os
+import re
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _Store:
+    """
+    The memory-mapped vectors and key index of an ``EmbeddingCache``.
+
+    Kept apart from the cache so that its finalizer can write the index without
+    holding a reference to the cache itself.
+    """
+
+    INDEX_FILE = 'index.json'
+    VECTORS_FILE = 'vectors.f32'
+
+    def __init__(self, directory, model_name, max_entries):
+        self.directory = directory
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dim = None
+        # key -> slot, ordered from least to most recently used
+        self.entries = OrderedDict()
+        self.next_slot = 0
+        self.vectors = None
+        self.unsaved = 0
+
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as file:
+                index = json.load(file)
+            self.dim = index['dim']
+            self.max_entries = index['max_entries']
+            self.next_slot = index['next_slot']
+            entries = index['entries']
+            if isinstance(entries, dict):
+                # Older indexes map key -> [slot, last_used_tick]
+                entries = [(key, slot) for key, (slot, _) in sorted(entries.items(), key=lambda item: item[1][1])]
+            self.entries = OrderedDict(entries)
+            self.vectors = self.open_vectors('r+')
+
+    def open_vectors(self, mode):
+        """
+        Memory-maps the vector file.
+
+        Parameters:
+        -----------
+        mode : str
+            ``'w+'`` to create the file, ``'r+'`` to reopen it.
+
+        Returns:
+        --------
+        numpy.memmap
+            A ``(max_entries, dim)`` float32 view of the file.
+        """
+        path = os.path.join(self.directory, self.VECTORS_FILE)
+        return np.memmap(path, dtype=np.float32, mode=mode, shape=(self.max_entries, self.dim))
+
+    def save(self):
+        """
+        Flushes the vectors and writes the key index to disk.
+        """
+        if self.vectors is None:
+            return
+        self.vectors.flush()
+        index = {
+            'model_name': self.model_name,
+            'dim': self.dim,
+            'max_entries': self.max_entries,
+            'next_slot': self.next_slot,
+            # Pairs in least to most recently used order
+            'entries': list(self.entries.items()),
+        }
+        # Write to a temporary file first so an interrupted run never corrupts the index
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        with open(index_path + '.tmp', 'w') as file:
+            json.dump(index, file)
+        os.replace(index_path + '.tmp', index_path)
+        self.unsaved = 0
+
+    def close(self):
+        """
+        Writes the index if embeddings were stored since it was last written.
+        """
+        if self.unsaved:
+            self.save()
+
+
+class EmbeddingCache:
+    """
+    A size-bounded, least-recently-used embedding store backed by ``numpy.memmap``.
+
+    Attributes:
+    -----------
+    directory : str
+        The directory holding the store for this model.
+    model_name : str
+        The name of the model whose embeddings are stored.
+    max_entries : int
+        The maximum number of embeddings kept before the least recently used are evicted.
+    flush_every : int
+        The number of stored embeddings after which the key index is written to disk;
+        ``close`` writes the rest, and also runs when the cache is garbage collected
+        or at interpreter exit, whichever comes first.
+    """
+
+    INDEX_FILE = _Store.INDEX_FILE
+    VECTORS_FILE = _Store.VECTORS_FILE
+
+    def __init__(self, directory, model_name, max_entries=100_000, flush_every=1024):
+        """
+        Opens (or prepares) the store for ``model_name`` under ``directory``.
+
+        Parameters:
+        -----------
+        directory : str
+            The root directory of the cache; one sub-directory is used per model.
+        model_name : str
+            The name of the embedding model.
+        max_entries : int
+            The capacity of the store. Ignored when an existing store is reopened.
+        flush_every : int
+            The number of stored embeddings between index writes.
+        """
+        self.model_name = model_name
+        self.directory = os.path.join(directory, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+        self.flush_every = flush_every
+        self._store = _Store(self.directory, model_name, max_entries)
+        self.max_entries = self._store.max_entries
+        # Unlike atexit.register(self.close), a finalizer does not keep the cache alive until exit
+        self._finalizer = weakref.finalize(self, self._store.close)
+
+    @property
+    def dim(self):
+        """
+        The embedding dimension, or ``None`` before the first embedding is stored.
+        """
+        return self._store.dim
+
+    def __len__(self):
+        return len(self._store.entries)
+
+    def key(self, text):
+        """
+        Returns the content address of ``text`` for this model.
+
+        Parameters:
+        -----------
+        text : str
+            The cleaned text.
+
+        Returns:
+        --------
+        str
+            A hex SHA-256 digest of the model name and the text.
+        """
+        digest = hashlib.sha256(self.model_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, texts):
+        """
+        Looks up the embeddings of several texts.
+
+        Parameters:
+        -----------
+        texts : list of str
+            The cleaned texts.
+
+        Returns:
+        --------
+        list
+            One float32 vector per text, or ``None`` where the text is not cached.
+        """
+        store = self._store
+        results = []
+        for text in texts:
+            key = self.key(text)
+            slot = store.entries.get(key)
+            if slot is None:
+                results.append(None)
+                continue
+            store.entries.move_to_end(key)
+            results.append(np.array(store.vectors[slot]))
+        return results
+
+    def put(self, texts, embeddings):
+        """
+        Stores the embeddings of several texts, writing the index every ``flush_every`` embeddings.
+
+        Parameters:
+        -----------
+        texts : list of str
+            The cleaned texts.
+        embeddings : numpy.ndarray
+            A ``(len(texts), dim)`` matrix of embeddings.
+        """
+        store = self._store
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(texts) == 0:
+            return
+        if store.vectors is None:
+            store.dim = int(embeddings.shape[1])
+            os.makedirs(self.directory, exist_ok=True)
+            store.vectors = store.open_vectors('w+')
+
+        new = {}
+        for text, embedding in zip(texts, embeddings):
+            key = self.key(text)
+            slot = store.entries.get(key)
+            if slot is None:
+                new[key] = embedding
+            else:
+                store.entries.move_to_end(key)
+                store.vectors[slot] = embedding
+        # Only the most recent max_entries new embeddings can be kept
+        new = list(new.items())[-self.max_entries:]
+
+        slots = list(range(store.next_slot, min(store.next_slot + len(new), self.max_entries)))
+        store.next_slot += len(slots)
+        if len(slots) < len(new):
+            # Evict the least recently used entries. The index on disk still maps them to
+            # their slots, so write it without them before their vectors are overwritten
+            for _ in range(len(new) - len(slots)):
+                slots.append(store.entries.popitem(last=False)[1])
+            store.save()
+        for (key, embedding), slot in zip(new, slots):
+            store.entries[key] = slot
+            store.vectors[slot] = embedding
+
+        store.unsaved += len(new)
+        if store.unsaved >= self.flush_every:
+            store.save()
+
+    def save(self):
+        """
+        Flushes the vectors and writes the key index to disk.
+        """
+        self._store.save()
+
+    def close(self):
+        """
+        Writes any embeddings stored since the last index write.
+        """
+        self._store.close()
+
+
+def encode_with_cache(model, texts, cache=None, **encode_kwargs):
+    """
+    Encodes texts with ``model``, reusing cached embeddings where possible.
+
+    Parameters:
+    -----------
+    model : SentenceTransformer
+        The embedding model.
+    texts : list of str
+        The cleaned texts to encode.
+    cache : EmbeddingCache, optional
+        The store to consult first; when ``None`` every text is encoded.
+    **encode_kwargs
+        Extra keyword arguments passed to ``model.encode``.
+
+    Returns:
+    --------
+    numpy.ndarray
+        A ``(len(texts), dim)`` float32 matrix of embeddings.
+    """
+    texts = list(texts)
+    if cache is None:
+        return np.asarray(model.encode(texts, convert_to_numpy=True, **encode_kwargs), dtype=np.float32)
+
+    cached = cache.get(texts)
+    missing = [index for index, vector in enumerate(cached) if vector is None]
+    if missing:
+        # Encode each distinct missing text only once
+        missing_texts = list(dict.fromkeys(texts[index] for index in missing))
+        encoded = np.asarray(model.encode(missing_texts, convert_to_numpy=True, **encode_kwargs), dtype=np.float32)
+        cache.put(missing_texts, encoded)
+        by_text = dict(zip(missing_texts, encoded))
+        for index in missing:
+            cached[index] = by_text[texts[index]]
+
+    if not cached:
+        return np.empty((0, cache.dim or 0), dtype=np.float32)
+    return np.stack(cached)
@@ -1,7 +1,12 @@
 import re
-import spacy
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import registry
+from document import Document
+from segmenter import RESUME_SECTIONS, RESUME_SEGMENTER
+from skill_matcher import parse_skills_file
+
+# Compiled once at import; also used by the corpus-wide extraction in contacts.py
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_PATTERN = re.compile(r'(?<!\w)(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
 
 class ResumeParser:
     """
@@ -9,25 +14,42 @@ class ResumeParser:
     and compute similarities between resumes and job descriptions.
     """
     
-    RESUME_SECTIONS = [
-        "Contact Information", "Objective", "Summary", "Education", "Experience", 
-        "Skills", "Projects", "Certifications", "Licenses", "Awards", "Honors", 
-        "Publications", "References", "Technical Skills", "Computer Skills", 
-        "Programming Languages", "Software Skills", "Soft Skills", "Language Skills", 
-        "Professional Skills", "Transferable Skills", "Work Experience", 
-        "Professional Experience", "Employment History", "Internship Experience", 
-        "Volunteer Experience", "Leadership Experience", "Research Experience", 
-        "Teaching Experience",
-    ]
+    RESUME_SECTIONS = RESUME_SECTIONS
+
+    # Compiled once per process; every parser instance shares it
+    SEGMENTER = RESUME_SEGMENTER
 
     def __init__(self):
         """
-        Initializes the ResumeParser.
+        Initializes the ResumeParser. The spaCy pipeline is only loaded when first needed.
         """
-        self.nlp = spacy.load('en_core_web_sm')
-        self.resume_content = None
-        self.jd_content = None
+        # Loaded resumes and job descriptions are shared Document objects, so their
+        # sections, cleaned text and matched skills are computed once for every consumer
+        self.resume_document = None
+        self.jd_document = None
         self.skills = None
+        self.skill_matcher = None
+
+    @property
+    def resume_content(self):
+        """
+        The raw text of the loaded resume.
+        """
+        return self.resume_document.text if self.resume_document is not None else None
+
+    @property
+    def jd_content(self):
+        """
+        The raw text of the loaded job description.
+        """
+        return self.jd_document.text if self.jd_document is not None else None
+
+    @property
+    def nlp(self):
+        """
+        The shared spaCy pipeline, loaded on first use with unused components disabled.
+        """
+        return registry.get_nlp()
 
     def load_resume(self, resume_path):
         """
@@ -35,7 +57,23 @@ class ResumeParser:
 
         :param resume_path: Path to the resume text file
         """
-        self.resume_content = self._read_file(resume_path)
+        self.load_resume_document(Document.from_file(resume_path))
+
+    def load_resume_text(self, resume_content):
+        """
+        Loads the resume content from a string.
+
+        :param resume_content: Resume content as a string
+        """
+        self.load_resume_document(Document(resume_content))
+
+    def load_resume_document(self, document):
+        """
+        Loads a resume that is already wrapped in a Document.
+
+        :param document: Document of the resume
+        """
+        self.resume_document = document
 
     def load_job_description(self, jd_path):
         """
@@ -43,15 +81,24 @@ class ResumeParser:
 
         :param jd_path: Path to the job description text file
         """
-        self.jd_content = self._read_file(jd_path)
+        self.load_job_description_document(Document.from_file(jd_path))
+
+    def load_job_description_document(self, document):
+        """
+        Loads a job description that is already wrapped in a Document.
+
+        :param document: Document of the job description
+        """
+        self.jd_document = document
 
     def load_skills(self, skills_path):
         """
-        Loads the skills from a file.
+        Loads the skills from a file and compiles the skill matcher.
 
         :param skills_path: Path to the skills text file
         """
-        self.skills = self._read_skills(skills_path)
+        self.skill_matcher = registry.get_skill_matcher(skills_path)
+        self.skills = self.skill_matcher.skills
 
 
     @staticmethod
@@ -68,13 +115,12 @@ class ResumeParser:
     @staticmethod
     def _read_skills(skills_path):
         """
-        Reads the skills from a text file, each skill on a new line.
+        Reads the skills from a text file of quoted, comma-separated skill names.
 
         :param skills_path: Path to the skills file
         :return: List of skills
         """
-        with open(skills_path, 'r') as file:
-            return file.read().split('\n')
+        return parse_skills_file(skills_path)
 
     def get_cosine_similarity(self):
         """
@@ -82,42 +128,49 @@ class ResumeParser:
 
         :return: Cosine similarity score
         """
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
         count_vectorizer = CountVectorizer()
         sparse_matrix = count_vectorizer.fit_transform([self.resume_content, self.jd_content])
         return cosine_similarity(sparse_matrix, dense_output=False)[0, 1]
 
-    def extract_skills(self):
+    def get_sections(self):
         """
-        Extracts skills from the resume content.
+        Returns the sections of the resume, segmented once per document.
 
-        :return: List of extracted skills
+        :return: List of Section tuples with the offsets of every recognised section
         """
-        skills_pattern = re.compile(r'Skills\s*[:\n]', re.IGNORECASE)
-        skills_match = skills_pattern.search(self.resume_content)
+        return self.resume_document.sections
 
-        if skills_match:
-            skills_start = skills_match.end()
-            skills_end = self.resume_content.find('\n\n', skills_start)
-            skills_section = self.resume_content[skills_start:skills_end].strip()
-            skills_lines = skills_section.split('\n')
+    def get_section_text(self, suffix):
+        """
+        Returns the body of the first section whose name ends with the given suffix.
+
+        :param suffix: Section name suffix, e.g. "Experience" or "Skills"
+        :return: Section body as a string, or an empty string if there is no such section
+        """
+        return self.resume_document.section_text(suffix)
 
-            extracted_skills = []
-            for line in skills_lines:
-                line_skills = re.split(r'[:,-]', line)
-                extracted_skills.extend([skill.strip() for skill in line_skills if skill.strip()])
+    def extract_skills(self):
+        """
+        Extracts skills from the resume content.
 
-            return list(set(extracted_skills))
-        else:
-            return []
+        :return: List of extracted skills, in order of appearance
+        """
+        return list(self.resume_document.skill_items)
 
     def get_common_skills(self):
         """
         Finds the common skills between the job description and the resume.
 
-        :return: Set of common skills
+        Both sides are scanned with the compiled skill matcher, so multi-word skills
+        and aliases such as "AWS" are matched to their dictionary entry.
+
+        :return: Set of common skills, as canonical dictionary names
         """
-        jd_skills = set(self.jd_content.split())
-        resume_skills = set(self.extract_skills())
+        jd_skills = self.skill_matcher.find_document(self.jd_document)
+        resume_skills = self.skill_matcher.find_document(self.resume_document, skills_only=True)
         return jd_skills.intersection(resume_skills)
 
     def extract_names(self):
@@ -136,8 +189,7 @@ class ResumeParser:
 
         :return: List of email addresses
         """
-        email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
-        emails = re.findall(email_pattern, self.resume_content)
+        emails = EMAIL_PATTERN.findall(self.resume_content)
         return emails
 
     def extract_phone_numbers(self):
@@ -146,8 +198,7 @@ class ResumeParser:
 
         :return: List of phone numbers
         """
-        pattern = r'\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b'
-        phone_numbers = re.findall(pattern, self.resume_content)
+        phone_numbers = PHONE_PATTERN.findall(self.resume_content)
         return phone_numbers
 
     def extract_experience(self):
@@ -156,10 +207,4 @@ class ResumeParser:
 
         :return: Experience section as a string
         """
-        pattern = r'Experience\s*(?:\r?\n\s*)*(.+?)(?=\r?\n\s*(?:{}))'.format('|'.join(self.RESUME_SECTIONS))
-        match = re.search(pattern, self.resume_content, re.DOTALL)
-        
-        if match:
-            return match.group(1).strip()
-        else:
-            return ''
\ No newline at end of file
+        return self.get_section_text("Experience")
\ No newline at end of file
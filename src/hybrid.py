@@ -0,0 +1,327 @@
+"""
+Two-stage hybrid retrieval: a cheap lexical prefilter followed by a transformer re-rank.
+
+Stage one scores every resume against every job description with a cheap signal,
+either TF-IDF cosine similarity (``TfidfCorpus``) or skill coverage (``SkillMatrix``),
+and keeps the best ``candidates`` resumes per job description. Resumes lacking a job
+description's must-have skills are rejected with bitset masks before either stage
+ranks them. Stage two encodes only the union of those candidates with
+``ATSTransformer`` and re-ranks them by embedding similarity. ``HybridRanker.evaluate``
+reports recall@k of the cascade against a full transformer run, together with the
+fraction of the corpus that had to be encoded.
+
+Texts are passed raw, or as ``Document``. TF-IDF and the transformer see resumes as
+the engines score them, as their cleaned experience and skills sections (or the whole
+cleaned text when a resume has neither, see ``Document.scored_resume``), and job
+descriptions as their cleaned text; the exact baseline of ``evaluate`` uses the same strings. Skills are matched on the raw text,
+where casing ("Go", "R"), "C#"/"C++" and separators are still intact.
+
+Usage:
+    python src/hybrid.py --resumes 2000 --jds 20 --candidates 50 100 200
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from document import Document
+from ranking import top_k, top_k_per_column
+from skill_matrix import SkillMatrix
+
+PREFILTERS = ('tfidf', 'skills')
+
+
+def as_documents(texts):
+    """
+    Wraps raw texts as Documents; Documents are passed through so their cached views are reused.
+    """
+    return [text if isinstance(text, Document) else Document(text) for text in texts]
+
+
+class HybridRanker:
+    """
+    Ranks resumes for job descriptions with a lexical prefilter and a transformer re-rank.
+
+    Attributes:
+    -----------
+    transformer : ATSTransformer
+        The re-ranking engine.
+    prefilter : str
+        ``'tfidf'`` or ``'skills'``.
+    candidates : int
+        The number of resumes per job description passed to the transformer.
+    resume_documents : list of Document
+        The resumes, set by ``fit``.
+    resume_texts : list of str
+        The cleaned resume texts as the engines score them, set by ``fit``.
+    """
+
+    def __init__(self, transformer=None, prefilter='tfidf', candidates=100, skills_path='meta/skills.txt'):
+        """
+        Initializes the ranker.
+
+        Parameters:
+        -----------
+        transformer : ATSTransformer, optional
+            The re-ranking engine; a default ``ATSTransformer`` is created when omitted.
+        prefilter : str
+            The stage-one scorer, ``'tfidf'`` or ``'skills'``.
+        candidates : int
+            The number of stage-one survivors per job description.
+        skills_path : str
+            The skills file used by the ``'skills'`` prefilter.
+        """
+        if prefilter not in PREFILTERS:
+            raise ValueError(f"Unknown prefilter {prefilter!r}; expected one of {PREFILTERS}")
+        if transformer is None:
+            from ats_transformer import ATSTransformer
+            transformer = ATSTransformer()
+        self.transformer = transformer
+        self.prefilter = prefilter
+        self.candidates = candidates
+        self.skills_path = skills_path
+        self.resume_documents = []
+        self.resume_texts = []
+        self._corpus = None
+        self._skill_matrix = None
+        self._resume_incidence = None
+        self._resume_bits = None
+
+    def fit(self, resume_texts):
+        """
+        Prepares the stage-one scorer for a resume corpus.
+
+        Parameters:
+        -----------
+        resume_texts : list of str or Document
+            The raw resume texts.
+        """
+        self.resume_documents = as_documents(resume_texts)
+        self.resume_texts = [document.scored_resume for document in self.resume_documents]
+        self._resume_incidence = None
+        self._resume_bits = None
+        if self.prefilter == 'tfidf':
+            from ats_tfidf import TfidfCorpus
+            self._corpus = TfidfCorpus()
+            self._corpus.fit_texts(self.resume_texts)
+        else:
+            self._encode_resume_skills()
+
+    def _encode_resume_skills(self):
+        """
+        Encodes the skills of every resume once, as incidence rows and bitsets.
+        """
+        if self._resume_incidence is None:
+            self._skill_matrix = SkillMatrix.from_file(self.skills_path)
+            self._resume_incidence = self._skill_matrix.encode_documents(self.resume_documents)
+            self._resume_bits = self._skill_matrix.bitsets(self._resume_incidence)
+
+    def prefilter_scores(self, jd_texts):
+        """
+        Scores every resume against every job description with the stage-one signal.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The raw job description texts, or their Documents.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(n_resumes, n_jds)`` score matrix.
+        """
+        jd_documents = as_documents(jd_texts)
+        if self.prefilter == 'tfidf':
+            return self._corpus.score([document.cleaned for document in jd_documents])
+
+        # Fraction of the role's skills the resume mentions
+        jd_incidence = self._skill_matrix.encode_documents(jd_documents)
+        return self._skill_matrix.scores(self._resume_incidence, jd_incidence).coverage
+
+    def eligible(self, must_have):
+        """
+        Tests which resumes hold every must-have skill of each job description.
+
+        Parameters:
+        -----------
+        must_have : list of list of str
+            The required skill names (or aliases) of each job description.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(n_resumes, n_jds)`` boolean mask.
+        """
+        self._encode_resume_skills()
+        must_have_bits = self._skill_matrix.bitsets(self._skill_matrix.encode_must_have(must_have))
+        return self._skill_matrix.eligible(self._resume_bits, must_have_bits)
+
+    def shortlist(self, jd_texts, candidates=None, must_have=None):
+        """
+        Selects the stage-one survivors of each job description.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The raw job description texts, or their Documents.
+        candidates : int, optional
+            Overrides the number of survivors per job description.
+        must_have : list of list of str, optional
+            The required skills of each job description; resumes missing any of
+            them never reach the shortlist.
+
+        Returns:
+        --------
+        list of numpy.ndarray
+            The resume indices kept for each job description.
+        """
+        candidates = candidates or self.candidates
+        scores = self.prefilter_scores(jd_texts)
+        if must_have is None:
+            return [np.array([index for index, _ in hits], dtype=np.int64) for hits in top_k_per_column(scores, candidates)]
+
+        if len(must_have) != scores.shape[1]:
+            raise ValueError(f"Expected one must-have list per job description ({scores.shape[1]}), "
+                             f"got {len(must_have)}")
+        mask = self.eligible(must_have)
+        shortlists = []
+        for column in range(scores.shape[1]):
+            # Rank only the qualifying resumes, then map back to corpus indices
+            qualifying = np.flatnonzero(mask[:, column])
+            hits = top_k(scores[qualifying, column], candidates)
+            shortlists.append(qualifying[[index for index, _ in hits]].astype(np.int64))
+        return shortlists
+
+    def rerank(self, shortlists, jd_texts, top_k_resumes=10):
+        """
+        Re-ranks each job description's shortlist by embedding similarity.
+
+        Every shortlisted resume is encoded once, even if it survives for several
+        job descriptions.
+
+        Parameters:
+        -----------
+        shortlists : list of numpy.ndarray
+            The resume indices kept for each job description, from ``shortlist``.
+        jd_texts : list of str
+            The raw job description texts, or their Documents.
+        top_k_resumes : int
+            The number of best resumes to return per job description.
+
+        Returns:
+        --------
+        list of list of (int, float)
+            For each job description, ``(resume_index, score)`` pairs ordered from best to worst;
+            empty when its shortlist is empty.
+        """
+        unique = np.unique(np.concatenate(shortlists)) if shortlists else np.empty(0, dtype=np.int64)
+        # Must-have filters can leave every shortlist empty; there is nothing to encode then
+        if unique.size == 0:
+            return [[] for _ in shortlists]
+        # Row of each shortlisted resume in the embedding matrix
+        rows = np.full(len(self.resume_texts), -1, dtype=np.int64)
+        rows[unique] = np.arange(unique.size)
+
+        resume_embeddings = self.transformer.encode([self.resume_texts[index] for index in unique])
+        jd_embeddings = self.transformer.encode([document.cleaned for document in as_documents(jd_texts)])
+
+        rankings = []
+        for shortlist, jd_embedding in zip(shortlists, jd_embeddings):
+            if shortlist.size == 0:
+                rankings.append([])
+                continue
+            scores = resume_embeddings[rows[shortlist]] @ jd_embedding
+            rankings.append([(int(shortlist[index]), score) for index, score in top_k(scores, top_k_resumes)])
+        return rankings
+
+    def rank(self, jd_texts, top_k_resumes=10, must_have=None):
+        """
+        Runs both stages for a set of job descriptions.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The raw job description texts, or their Documents.
+        top_k_resumes : int
+            The number of best resumes to return per job description.
+        must_have : list of list of str, optional
+            The required skills of each job description; see ``shortlist``.
+
+        Returns:
+        --------
+        list of list of (int, float)
+            See ``rerank``.
+        """
+        jd_documents = as_documents(jd_texts)
+        return self.rerank(self.shortlist(jd_documents, must_have=must_have), jd_documents, top_k_resumes)
+
+    def evaluate(self, jd_texts, top_k_resumes=10, candidate_counts=(50, 100, 200)):
+        """
+        Measures recall@k and cost of the cascade against a full transformer run.
+
+        Parameters:
+        -----------
+        jd_texts : list of str
+            The raw job description texts, or their Documents.
+        top_k_resumes : int
+            The k of recall@k.
+        candidate_counts : iterable of int
+            The shortlist sizes to evaluate.
+
+        Returns:
+        --------
+        dict
+            ``exact_seconds`` of the full run and one row per shortlist size with
+            ``candidates``, ``recall``, ``encoded_fraction`` (the share of resumes the
+            transformer encoded), ``prefilter_seconds`` and ``rerank_seconds``.
+        """
+        jd_texts = as_documents(jd_texts)
+        start = time.perf_counter()
+        _, exact = self.transformer.rank(self.resume_texts, [document.cleaned for document in jd_texts],
+                                         top_k=top_k_resumes)
+        exact_seconds = time.perf_counter() - start
+        truth = [set(index for index, _ in hits) for hits in exact]
+        expected_total = sum(len(expected) for expected in truth)
+
+        rows = []
+        for candidates in candidate_counts:
+            start = time.perf_counter()
+            shortlists = self.shortlist(jd_texts, candidates)
+            prefilter_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rankings = self.rerank(shortlists, jd_texts, top_k_resumes)
+            rerank_seconds = time.perf_counter() - start
+
+            found = sum(len(expected & set(index for index, _ in hits)) for expected, hits in zip(truth, rankings))
+            encoded = np.unique(np.concatenate(shortlists)).size if shortlists else 0
+            rows.append({
+                'candidates': candidates,
+                'recall': found / expected_total if expected_total else 1.0,
+                'encoded_fraction': encoded / max(len(self.resume_texts), 1),
+                'prefilter_seconds': prefilter_seconds,
+                'rerank_seconds': rerank_seconds,
+            })
+        return {'prefilter': self.prefilter, 'top_k': top_k_resumes, 'exact_seconds': exact_seconds, 'runs': rows}
+
+
+if __name__ == "__main__":
+    from synthetic_corpus import generate_corpus
+
+    arg_parser = argparse.ArgumentParser(description="Report recall@k and cost of the hybrid cascade.")
+    arg_parser.add_argument('--resumes', type=int, default=2000)
+    arg_parser.add_argument('--jds', type=int, default=20)
+    arg_parser.add_argument('--candidates', type=int, nargs='+', default=[50, 100, 200])
+    arg_parser.add_argument('--top-k', type=int, default=10)
+    arg_parser.add_argument('--prefilter', default='tfidf', choices=PREFILTERS)
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    resumes, jds = generate_corpus(args.resumes, args.jds, args.skills, seed=args.seed)
+
+    ranker = HybridRanker(prefilter=args.prefilter, skills_path=args.skills)
+    ranker.fit(resumes)
+    print(json.dumps(ranker.evaluate(jds, args.top_k, args.candidates), indent=2))
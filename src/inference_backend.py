@@ -0,0 +1,187 @@
+"""
+CPU inference backends for the sentence embedding model.
+
+``fp32`` is the stock SentenceTransformer. ``int8`` applies PyTorch dynamic
+quantization to every ``nn.Linear`` layer, which is where MiniLM spends almost all
+of its time on CPU. ``score_drift`` measures how far int8 scores move from fp32 on
+a reference set, and how much faster int8 runs, so the trade-off can be judged.
+
+Usage:
+    python src/inference_backend.py --resumes 200 --jds 10
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+BACKENDS = ('fp32', 'int8')
+
+
+def available_cpus():
+    """
+    Returns the number of CPUs this process may run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS or Windows
+        return os.cpu_count() or 1
+
+
+def tune_threads(threads=None):
+    """
+    Sets the torch intra-op thread count for this host.
+
+    Parameters:
+    -----------
+    threads : int, optional
+        The thread count; defaults to the CPUs available to the process, which avoids
+        oversubscription inside containers with a CPU quota or affinity mask.
+
+    Returns:
+    --------
+    int
+        The thread count in effect.
+    """
+    import torch
+
+    threads = threads or available_cpus()
+    torch.set_num_threads(threads)
+    try:
+        # Encoding is one large op at a time; inter-op parallelism only adds contention
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # can only be set before the first parallel region runs
+    return torch.get_num_threads()
+
+
+def quantize(model):
+    """
+    Returns an int8 dynamically quantized copy of a model.
+
+    Parameters:
+    -----------
+    model : SentenceTransformer
+        The fp32 model.
+
+    Returns:
+    --------
+    SentenceTransformer
+        A copy whose ``nn.Linear`` weights are int8; activations are quantized on the fly.
+    """
+    import torch
+
+    model = model.to('cpu').eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_model(model_name, backend='fp32', threads=None):
+    """
+    Loads the embedding model for a backend.
+
+    Parameters:
+    -----------
+    model_name : str
+        The SentenceTransformer model name.
+    backend : str
+        ``'fp32'`` or ``'int8'``.
+    threads : int, optional
+        The torch thread count; see ``tune_threads``.
+
+    Returns:
+    --------
+    SentenceTransformer
+        The model, ready for CPU inference.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    tune_threads(threads)
+    model = SentenceTransformer(model_name, device='cpu')
+    if backend == 'int8':
+        model = quantize(model)
+    return model
+
+
+def score_drift(reference_model, candidate_model, resume_texts, jd_texts, top_k=10, batch_size=64):
+    """
+    Compares the resume x JD scores of two models on a reference set.
+
+    Parameters:
+    -----------
+    reference_model : SentenceTransformer
+        The baseline model, normally fp32.
+    candidate_model : SentenceTransformer
+        The model under evaluation, normally int8.
+    resume_texts : list of str
+        The cleaned reference resumes.
+    jd_texts : list of str
+        The cleaned reference job descriptions.
+    top_k : int
+        The cut-off for the top-k overlap.
+    batch_size : int
+        The encoding batch size.
+
+    Returns:
+    --------
+    dict
+        Mean and max absolute score difference, mean top-k overlap per JD, and
+        encoding throughput (texts/second) of both models, each measured after one
+        warm-up batch, with their speed-up.
+    """
+    from ranking import top_k_per_column
+
+    def score(model):
+        # One untimed batch first, so lazy initialisation and cold caches are not
+        # charged to whichever model happens to run first
+        model.encode((resume_texts + jd_texts)[:batch_size], batch_size=batch_size, convert_to_numpy=True)
+        start = time.perf_counter()
+        resumes = model.encode(resume_texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        jds = model.encode(jd_texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        seconds = time.perf_counter() - start
+        return resumes @ jds.T, (len(resume_texts) + len(jd_texts)) / seconds
+
+    reference_scores, reference_throughput = score(reference_model)
+    candidate_scores, candidate_throughput = score(candidate_model)
+    difference = np.abs(reference_scores - candidate_scores)
+
+    overlaps = []
+    for expected, actual in zip(top_k_per_column(reference_scores, top_k), top_k_per_column(candidate_scores, top_k)):
+        expected_ids = {index for index, _ in expected}
+        overlaps.append(len(expected_ids & {index for index, _ in actual}) / max(len(expected_ids), 1))
+
+    return {
+        'pairs': int(difference.size),
+        'mean_abs_score_drift': float(difference.mean()),
+        'max_abs_score_drift': float(difference.max()),
+        f'mean_top{top_k}_overlap': float(np.mean(overlaps)),
+        'reference_texts_per_second': reference_throughput,
+        'candidate_texts_per_second': candidate_throughput,
+        'speedup': candidate_throughput / reference_throughput,
+    }
+
+
+if __name__ == "__main__":
+    import registry
+    from synthetic_corpus import generate_corpus
+
+    arg_parser = argparse.ArgumentParser(description="Report int8 vs fp32 score drift and throughput.")
+    arg_parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    arg_parser.add_argument('--resumes', type=int, default=200)
+    arg_parser.add_argument('--jds', type=int, default=10)
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--threads', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    resumes, jds = generate_corpus(args.resumes, args.jds, args.skills)
+    cleaner = registry.get_text_cleaner()
+    resumes, jds = cleaner.clean_many(resumes), cleaner.clean_many(jds)
+
+    fp32_model = load_model(args.model, 'fp32', args.threads)
+    int8_model = quantize(fp32_model)
+    report = score_drift(fp32_model, int8_model, resumes, jds)
+    report['threads'] = tune_threads(args.threads)
+    print(json.dumps(report, indent=2))
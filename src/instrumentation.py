@@ -0,0 +1,215 @@
+"""
+Opt-in per-stage timing and memory instrumentation for the scoring pipeline.
+
+The engines wrap each stage (reading, cleaning, extraction, vectorizing/encoding,
+similarity) in ``instrumentation.stage(name, document)``. By default they hold
+``NULL_INSTRUMENTATION``, whose ``stage`` returns one shared no-op context manager,
+so the disabled cost is a method call per stage.
+
+Stages that process one resume are also broken down per document; batch stages
+(``ATSTransformer.rank``, ``score_pairs``) only count towards the per-stage totals.
+
+Example:
+    with Instrumentation(track_memory=True) as instrumentation:
+        ats = ATS(instrumentation=instrumentation)
+        ats.load_data(resume_path, jd_path, skills_path)
+        ats.compute_similarity()
+    print(instrumentation.report())
+"""
+
+import time
+import tracemalloc
+
+
+class _NullStage:
+    """
+    A reusable context manager that does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class NullInstrumentation:
+    """
+    The disabled instrumentation: records nothing.
+    """
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name, document=None):
+        return self._stage
+
+    def report(self):
+        return {'stages': {}, 'documents': {}}
+
+    def close(self):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class _Stage:
+    """
+    Times one execution of a stage and hands the measurement to its Instrumentation.
+    """
+
+    __slots__ = ('instrumentation', 'name', 'document', 'start', 'memory_start')
+
+    def __init__(self, instrumentation, name, document):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.document = document
+
+    def __enter__(self):
+        if self.instrumentation.track_memory:
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if self.instrumentation.track_memory:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self.memory_start)
+        self.instrumentation.record(self.name, self.document, seconds, peak)
+        return False
+
+
+class Instrumentation:
+    """
+    Records wall time, call counts and (optionally) peak memory per stage and per document.
+
+    Attributes:
+    -----------
+    track_memory : bool
+        Whether peak memory is measured with ``tracemalloc``. This slows the traced
+        code down noticeably, so it is off by default, and ``close`` (or leaving the
+        ``with`` block) stops the tracing this instance started.
+    callback : callable, optional
+        Called as ``callback(record)`` after every stage, with a dict holding
+        ``stage``, ``document``, ``seconds`` and ``peak_memory_bytes``.
+    """
+
+    enabled = True
+
+    def __init__(self, track_memory=False, callback=None):
+        """
+        Initializes an empty recorder.
+
+        Parameters:
+        -----------
+        track_memory : bool
+            Measure peak memory per stage with ``tracemalloc``.
+        callback : callable, optional
+            A hook receiving every stage record as it is produced.
+        """
+        self.track_memory = track_memory
+        self.callback = callback
+        self._stages = {}
+        self._documents = {}
+        self._started_tracing = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Stops memory tracking, and ``tracemalloc`` if this instance started it; the
+        recorded statistics stay available.
+        """
+        self.track_memory = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def stage(self, name, document=None):
+        """
+        Returns a context manager that measures one execution of a stage.
+
+        Parameters:
+        -----------
+        name : str
+            The stage name, e.g. "cleaning".
+        document : str, optional
+            The document being processed, for the per-document breakdown; omitted
+            for stages that process a whole batch.
+
+        Returns:
+        --------
+        context manager
+            The measuring context.
+        """
+        return _Stage(self, name, document)
+
+    def record(self, name, document, seconds, peak_memory_bytes=None):
+        """
+        Adds one measurement to the aggregate and per-document statistics.
+
+        Parameters:
+        -----------
+        name : str
+            The stage name.
+        document : str or None
+            The document the stage processed.
+        seconds : float
+            The wall time of the stage.
+        peak_memory_bytes : int, optional
+            The peak memory allocated during the stage.
+        """
+        targets = [self._stages.setdefault(name, self._empty_stats())]
+        if document is not None:
+            targets.append(self._documents.setdefault(document, {}).setdefault(name, self._empty_stats()))
+        for stats in targets:
+            stats['calls'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            if peak_memory_bytes is not None:
+                stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'] or 0, peak_memory_bytes)
+
+        if self.callback is not None:
+            self.callback({
+                'stage': name,
+                'document': document,
+                'seconds': seconds,
+                'peak_memory_bytes': peak_memory_bytes,
+            })
+
+    def report(self):
+        """
+        Returns the recorded statistics.
+
+        Returns:
+        --------
+        dict
+            ``stages`` (aggregate per stage) and ``documents`` (per document, per stage),
+            each entry holding ``calls``, ``total_seconds``, ``max_seconds``,
+            ``mean_seconds`` and ``peak_memory_bytes``.
+        """
+        def finish(stats):
+            return dict(stats, mean_seconds=stats['total_seconds'] / stats['calls'])
+
+        return {
+            'stages': {name: finish(stats) for name, stats in self._stages.items()},
+            'documents': {
+                document: {name: finish(stats) for name, stats in stages.items()}
+                for document, stages in self._documents.items()
+            },
+        }
+
+    @staticmethod
+    def _empty_stats():
+        return {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'peak_memory_bytes': None}
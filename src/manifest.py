@@ -0,0 +1,313 @@
+"""
+Incremental corpus manifest.
+
+The manifest records, for every resume and job description, the hash of its content
+and the artifacts derived from it: extracted sections, cleaned text and matched
+skills. Each artifact is stored with a fingerprint of exactly the inputs it depends on
+(file content plus the version of the segmenter, the cleaner or the skill matcher), so
+a run only recomputes the stages whose inputs changed. Editing ``meta/skills.txt``,
+``skill_matcher.EXTRA_ALIASES`` or bumping ``SkillMatcher.VERSION`` recomputes matched
+skills but not cleaned text; bumping ``TextCleaner.VERSION`` recomputes cleaned text but
+not sections.
+
+``pipeline.ingest`` takes a manifest to skip the resumes whose sections and cleaned text
+are up to date, and ``refresh_corpus`` brings a whole corpus up to date through it.
+
+Usage:
+    python src/manifest.py --resumes resumes --jds job_descriptions --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+import registry
+from pipeline import ingest
+from segmenter import SectionSegmenter
+from skill_matcher import CASE_SENSITIVE_MAX_LENGTH, EXTRA_ALIASES, SkillMatcher
+from text_cleaner import TextCleaner
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+def content_hash(data):
+    """
+    Returns the SHA-256 hex digest of a string or bytes.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def current_versions(skills_path, model_name=DEFAULT_MODEL_NAME, fast_tokenizer=False):
+    """
+    Returns the versions of every component that produces manifest artifacts.
+
+    Parameters:
+    -----------
+    skills_path : str
+        The path to the skills file; its content, the matcher version and its alias
+        rules make up the version of matched skills.
+    model_name : str
+        The embedding model whose scores depend on the cleaned text.
+    fast_tokenizer : bool
+        Whether the cleaner uses the fast regex tokenizer.
+
+    Returns:
+    --------
+    dict
+        ``segmenter``, ``cleaner``, ``skills`` and ``model`` versions.
+    """
+    with open(skills_path, 'rb') as file:
+        skills_file = file.read()
+    # Matches depend on the matcher's code and alias table as much as on the skills list
+    matcher_rules = json.dumps([SkillMatcher.VERSION, CASE_SENSITIVE_MAX_LENGTH, EXTRA_ALIASES], sort_keys=True)
+    return {
+        'segmenter': str(SectionSegmenter.VERSION),
+        'cleaner': f"{TextCleaner.VERSION}{'-fast' if fast_tokenizer else ''}",
+        'skills': content_hash(skills_file + matcher_rules.encode('utf-8')),
+        'model': model_name,
+    }
+
+
+class CorpusManifest:
+    """
+    A JSON file of per-document artifacts keyed by the fingerprint of their inputs.
+
+    Attributes:
+    -----------
+    path : str
+        The manifest file.
+    versions : dict
+        The component versions of the current run.
+    recomputed : dict
+        Stage name -> list of document keys recomputed during this run.
+    """
+
+    def __init__(self, path, versions):
+        """
+        Loads the manifest at ``path`` if it exists.
+
+        Parameters:
+        -----------
+        path : str
+            The manifest file.
+        versions : dict
+            See ``current_versions``.
+        """
+        self.path = path
+        self.versions = versions
+        self.documents = {}
+        self.recomputed = {}
+        self.previous_versions = {}
+        if os.path.exists(path):
+            with open(path, 'r') as file:
+                stored = json.load(file)
+            self.documents = stored['documents']
+            self.previous_versions = stored['versions']
+
+    @property
+    def model_changed(self):
+        """
+        Whether the embedding model differs from the last run, in which case every score is stale.
+
+        Embeddings themselves are content-addressed by model in ``EmbeddingCache``.
+        """
+        return self.previous_versions.get('model', self.versions['model']) != self.versions['model']
+
+    def fingerprints(self, digest):
+        """
+        Returns the fingerprint of every stage of a document with content hash ``digest``.
+        """
+        sections = f"{digest}:{self.versions['segmenter']}"
+        return {
+            'sections': sections,
+            'cleaned': f"{sections}:{self.versions['cleaner']}",
+            'skills': f"{sections}:{self.versions['skills']}",
+        }
+
+    def ingested(self, resume_path):
+        """
+        Looks up the ``pipeline.process_resume`` record of a resume.
+
+        Parameters:
+        -----------
+        resume_path : str
+            The path to the resume file.
+
+        Returns:
+        --------
+        tuple of (str, dict or None)
+            The content hash of the file, and its record, or ``None`` if its sections
+            or cleaned text are missing or stale.
+        """
+        with open(resume_path, 'r') as file:
+            digest = content_hash(file.read())
+        fingerprints = self.fingerprints(digest)
+        stages = self.documents.get(resume_path, {}).get('stages', {})
+        if any(stages.get(stage, {}).get('fingerprint') != fingerprints[stage] for stage in ('sections', 'cleaned')):
+            return digest, None
+        sections, cleaned = stages['sections']['value'], stages['cleaned']['value']
+        return digest, {
+            'path': resume_path,
+            'experience': sections['experience'],
+            'skills': sections['skills'],
+            'cleaned_experience': cleaned['experience'],
+            'cleaned_skills': cleaned['skills'],
+        }
+
+    def record_ingested(self, digest, record):
+        """
+        Stores the sections and cleaned text of a freshly processed resume.
+
+        Parameters:
+        -----------
+        digest : str
+            The content hash of the resume, from ``ingested``.
+        record : dict
+            Its ``pipeline.process_resume`` record.
+        """
+        path = record['path']
+        fingerprints = self.fingerprints(digest)
+        self.documents.setdefault(path, {})['hash'] = digest
+        self.stage(path, 'sections', fingerprints['sections'],
+                   lambda: {'experience': record['experience'], 'skills': record['skills']})
+        self.stage(path, 'cleaned', fingerprints['cleaned'],
+                   lambda: {'experience': record['cleaned_experience'], 'skills': record['cleaned_skills']})
+
+    def stage(self, document_key, stage, fingerprint, compute):
+        """
+        Returns a stage's artifact for a document, recomputing it only if its fingerprint changed.
+
+        Parameters:
+        -----------
+        document_key : str
+            The document identifier, e.g. its path.
+        stage : str
+            The stage name.
+        fingerprint : str
+            A string identifying every input of the stage.
+        compute : callable
+            A zero-argument function producing the artifact; its result must be JSON serialisable.
+
+        Returns:
+        --------
+        object
+            The cached or freshly computed artifact.
+        """
+        stages = self.documents.setdefault(document_key, {}).setdefault('stages', {})
+        entry = stages.get(stage)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            entry = {'fingerprint': fingerprint, 'value': compute()}
+            stages[stage] = entry
+            self.recomputed.setdefault(stage, []).append(document_key)
+        return entry['value']
+
+    def retain(self, document_keys):
+        """
+        Drops the records of documents that are no longer in the corpus.
+
+        Parameters:
+        -----------
+        document_keys : iterable of str
+            The keys of the documents still present.
+        """
+        document_keys = set(document_keys)
+        for key in list(self.documents):
+            if key not in document_keys:
+                del self.documents[key]
+
+    def save(self):
+        """
+        Writes the manifest atomically.
+        """
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump({'versions': self.versions, 'documents': self.documents}, file)
+        os.replace(self.path + '.tmp', self.path)
+
+
+def _list_texts(directory):
+    if not directory or not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith('.txt')]
+
+
+def refresh_corpus(manifest, resume_dir, jd_dir, skills_path, workers=None):
+    """
+    Brings the manifest up to date with the resume and job description directories.
+
+    Parameters:
+    -----------
+    manifest : CorpusManifest
+        The manifest to update.
+    resume_dir : str
+        The directory containing the resume text files.
+    jd_dir : str
+        The directory containing the job description text files.
+    skills_path : str
+        The path to the skills file.
+    workers : int, optional
+        The number of processes cleaning stale resumes; see ``pipeline.ingest``.
+
+    Returns:
+    --------
+    dict
+        Document path -> record with ``hash``, ``sections``, ``cleaned`` and ``skills``.
+        Documents whose ``cleaned`` stage is listed in ``manifest.recomputed`` are the
+        ones whose scores need recomputing.
+    """
+    fast_tokenizer = manifest.versions['cleaner'].endswith('-fast')
+    matcher = registry.get_skill_matcher(skills_path)
+    cleaner = registry.get_text_cleaner(fast_tokenizer=fast_tokenizer)
+
+    records = {}
+    # Resumes go through the ingestion pipeline, which only processes the stale ones
+    for record in ingest(_list_texts(resume_dir), skills_path, workers=workers, manifest=manifest,
+                         fast_tokenizer=fast_tokenizer):
+        path = record['path']
+        digest = manifest.documents[path]['hash']
+        skills = manifest.stage(path, 'skills', manifest.fingerprints(digest)['skills'],
+                                lambda: sorted(matcher.find(" ".join(record['skills']))))
+        records[path] = {
+            'hash': digest,
+            'sections': {'experience': record['experience'], 'skills': record['skills']},
+            'cleaned': record['cleaned_experience'] + record['cleaned_skills'],
+            'skills': skills,
+        }
+
+    for path in _list_texts(jd_dir):
+        with open(path, 'r') as file:
+            content = file.read()
+        digest = content_hash(content)
+        manifest.documents.setdefault(path, {})['hash'] = digest
+        fingerprints = manifest.fingerprints(digest)
+        # A job description is used whole; there are no sections to store
+        sections = manifest.stage(path, 'sections', fingerprints['sections'], dict)
+        cleaned = manifest.stage(path, 'cleaned', fingerprints['cleaned'], lambda: cleaner.clean_text(content))
+        skills = manifest.stage(path, 'skills', fingerprints['skills'], lambda: sorted(matcher.find(content)))
+        records[path] = {'hash': digest, 'sections': sections, 'cleaned': cleaned, 'skills': skills}
+
+    manifest.retain(records)
+    return records
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Update the corpus manifest, recomputing only changed stages.")
+    arg_parser.add_argument('--resumes', default='resumes')
+    arg_parser.add_argument('--jds', default='job_descriptions')
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    arg_parser.add_argument('--manifest', default='.ats_manifest.json')
+    arg_parser.add_argument('--workers', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    manifest = CorpusManifest(args.manifest, current_versions(args.skills, args.model))
+    records = refresh_corpus(manifest, args.resumes, args.jds, args.skills, workers=args.workers)
+    manifest.save()
+
+    print(f"{len(records)} documents in manifest")
+    for stage in ('sections', 'cleaned', 'skills'):
+        print(f"  {stage}: {len(manifest.recomputed.get(stage, []))} recomputed")
+    if manifest.model_changed:
+        print("  model changed: all scores need recomputing")
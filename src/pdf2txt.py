@@ -1,53 +1,225 @@
 """
 Module to convert PDF --> TXT while preserving only lowercased alphanumeric characters.
+
+Pages are extracted one at a time through a generator and each page's cleaned text is
+written out as soon as it is ready, so a document is never held in memory as a whole.
+A directory is converted across a process pool, and a PDF whose content hash matches
+the one recorded at its last conversion is skipped.
+
+Usage:
+    python src/pdf2txt.py resumes --output-dir resumes --workers 4
 """
 
-import PyPDF2
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
 import re
-import string
 
-# Open the PDF file
-pdf_file = open('resumes/mradul_cv.pdf', 'rb')
+# Name of the file, inside the output directory, recording the hash of every converted PDF
+MANIFEST_FILE = '.pdf2txt.json'
+
+# Converted PDFs between two writes of the manifest
+MANIFEST_SAVE_EVERY = 100
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+
+
+def iter_pages(pdf_path):
+    """
+    Yields the extracted text of each page of a PDF.
+
+    Parameters:
+    -----------
+    pdf_path : str
+        The path to the PDF file.
+
+    Yields:
+    -------
+    str
+        The text of one page.
+    """
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ''
+
+
+def clean_lines(text):
+    """
+    Removes non-alphanumeric characters, lowercases and drops empty lines.
+
+    Parameters:
+    -----------
+    text : str
+        The raw text of a page.
+
+    Returns:
+    --------
+    list of str
+        The non-empty cleaned lines.
+    """
+    cleaned_text = NON_ALPHANUMERIC_PATTERN.sub('', text).lower()
+    return [line.strip() for line in cleaned_text.split('\n') if line.strip()]
+
+
+def file_hash(path):
+    """
+    Returns the SHA-256 of a file, read in blocks.
+
+    Parameters:
+    -----------
+    path : str
+        The file to hash.
+
+    Returns:
+    --------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def convert_pdf(pdf_path, txt_path):
+    """
+    Converts one PDF to a cleaned text file, writing page by page.
+
+    As before, all non-empty lines are joined into a single space-separated paragraph.
+    The output is written to a temporary file and renamed once complete; the
+    temporary file is removed if the conversion fails.
+
+    Parameters:
+    -----------
+    pdf_path : str
+        The path to the PDF file.
+    txt_path : str
+        The path of the text file to write.
+    """
+    tmp_path = txt_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as text_file:
+            separator = ''
+            for page_text in iter_pages(pdf_path):
+                for line in clean_lines(page_text):
+                    text_file.write(separator + line)
+                    separator = ' '
+        os.replace(tmp_path, txt_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _convert_job(job):
+    """
+    Hashes one PDF in a worker process and converts it unless it is unchanged.
+
+    Parameters:
+    -----------
+    job : tuple of (str, str, str or None)
+        The PDF path, the text path and the hash recorded at its last conversion.
+
+    Returns:
+    --------
+    tuple of (str, str or None, str, str or None)
+        The PDF file name, its hash, ``'converted'``, ``'skipped'`` or ``'failed'``,
+        and an error message if the conversion failed.
+    """
+    pdf_path, txt_path, recorded = job
+    name = os.path.basename(pdf_path)
+    digest = None
+    try:
+        digest = file_hash(pdf_path)
+        if digest == recorded and os.path.exists(txt_path):
+            return name, digest, 'skipped', None
+        convert_pdf(pdf_path, txt_path)
+        return name, digest, 'converted', None
+    except Exception as error:  # one unreadable PDF must not stop the whole directory
+        return name, digest, 'failed', f"{type(error).__name__}: {error}"
+
+
+def _load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file)
+
 
-# Create a PDF reader object
-pdf_reader = PyPDF2.PdfReader(pdf_file)
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + '.tmp', 'w') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
 
-# Get the number of pages in the PDF
-num_pages = len(pdf_reader.pages)
 
-# Initialize an empty string to store the text
-text = ''
+def convert_directory(input_dir, output_dir=None, workers=None):
+    """
+    Converts every PDF of a directory to text across a process pool.
 
-# Loop through each page and extract the text
-for page_num in range(num_pages):
-    page = pdf_reader.pages[page_num]
-    text += page.extract_text()
+    Parameters:
+    -----------
+    input_dir : str
+        The directory containing the PDF files.
+    output_dir : str, optional
+        The directory to write ``<name>.txt`` files to; defaults to ``input_dir``.
+    workers : int, optional
+        The number of worker processes; defaults to the number of CPUs.
 
-# Close the PDF file
-pdf_file.close()
+    Returns:
+    --------
+    dict
+        The lists of ``converted``, ``skipped`` and ``failed`` PDF file names.
+    """
+    output_dir = output_dir or input_dir
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    report = {'converted': [], 'skipped': [], 'failed': []}
 
-# Remove non-alphanumeric characters and convert to lowercase
-cleaned_text = re.sub(r'[^a-zA-Z0-9\s]', '', text).lower()
+    # Hashing happens in the workers, next to the conversion
+    jobs = [
+        (os.path.join(input_dir, name), os.path.join(output_dir, os.path.splitext(name)[0] + '.txt'), manifest.get(name))
+        for name in sorted(os.listdir(input_dir))
+        if name.lower().endswith('.pdf')
+    ]
 
-# Split text into lines and remove empty lines
-lines = [line.strip() for line in cleaned_text.split('\n') if line.strip()]
+    if jobs:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        unsaved = 0
+        try:
+            with multiprocessing.Pool(workers) as pool:
+                for name, digest, status, error in pool.imap_unordered(_convert_job, jobs):
+                    report[status].append(name)
+                    if error:
+                        print(f"Failed to convert {name}: {error}")
+                    if status != 'converted':
+                        continue
+                    manifest[name] = digest
+                    unsaved += 1
+                    # Record progress periodically so an interrupted run can resume
+                    if unsaved >= MANIFEST_SAVE_EVERY:
+                        _save_manifest(output_dir, manifest)
+                        unsaved = 0
+        finally:
+            if unsaved:
+                _save_manifest(output_dir, manifest)
 
-# Join lines back into paragraphs
-paragraphs = []
-current_paragraph = []
-for line in lines:
-    if line:
-        current_paragraph.append(line)
-    else:
-        paragraphs.append(' '.join(current_paragraph))
-        current_paragraph = []
+    return {key: sorted(names) for key, names in report.items()}
 
-# Join remaining lines in the last paragraph
-if current_paragraph:
-    paragraphs.append(' '.join(current_paragraph))
 
-# Write the cleaned text to a text file
-with open('resumes/mradul_text.txt', 'w', encoding='utf-8') as text_file:
-    text_file.write('\n\n'.join(paragraphs))
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Convert a directory of PDF resumes to cleaned text files.")
+    arg_parser.add_argument('input_dir', nargs='?', default='resumes')
+    arg_parser.add_argument('--output-dir', default=None)
+    arg_parser.add_argument('--workers', type=int, default=None)
+    args = arg_parser.parse_args()
 
-print('PDF converted to text file successfully!')
\ No newline at end of file
+    report = convert_directory(args.input_dir, args.output_dir, workers=args.workers)
+    print(f"PDF conversion finished: {len(report['converted'])} converted, "
+          f"{len(report['skipped'])} skipped, {len(report['failed'])} failed.")
@@ -0,0 +1,175 @@
+"""
+Multi-process ingestion of a resume directory.
+
+Cleaning (NLTK tokenization and lemmatization) and section extraction are CPU bound
+and pure Python, so resumes are fanned out to a process pool in chunks. Every worker
+builds its ``ResumeParser`` and ``TextCleaner`` once, and results are streamed back in
+the same order as the input files. With a ``CorpusManifest`` only the resumes that are
+new, edited or affected by a segmenter or cleaner change are processed.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+import registry
+from extractor import ResumeParser
+
+# Per-process resources, created once by _init_worker
+_parser = None
+_cleaner = None
+
+
+def _init_worker(fast_tokenizer=False):
+    """
+    Loads the NLTK resources of the current process through the registry.
+
+    Parameters:
+    -----------
+    fast_tokenizer : bool
+        Whether the cleaner uses the fast regex tokenizer.
+    """
+    global _parser, _cleaner
+    _parser = ResumeParser()
+    _cleaner = registry.get_text_cleaner(fast_tokenizer=fast_tokenizer)
+
+
+def process_resume(resume_path):
+    """
+    Extracts and cleans the sections of one resume using the per-process resources.
+
+    Parameters:
+    -----------
+    resume_path : str
+        The path to the resume file.
+
+    Returns:
+    --------
+    dict
+        The path, the raw experience and skills, and their cleaned text.
+    """
+    _parser.load_resume(resume_path)
+    experience = _parser.extract_experience()
+    skills = _parser.extract_skills()
+    return {
+        'path': resume_path,
+        'experience': experience,
+        'skills': skills,
+        'cleaned_experience': _cleaner.clean_text(experience),
+        'cleaned_skills': _cleaner.clean_text(" ".join(skills)),
+    }
+
+
+def list_resumes(resume_dir):
+    """
+    Lists the ``.txt`` resumes of a directory in a stable (sorted) order.
+
+    Parameters:
+    -----------
+    resume_dir : str
+        The directory containing the resume text files.
+
+    Returns:
+    --------
+    list of str
+        The resume file paths.
+    """
+    return [os.path.join(resume_dir, name) for name in sorted(os.listdir(resume_dir)) if name.endswith('.txt')]
+
+
+def ingest(resume_paths, skills_path, workers=None, chunksize=16, manifest=None, fast_tokenizer=False):
+    """
+    Processes resumes across a pool of worker processes.
+
+    Parameters:
+    -----------
+    resume_paths : list of str
+        The resume files to process.
+    skills_path : str
+        The path to the skills file.
+    workers : int, optional
+        The number of worker processes; defaults to the number of CPUs. With one
+        worker everything runs in the current process.
+    chunksize : int
+        The number of resumes handed to a worker at a time.
+    manifest : CorpusManifest, optional
+        Resumes whose sections and cleaned text it holds for their current content
+        are taken from it; the others are processed and recorded in it. Saving the
+        manifest is left to the caller.
+    fast_tokenizer : bool
+        Whether the cleaner uses the fast regex tokenizer; must agree with the manifest.
+
+    Yields:
+    -------
+    dict
+        One ``process_resume`` result per input path, in input order.
+    """
+    if manifest is None:
+        yield from _process(resume_paths, workers, chunksize, fast_tokenizer)
+        return
+
+    cached = [manifest.ingested(resume_path) for resume_path in resume_paths]
+    stale = [resume_path for resume_path, (_, record) in zip(resume_paths, cached) if record is None]
+    # Lazy: no pool is started when every resume is up to date
+    processed = _process(stale, workers, chunksize, fast_tokenizer)
+    for digest, record in cached:
+        if record is None:
+            record = next(processed)
+            manifest.record_ingested(digest, record)
+        yield record
+
+
+def _process(resume_paths, workers, chunksize, fast_tokenizer):
+    """
+    Yields the ``process_resume`` result of every path, in order, from a pool or in-process.
+    """
+    if not resume_paths:
+        return
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(fast_tokenizer)
+        for resume_path in resume_paths:
+            yield process_resume(resume_path)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(fast_tokenizer,)) as pool:
+        # imap keeps the input order while results stream back as chunks complete
+        yield from pool.imap(process_resume, resume_paths, chunksize=chunksize)
+
+
+def ingest_directory(resume_dir, skills_path, workers=None, chunksize=16):
+    """
+    Processes every ``.txt`` resume of a directory across a pool of worker processes.
+
+    Parameters:
+    -----------
+    resume_dir : str
+        The directory containing the resume text files.
+    skills_path : str
+        The path to the skills file.
+    workers : int, optional
+        The number of worker processes; defaults to the number of CPUs.
+    chunksize : int
+        The number of resumes handed to a worker at a time.
+
+    Yields:
+    -------
+    dict
+        See ``process_resume``.
+    """
+    yield from ingest(list_resumes(resume_dir), skills_path, workers=workers, chunksize=chunksize)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Clean and extract sections from a directory of resumes.")
+    arg_parser.add_argument('resume_dir', nargs='?', default='resumes')
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--workers', type=int, default=None)
+    arg_parser.add_argument('--chunksize', type=int, default=16)
+    args = arg_parser.parse_args()
+
+    # Write one JSON record per resume as soon as it is ready
+    for record in ingest_directory(args.resume_dir, args.skills, workers=args.workers, chunksize=args.chunksize):
+        sys.stdout.write(json.dumps(record) + '\n')
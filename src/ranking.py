@@ -0,0 +1,59 @@
+"""
+Helpers shared by the scoring engines for turning score vectors into ranked results.
+"""
+
+import numpy as np
+
+
+def top_k(scores, k):
+    """
+    Selects the k highest scores from a 1-D score vector.
+
+    Uses ``np.partition`` so only the selected entries are sorted, which keeps
+    the cost linear in the number of candidates. Ties go to the lower index.
+
+    Parameters:
+    -----------
+    scores : array-like
+        One score per candidate.
+    k : int
+        The number of candidates to keep.
+
+    Returns:
+    --------
+    list of (int, float)
+        ``(candidate_index, score)`` pairs ordered from best to worst.
+    """
+    scores = np.asarray(scores).ravel()
+    k = min(int(k), scores.shape[0])
+    if k <= 0:
+        return []
+    if k < scores.shape[0]:
+        # argpartition picks arbitrarily among scores tied with the k-th best, so keep
+        # every tied candidate and let the sort below break ties by index
+        threshold = -np.partition(-scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(scores.shape[0])
+    # Sort the survivors only, best score first and lowest index among ties
+    order = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+    return [(int(index), float(scores[index])) for index in order]
+
+
+def top_k_per_column(score_matrix, k):
+    """
+    Selects the k best rows for every column of a score matrix.
+
+    Parameters:
+    -----------
+    score_matrix : numpy.ndarray
+        A ``(n_candidates, n_queries)`` matrix of scores.
+    k : int
+        The number of candidates to keep per query.
+
+    Returns:
+    --------
+    list of list of (int, float)
+        One ranked list per column.
+    """
+    return [top_k(score_matrix[:, column], k) for column in range(score_matrix.shape[1])]
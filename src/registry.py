@@ -0,0 +1,116 @@
+"""
+Process-wide registry of heavy resources.
+
+spaCy pipelines, NLTK corpora, sentence-transformer models and compiled skill
+matchers are expensive to load. Each getter here imports and loads its resource on
+first use only, and every later call in the same process gets the same object.
+"""
+
+import string
+import threading
+
+# spaCy components that no caller uses; only tok2vec and ner are needed for PERSON entities
+SPACY_DISABLED_COMPONENTS = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+_resources = {}
+_lock = threading.RLock()
+
+
+def _get_or_load(key, loader):
+    """
+    Returns the resource stored under ``key``, calling ``loader`` on first use.
+
+    Parameters:
+    -----------
+    key : tuple
+        The cache key of the resource.
+    loader : callable
+        A zero-argument function that loads the resource.
+
+    Returns:
+    --------
+    object
+        The shared resource.
+    """
+    try:
+        return _resources[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _resources:
+            _resources[key] = loader()
+        return _resources[key]
+
+
+def get_nlp(model_name='en_core_web_sm', disable=SPACY_DISABLED_COMPONENTS):
+    """
+    Returns the spaCy pipeline, loaded without the components listed in ``disable``.
+    """
+    def load():
+        import spacy
+        return spacy.load(model_name, disable=list(disable))
+    return _get_or_load(('nlp', model_name, tuple(disable)), load)
+
+
+def get_stopwords():
+    """
+    Returns the frozen set of English stopwords and punctuation used by TextCleaner.
+    """
+    def load():
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words("english") + list(string.punctuation))
+    return _get_or_load(('stopwords',), load)
+
+
+def get_lemmatizer():
+    """
+    Returns the shared WordNetLemmatizer.
+    """
+    def load():
+        from nltk.stem import WordNetLemmatizer
+        return WordNetLemmatizer()
+    return _get_or_load(('lemmatizer',), load)
+
+
+def get_text_cleaner(fast_tokenizer=False):
+    """
+    Returns a shared TextCleaner instance.
+    """
+    def load():
+        from text_cleaner import TextCleaner
+        return TextCleaner(fast_tokenizer=fast_tokenizer)
+    return _get_or_load(('text_cleaner', fast_tokenizer), load)
+
+
+def get_sentence_model(model_name, backend='fp32'):
+    """
+    Returns the SentenceTransformer model called ``model_name`` for an inference backend.
+
+    ``'fp32'`` is the stock model; ``'int8'`` is its dynamically quantized CPU variant
+    (see inference_backend.py).
+    """
+    def load():
+        if backend == 'fp32':
+            from sentence_transformers import SentenceTransformer  # type: ignore
+            return SentenceTransformer(model_name)
+        import inference_backend
+        return inference_backend.load_model(model_name, backend)
+    return _get_or_load(('sentence_model', model_name, backend), load)
+
+
+def get_skill_matcher(skills_path):
+    """
+    Returns the compiled SkillMatcher for a skills file.
+    """
+    def load():
+        from skill_matcher import SkillMatcher
+        return SkillMatcher.from_file(skills_path)
+    return _get_or_load(('skill_matcher', skills_path), load)
+
+
+def clear():
+    """
+    Drops every loaded resource, e.g. between benchmark runs.
+    """
+    with _lock:
+        _resources.clear()
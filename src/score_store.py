@@ -0,0 +1,367 @@
+"""
+Persistent resume x job description score matrix.
+
+Scores are kept in a memory-mapped file split into square tiles of ``tile_size`` x
+``tile_size`` cells. A small JSON index maps both axes to ids and every (row tile,
+column tile) pair to its slot in the file. New resumes or job descriptions only add
+tiles at the end of the file, so nothing is rewritten when either axis grows, and a
+top-k query for one job description (or one resume) reads one column (or row) of
+tiles instead of the whole matrix. Cells that were never written hold NaN.
+
+Usage:
+    python src/score_store.py .ats_scores --jd job_descriptions/jd_1.txt --top-k 20
+    python src/score_store.py .ats_scores --resume resumes/resume_0.txt --top-k 5
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from ranking import top_k
+
+DTYPES = ('float16', 'float32')
+
+
+class ScoreStore:
+    """
+    A tiled, memory-mapped score matrix with resume ids on the rows and JD ids on the columns.
+
+    Attributes:
+    -----------
+    directory : str
+        The directory holding the store.
+    dtype : numpy.dtype
+        The storage type of the scores, float16 or float32.
+    tile_size : int
+        The number of rows and columns per tile.
+    resume_ids : list of str
+        The row ids, in row order.
+    jd_ids : list of str
+        The column ids, in column order.
+    """
+
+    INDEX_FILE = 'index.json'
+    SCORES_FILE = 'scores.bin'
+
+    def __init__(self, directory, dtype='float16', tile_size=256):
+        """
+        Opens (or prepares) the store under ``directory``.
+
+        Parameters:
+        -----------
+        directory : str
+            The directory of the store.
+        dtype : str
+            ``'float16'`` or ``'float32'``. Ignored when an existing store is reopened.
+        tile_size : int
+            The tile edge length. Ignored when an existing store is reopened.
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype {dtype!r}; expected one of {DTYPES}")
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.tile_size = tile_size
+        self.resume_ids = []
+        self.jd_ids = []
+        self._resume_rows = {}
+        self._jd_columns = {}
+        # Slot of each (row tile, column tile) in the scores file, -1 when not allocated
+        self._grid = np.full((0, 0), -1, dtype=np.int64)
+        self._n_tiles = 0
+        self._capacity = 0
+        self._tiles = None
+
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as file:
+                index = json.load(file)
+            self.dtype = np.dtype(index['dtype'])
+            self.tile_size = index['tile_size']
+            self.resume_ids = index['resume_ids']
+            self.jd_ids = index['jd_ids']
+            self._resume_rows = {id_: row for row, id_ in enumerate(self.resume_ids)}
+            self._jd_columns = {id_: column for column, id_ in enumerate(self.jd_ids)}
+            self._grid = np.array(index['grid'], dtype=np.int64).reshape(index['grid_shape'])
+            self._n_tiles = index['n_tiles']
+            self._capacity = index['capacity']
+            if self._capacity:
+                self._tiles = self._open_tiles('r+')
+
+    @property
+    def shape(self):
+        """
+        The ``(n_resumes, n_jds)`` shape of the matrix.
+        """
+        return len(self.resume_ids), len(self.jd_ids)
+
+    def add_resumes(self, resume_ids):
+        """
+        Appends resume rows; ids already in the store keep their row.
+
+        Parameters:
+        -----------
+        resume_ids : list of str
+            The resume ids.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The row of each id.
+        """
+        return self._add_ids(resume_ids, self.resume_ids, self._resume_rows)
+
+    def add_jds(self, jd_ids):
+        """
+        Appends job description columns; ids already in the store keep their column.
+
+        Parameters:
+        -----------
+        jd_ids : list of str
+            The job description ids.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The column of each id.
+        """
+        return self._add_ids(jd_ids, self.jd_ids, self._jd_columns)
+
+    def write(self, resume_ids, jd_ids, scores):
+        """
+        Stores a block of scores and persists the index.
+
+        Unknown ids are appended as new rows or columns first.
+
+        Parameters:
+        -----------
+        resume_ids : list of str
+            The row ids of the block.
+        jd_ids : list of str
+            The column ids of the block.
+        scores : array-like
+            A ``(len(resume_ids), len(jd_ids))`` score matrix.
+        """
+        scores = np.asarray(scores, dtype=np.float32)
+        rows, columns = self.add_resumes(resume_ids), self.add_jds(jd_ids)
+        if scores.shape != (rows.size, columns.size):
+            raise ValueError(f"Expected scores of shape {(rows.size, columns.size)}, got {scores.shape}")
+        self._grow_grid()
+
+        size = self.tile_size
+        row_tiles, column_tiles = rows // size, columns // size
+        for row_tile in np.unique(row_tiles):
+            row_mask = row_tiles == row_tile
+            for column_tile in np.unique(column_tiles):
+                column_mask = column_tiles == column_tile
+                tile = self._tile(row_tile, column_tile, create=True)
+                tile[np.ix_(rows[row_mask] % size, columns[column_mask] % size)] = scores[np.ix_(row_mask, column_mask)]
+        self.save()
+
+    def get(self, resume_id, jd_id):
+        """
+        Returns one stored score, or NaN if it was never written.
+        """
+        row, column = self._resume_rows[resume_id], self._jd_columns[jd_id]
+        tile = self._tile(row // self.tile_size, column // self.tile_size)
+        return float('nan') if tile is None else float(tile[row % self.tile_size, column % self.tile_size])
+
+    def jd_scores(self, jd_id):
+        """
+        Reads the scores of every resume for one job description.
+
+        Parameters:
+        -----------
+        jd_id : str
+            The job description id.
+
+        Returns:
+        --------
+        numpy.ndarray
+            One float32 score per resume; NaN where no score was written.
+        """
+        column = self._jd_columns[jd_id]
+        return self._read_line(len(self.resume_ids), lambda row_tile: (row_tile, column // self.tile_size),
+                               lambda tile: tile[:, column % self.tile_size])
+
+    def resume_scores(self, resume_id):
+        """
+        Reads the scores of one resume for every job description.
+
+        Parameters:
+        -----------
+        resume_id : str
+            The resume id.
+
+        Returns:
+        --------
+        numpy.ndarray
+            One float32 score per job description; NaN where no score was written.
+        """
+        row = self._resume_rows[resume_id]
+        return self._read_line(len(self.jd_ids), lambda column_tile: (row // self.tile_size, column_tile),
+                               lambda tile: tile[row % self.tile_size, :])
+
+    def top_resumes(self, jd_id, k=10):
+        """
+        Returns the k best-scoring resumes for a job description.
+
+        Parameters:
+        -----------
+        jd_id : str
+            The job description id.
+        k : int
+            The number of results.
+
+        Returns:
+        --------
+        list of (str, float)
+            ``(resume_id, score)`` pairs ordered from best to worst.
+        """
+        return self._top(self.jd_scores(jd_id), self.resume_ids, k)
+
+    def top_jds(self, resume_id, k=10):
+        """
+        Returns the k job descriptions a resume scores best against.
+
+        Parameters:
+        -----------
+        resume_id : str
+            The resume id.
+        k : int
+            The number of results.
+
+        Returns:
+        --------
+        list of (str, float)
+            ``(jd_id, score)`` pairs ordered from best to worst.
+        """
+        return self._top(self.resume_scores(resume_id), self.jd_ids, k)
+
+    def save(self):
+        """
+        Flushes the scores and writes the index to disk.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if self._tiles is not None:
+            self._tiles.flush()
+        index = {
+            'dtype': self.dtype.name,
+            'tile_size': self.tile_size,
+            'resume_ids': self.resume_ids,
+            'jd_ids': self.jd_ids,
+            'grid_shape': list(self._grid.shape),
+            'grid': self._grid.ravel().tolist(),
+            'n_tiles': self._n_tiles,
+            'capacity': self._capacity,
+        }
+        # Write to a temporary file first so an interrupted run never corrupts the index
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        with open(index_path + '.tmp', 'w') as file:
+            json.dump(index, file)
+        os.replace(index_path + '.tmp', index_path)
+
+    @staticmethod
+    def _add_ids(ids, table, positions):
+        result = []
+        for id_ in ids:
+            if id_ not in positions:
+                positions[id_] = len(table)
+                table.append(id_)
+            result.append(positions[id_])
+        return np.asarray(result, dtype=np.int64)
+
+    @staticmethod
+    def _top(scores, ids, k):
+        written = np.flatnonzero(~np.isnan(scores))
+        return [(ids[written[index]], score) for index, score in top_k(scores[written], k)]
+
+    def _read_line(self, length, tile_of, cut):
+        """
+        Gathers one row or column of the matrix tile by tile.
+
+        Parameters:
+        -----------
+        length : int
+            The length of the line.
+        tile_of : callable
+            Maps the tile position along the line to its ``(row_tile, column_tile)``.
+        cut : callable
+            Extracts the line's cells from one tile.
+        """
+        values = np.full(length, np.nan, dtype=np.float32)
+        for position in range(-(-length // self.tile_size)):
+            tile = self._tile(*tile_of(position))
+            if tile is None:
+                continue
+            start = position * self.tile_size
+            end = min(start + self.tile_size, length)
+            values[start:end] = cut(tile)[:end - start]
+        return values
+
+    def _grow_grid(self):
+        """
+        Extends the tile grid to cover every row and column id.
+        """
+        needed = tuple(-(-count // self.tile_size) for count in self.shape)
+        if needed[0] > self._grid.shape[0] or needed[1] > self._grid.shape[1]:
+            grid = np.full((max(needed[0], self._grid.shape[0]), max(needed[1], self._grid.shape[1])), -1, dtype=np.int64)
+            grid[:self._grid.shape[0], :self._grid.shape[1]] = self._grid
+            self._grid = grid
+
+    def _tile(self, row_tile, column_tile, create=False):
+        """
+        Returns the memory-mapped tile at a grid position, allocating it if asked.
+
+        Returns:
+        --------
+        numpy.memmap or None
+            A ``(tile_size, tile_size)`` view, or ``None`` if the tile is not allocated.
+        """
+        if row_tile >= self._grid.shape[0] or column_tile >= self._grid.shape[1]:
+            return None
+        slot = self._grid[row_tile, column_tile]
+        if slot < 0:
+            if not create:
+                return None
+            if self._n_tiles == self._capacity:
+                self._reserve(max(16, 2 * self._capacity))
+            slot = self._n_tiles
+            self._n_tiles += 1
+            self._grid[row_tile, column_tile] = slot
+            self._tiles[slot] = np.nan
+        return self._tiles[slot]
+
+    def _reserve(self, capacity):
+        """
+        Grows the scores file to hold ``capacity`` tiles, doubling to amortise the cost.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self.SCORES_FILE)
+        if self._tiles is not None:
+            self._tiles.flush()
+            self._tiles = None
+        with open(path, 'ab') as file:
+            file.truncate(capacity * self.tile_size * self.tile_size * self.dtype.itemsize)
+        self._capacity = capacity
+        self._tiles = self._open_tiles('r+')
+
+    def _open_tiles(self, mode):
+        path = os.path.join(self.directory, self.SCORES_FILE)
+        return np.memmap(path, dtype=self.dtype, mode=mode, shape=(self._capacity, self.tile_size, self.tile_size))
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Query a persisted score matrix.")
+    arg_parser.add_argument('directory')
+    group = arg_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--jd', help="list the best resumes for this job description id")
+    group.add_argument('--resume', help="list the best job descriptions for this resume id")
+    arg_parser.add_argument('--top-k', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    store = ScoreStore(args.directory)
+    hits = store.top_resumes(args.jd, args.top_k) if args.jd else store.top_jds(args.resume, args.top_k)
+    for id_, score in hits:
+        print(f"{score:.4f}\t{id_}")
@@ -0,0 +1,107 @@
+"""
+Single-pass resume section segmentation.
+"""
+
+import re
+from collections import namedtuple
+
+# A recognised section: canonical name, offset of the header, offset where the body
+# starts (after the header and optional colon) and offset where the body ends
+Section = namedtuple('Section', ['name', 'start', 'body_start', 'end'])
+
+
+class SectionSegmenter:
+    """
+    Finds every recognised section header of a resume in one regex scan.
+
+    A header is a known section name at the start of a line, followed by a colon or
+    the end of the line. Names are tried longest first so "Work Experience" is not
+    reported as "Experience".
+
+    Attributes:
+    -----------
+    section_names : list of str
+        The canonical section names.
+    pattern : re.Pattern
+        The compiled header pattern, built once per segmenter.
+    """
+
+    # Bump when the segmentation rules change so cached sections are recomputed
+    VERSION = 2
+
+    def __init__(self, section_names):
+        """
+        Compiles the header pattern for a list of section names.
+
+        Parameters:
+        -----------
+        section_names : list of str
+            The canonical section names.
+        """
+        self.section_names = list(section_names)
+        self._canonical = {name.lower(): name for name in self.section_names}
+        alternation = '|'.join(re.escape(name) for name in sorted(self.section_names, key=len, reverse=True))
+        self.pattern = re.compile(
+            r'^[ \t]*(?P<name>{})[ \t]*(?::|(?=\r?$))[ \t]*'.format(alternation),
+            re.IGNORECASE | re.MULTILINE,
+        )
+
+    def segment(self, text):
+        """
+        Splits a resume into its recognised sections.
+
+        Parameters:
+        -----------
+        text : str
+            The resume content.
+
+        Returns:
+        --------
+        list of Section
+            The sections in document order; each body runs up to the next header.
+        """
+        headers = list(self.pattern.finditer(text))
+        sections = []
+        for position, header in enumerate(headers):
+            end = headers[position + 1].start() if position + 1 < len(headers) else len(text)
+            name = self._canonical[header.group('name').lower()]
+            sections.append(Section(name, header.start(), header.end(), end))
+        return sections
+
+    @staticmethod
+    def find(sections, suffix):
+        """
+        Returns the first section whose canonical name ends with ``suffix``.
+
+        Parameters:
+        -----------
+        sections : list of Section
+            The result of ``segment``.
+        suffix : str
+            For example "Experience" or "Skills".
+
+        Returns:
+        --------
+        Section or None
+            The first matching section, if any.
+        """
+        for section in sections:
+            if section.name.endswith(suffix):
+                return section
+        return None
+
+
+# The resume section names recognised by every parser
+RESUME_SECTIONS = [
+    "Contact Information", "Objective", "Summary", "Education", "Experience",
+    "Skills", "Projects", "Certifications", "Licenses", "Awards", "Honors",
+    "Publications", "References", "Technical Skills", "Computer Skills",
+    "Programming Languages", "Software Skills", "Soft Skills", "Language Skills",
+    "Professional Skills", "Transferable Skills", "Work Experience",
+    "Professional Experience", "Employment History", "Internship Experience",
+    "Volunteer Experience", "Leadership Experience", "Research Experience",
+    "Teaching Experience",
+]
+
+# Compiled once per process and shared by ResumeParser and Document
+RESUME_SEGMENTER = SectionSegmenter(RESUME_SECTIONS)
@@ -0,0 +1,341 @@
+"""
+Long-running local scoring service with request micro-batching.
+
+The service keeps the embedding model (and optionally a fitted TF-IDF corpus model)
+warm. Concurrent "score this resume against this role" requests are queued and
+collected into micro-batches of at most ``max_batch`` requests, waiting at most
+``max_wait_ms`` after the first one, and each batch is scored with one batched encode.
+Only the standard library is used for HTTP.
+
+Endpoints:
+    POST /score    {"resume": "...", "jd": "...", "engine": "transformer" | "tfidf"}
+                   -> {"score": 0.73}
+    GET  /metrics  request count, p50/p99 latency and batch-size statistics
+    GET  /health   {"status": "ok"}
+
+Usage:
+    python src/service.py --port 8080 --max-batch 32 --max-wait-ms 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import registry
+from document import Document
+
+# Number of most recent requests/batches the metrics are computed over
+METRICS_WINDOW = 10_000
+
+
+class MicroBatcher:
+    """
+    Collects queued items into batches and processes each batch in a worker thread.
+
+    Attributes:
+    -----------
+    process_batch : callable
+        Called with a list of items; must return one result per item.
+    max_batch : int
+        The maximum number of items per batch.
+    max_wait : float
+        The maximum time, in seconds, a batch waits for more items after its first one.
+    batch_sizes : collections.deque
+        The sizes of the most recent batches.
+    executor : concurrent.futures.Executor, optional
+        Where ``process_batch`` runs; defaults to the event loop's thread pool.
+    """
+
+    def __init__(self, process_batch, max_batch=32, max_wait_ms=10, executor=None):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self.batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        """
+        Starts the batching loop on the running event loop.
+        """
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item):
+        """
+        Queues an item and waits for its result.
+
+        Parameters:
+        -----------
+        item : object
+            The item to process.
+
+        Returns:
+        --------
+        object
+            The result ``process_batch`` produced for the item.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batch_sizes.append(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                # The model call blocks, so it runs off the event loop
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class ScoringService:
+    """
+    Warm scoring state plus one micro-batcher per engine.
+
+    Attributes:
+    -----------
+    transformer : ATSTransformer
+        The embedding engine, whose model stays loaded.
+    tfidf_corpus : TfidfCorpus or None
+        A fitted corpus model whose vocabulary and IDF weights score TF-IDF requests.
+    latencies : collections.deque
+        End-to-end seconds of the most recent requests.
+    """
+
+    ENGINES = ('transformer', 'tfidf')
+
+    def __init__(self, max_batch=32, max_wait_ms=10, tfidf_model_dir=None, backend='fp32', cache_dir=None):
+        from ats_transformer import ATSTransformer
+
+        self.cleaner = registry.get_text_cleaner()
+        self.transformer = ATSTransformer(cache_dir=cache_dir, backend=backend)
+        self.tfidf_corpus = None
+        if tfidf_model_dir:
+            from ats_tfidf import TfidfCorpus
+            self.tfidf_corpus = TfidfCorpus.load(tfidf_model_dir)
+        # One worker thread: batches share the cleaner caches, and torch already uses every core
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batchers = {
+            'transformer': MicroBatcher(self.score_transformer_batch, max_batch, max_wait_ms, self.executor),
+            'tfidf': MicroBatcher(self.score_tfidf_batch, max_batch, max_wait_ms, self.executor),
+        }
+        self.latencies = deque(maxlen=METRICS_WINDOW)
+        self.requests = 0
+        self.errors = 0
+
+    def warm_up(self):
+        """
+        Loads the model and runs one encode so the first request is not slow.
+        """
+        self.transformer.encode(["warm up"])
+
+    def clean_resume(self, resume):
+        """
+        Cleans the experience and skills sections of a resume, or the whole text if it has neither.
+        """
+        return Document(resume).scored_resume
+
+    def score_transformer_batch(self, pairs):
+        """
+        Scores (resume, jd) pairs with one batched encode.
+        """
+        resumes = [self.clean_resume(resume) for resume, _ in pairs]
+        jds = self.cleaner.clean_many([jd for _, jd in pairs])
+        embeddings = self.transformer.encode(resumes + jds)
+        resume_embeddings, jd_embeddings = embeddings[:len(pairs)], embeddings[len(pairs):]
+        return np.einsum('ij,ij->i', resume_embeddings, jd_embeddings).tolist()
+
+    def score_tfidf_batch(self, pairs):
+        """
+        Scores (resume, jd) pairs by TF-IDF cosine similarity.
+
+        With a fitted corpus model every pair shares its vocabulary and IDF weights and
+        the batch is vectorised in one call; otherwise each pair is fitted on its own,
+        as ``ats_tfidf.ATS.compute_similarity`` does.
+        """
+        resumes = [self.clean_resume(resume) for resume, _ in pairs]
+        jds = self.cleaner.clean_many([jd for _, jd in pairs])
+        if self.tfidf_corpus is not None:
+            vectorizer = self.tfidf_corpus.vectorizer
+            resume_vectors, jd_vectors = vectorizer.transform(resumes), vectorizer.transform(jds)
+            return np.asarray(resume_vectors.multiply(jd_vectors).sum(axis=1)).ravel().tolist()
+
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        scores = []
+        for resume, jd in zip(resumes, jds):
+            try:
+                matrix = TfidfVectorizer().fit_transform([resume, jd])
+            except ValueError:  # both documents are empty after cleaning
+                scores.append(0.0)
+                continue
+            scores.append(float(matrix[0].multiply(matrix[1]).sum()))
+        return scores
+
+    async def score(self, resume, jd, engine='transformer'):
+        """
+        Scores one resume against one job description through the engine's micro-batcher.
+        """
+        start = time.perf_counter()
+        score = await self.batchers[engine].submit((resume, jd))
+        self.latencies.append(time.perf_counter() - start)
+        return score
+
+    def metrics(self):
+        """
+        Returns request counts, p50/p99 latency in milliseconds and batch-size statistics.
+        """
+        latencies = np.array(self.latencies) * 1000
+        report = {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)) if latencies.size else None,
+                'p99': float(np.percentile(latencies, 99)) if latencies.size else None,
+            },
+            'batches': {},
+        }
+        for engine, batcher in self.batchers.items():
+            sizes = np.array(batcher.batch_sizes)
+            report['batches'][engine] = {
+                'count': int(sizes.size),
+                'mean_size': float(sizes.mean()) if sizes.size else None,
+                'max_size': int(sizes.max()) if sizes.size else None,
+            }
+        return report
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves HTTP/1.1 requests on one connection until the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self.route(method, path, body)
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        """
+        Dispatches one request and returns ``(status_line, json_payload)``.
+        """
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return '200 OK', self.metrics()
+        if method != 'POST' or path != '/score':
+            return '404 Not Found', {'error': f"no route for {method} {path}"}
+
+        self.requests += 1
+        try:
+            request = json.loads(body or b'{}')
+            # Reject malformed requests here: once queued, a bad item would fail its whole batch
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            engine = request.get('engine', 'transformer')
+            if engine not in self.ENGINES:
+                raise ValueError(f"engine must be one of {self.ENGINES}")
+            for name in ('resume', 'jd'):
+                if not isinstance(request.get(name), str):
+                    raise ValueError(f"{name!r} must be a string")
+            resume, jd = request['resume'], request['jd']
+        except ValueError as error:
+            self.errors += 1
+            return '400 Bad Request', {'error': str(error)}
+        try:
+            return '200 OK', {'score': await self.score(resume, jd, engine)}
+        except Exception as error:
+            self.errors += 1
+            return '500 Internal Server Error', {'error': f"{type(error).__name__}: {error}"}
+
+
+async def serve(host, port, **service_options):
+    """
+    Starts the scoring service and runs until cancelled.
+
+    Parameters:
+    -----------
+    host : str
+        The interface to bind.
+    port : int
+        The TCP port.
+    **service_options
+        Keyword arguments of ``ScoringService``.
+    """
+    service = ScoringService(**service_options)
+    await asyncio.get_running_loop().run_in_executor(service.executor, service.warm_up)
+    for batcher in service.batchers.values():
+        batcher.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Scoring service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run the micro-batching scoring service.")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8080)
+    arg_parser.add_argument('--max-batch', type=int, default=32)
+    arg_parser.add_argument('--max-wait-ms', type=float, default=10)
+    arg_parser.add_argument('--tfidf-model', default=None, help="directory of a saved TfidfCorpus")
+    arg_parser.add_argument('--backend', default='fp32', choices=['fp32', 'int8'])
+    arg_parser.add_argument('--cache-dir', default=None)
+    args = arg_parser.parse_args()
+
+    asyncio.run(serve(
+        args.host,
+        args.port,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        tfidf_model_dir=args.tfidf_model,
+        backend=args.backend,
+        cache_dir=args.cache_dir,
+    ))
@@ -0,0 +1,291 @@
+"""
+Compiled skill dictionary with a token-level Aho-Corasick matcher.
+
+``meta/skills.txt`` holds quoted, comma-separated skill names. Each name is expanded
+into normalised aliases ("Amazon Web Services (AWS)" -> "amazon web services", "aws")
+and all aliases are compiled into one automaton, so every dictionary skill occurring
+in a document is found in a single pass that is linear in the document length,
+however many skills the dictionary holds.
+"""
+
+import re
+from collections import deque
+
+# Tokens are lower-cased words that may carry "+"/"#" suffixes (c++, c#) or inner dots
+# (node.js, asp.net). Separators such as commas, semicolons, brackets and sentence
+# ends are returned as breaks so that matches never span two list items or sentences.
+TOKEN_PATTERN = re.compile(r"([A-Za-z0-9]+(?:[+#]+|(?:\.[A-Za-z0-9]+)+)?)|([,;:()\[\]|!?\n•]|\.(?=\s|$))")
+
+# Aliases this short are only matched with their exact dictionary casing ("R", "Go")
+CASE_SENSITIVE_MAX_LENGTH = 2
+
+# Common spellings that cannot be derived from the dictionary entry itself
+EXTRA_ALIASES = {
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Go": ["golang"],
+    "JavaScript": ["js"],
+    "Node.js": ["nodejs"],
+    "Vue.js": ["vuejs"],
+    "PostgreSQL": ["postgres"],
+    "Microsoft SQL Server": ["sql server", "mssql"],
+    "Microsoft Azure": ["azure"],
+    "Google Cloud Platform (GCP)": ["google cloud"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "Power BI": ["powerbi"],
+    "macOS": ["mac os", "osx"],
+}
+
+
+def parse_skills_file(skills_path):
+    """
+    Parses a skills file of quoted, comma-separated names.
+
+    Lines without quotes are split on commas instead. Duplicates are dropped while
+    keeping the first-seen order.
+
+    Parameters:
+    -----------
+    skills_path : str
+        The path to the skills file.
+
+    Returns:
+    --------
+    list of str
+        The skill names.
+    """
+    with open(skills_path, 'r') as file:
+        content = file.read()
+
+    names = []
+    for line in content.splitlines():
+        quoted = re.findall(r'"([^"]+)"', line)
+        names.extend(quoted if quoted else line.split(','))
+    return list(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+
+def skill_aliases(name):
+    """
+    Returns the surface forms under which a skill is recognised.
+
+    "Amazon Web Services (AWS)" yields the base name and the acronym;
+    "Scripting (Bash, PowerShell)" yields the base name and each listed tool.
+
+    Parameters:
+    -----------
+    name : str
+        The canonical skill name.
+
+    Returns:
+    --------
+    list of str
+        The aliases, the canonical form first.
+    """
+    aliases = [name]
+    match = re.fullmatch(r'\s*(.+?)\s*\((.+)\)\s*', name)
+    if match:
+        aliases = [match.group(1)] + [part.strip() for part in match.group(2).split(',') if part.strip()]
+    return aliases + EXTRA_ALIASES.get(name, [])
+
+
+def tokenize(text):
+    """
+    Splits text into normalised tokens for matching.
+
+    Parameters:
+    -----------
+    text : str
+        The text to tokenize.
+
+    Returns:
+    --------
+    list of (str or None, str, int, int)
+        ``(normalised_token, original_token, start, end)``; breaks have a ``None`` token.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group(1)
+        tokens.append((word.lower() if word else None, match.group(0), match.start(), match.end()))
+    return tokens
+
+
+class SkillMatcher:
+    """
+    An Aho-Corasick automaton over token sequences of skill aliases.
+
+    Attributes:
+    -----------
+    skills : list of str
+        The canonical skill names, in dictionary order.
+    """
+
+    # Bump whenever a change to tokenization or matching changes which skills are found,
+    # so cached matches (see manifest.py) are recomputed
+    VERSION = 1
+
+    def __init__(self, skills):
+        """
+        Compiles the automaton for a list of canonical skill names.
+
+        Parameters:
+        -----------
+        skills : list of str
+            The canonical skill names.
+        """
+        self.skills = list(dict.fromkeys(skills))
+        # Trie nodes: outgoing transitions, failure link, and the matches ending at the node
+        self._goto = [{}]
+        self._fail = [0]
+        # Each output is (skill_index, n_tokens, original-case tokens or None)
+        self._output = [[]]
+        # Normalised alias tokens -> the outputs of the aliases spelled that way
+        self._aliases = {}
+
+        for skill_index, skill in enumerate(self.skills):
+            for alias in skill_aliases(skill):
+                alias_tokens = [token for token in tokenize(alias) if token[0] is not None]
+                if alias_tokens:
+                    self._insert(skill_index, alias_tokens)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, skills_path):
+        """
+        Compiles a matcher from a skills file.
+
+        Parameters:
+        -----------
+        skills_path : str
+            The path to the skills file.
+
+        Returns:
+        --------
+        SkillMatcher
+            The compiled matcher.
+        """
+        return cls(parse_skills_file(skills_path))
+
+    def _insert(self, skill_index, alias_tokens):
+        node = 0
+        for token, _, _, _ in alias_tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+
+        originals = tuple(original for _, original, _, _ in alias_tokens)
+        case_sensitive = sum(len(original) for original in originals) <= CASE_SENSITIVE_MAX_LENGTH
+        output = (skill_index, len(alias_tokens), originals if case_sensitive else None)
+        if output not in self._output[node]:
+            self._output[node].append(output)
+        aliases = self._aliases.setdefault(tuple(token for token, _, _, _ in alias_tokens), [])
+        if output not in aliases:
+            aliases.append(output)
+
+    def _build_failure_links(self):
+        # Breadth-first so every failure target is finished before its dependants
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the matches of the longest proper suffix
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def lookup(self, alias):
+        """
+        Returns the skills of which a text is a whole alias, with the matching rules of ``find_all``.
+
+        Unlike ``find_all``, a multi-word alias ("sql server") does not also yield the
+        skills of its parts ("SQL").
+
+        Parameters:
+        -----------
+        alias : str
+            The text to look up, e.g. "postgres" or "sql server".
+
+        Returns:
+        --------
+        set of str
+            The canonical names of the matching skills; empty if the text is not an alias.
+        """
+        tokens = tokenize(alias)
+        if any(token is None for token, _, _, _ in tokens):
+            return set()
+        originals = tuple(original for _, original, _, _ in tokens)
+        outputs = self._aliases.get(tuple(token for token, _, _, _ in tokens), [])
+        return {self.skills[skill_index] for skill_index, _, expected in outputs if expected in (None, originals)}
+
+    def find_all(self, text):
+        """
+        Finds every occurrence of a dictionary skill in a document.
+
+        Parameters:
+        -----------
+        text : str
+            The document to scan.
+
+        Returns:
+        --------
+        list of (str, int, int)
+            ``(canonical_skill, start, end)`` character spans, in order of their end.
+        """
+        tokens = tokenize(text)
+        matches = []
+        node = 0
+        for position, (token, _, _, end) in enumerate(tokens):
+            if token is None:
+                node = 0
+                continue
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for skill_index, length, originals in self._output[node]:
+                first = position - length + 1
+                if originals is not None and tuple(original for _, original, _, _ in tokens[first:position + 1]) != originals:
+                    continue
+                matches.append((self.skills[skill_index], tokens[first][2], end))
+        return matches
+
+    def find(self, text):
+        """
+        Returns the set of dictionary skills mentioned in a document.
+
+        Parameters:
+        -----------
+        text : str
+            The document to scan.
+
+        Returns:
+        --------
+        set of str
+            The canonical names of the skills found.
+        """
+        return {skill for skill, _, _ in self.find_all(text)}
+
+    def find_document(self, document, skills_only=False):
+        """
+        Returns the set of dictionary skills mentioned in a Document, matched once per document.
+
+        Parameters:
+        -----------
+        document : Document
+            The parsed document.
+        skills_only : bool
+            Scan the items of the skills section instead of the whole text.
+
+        Returns:
+        --------
+        set of str
+            The canonical names of the skills found.
+        """
+        return document.matched_skills(self, skills_only)
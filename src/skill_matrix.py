@@ -0,0 +1,276 @@
+"""
+Vectorized skill overlap between every resume and every job description.
+
+Each document is encoded once as a sparse binary row over the skill dictionary
+(``SkillMatcher.skills``). One sparse matrix product of the resume rows with the
+job description rows, plus their must-have rows, then gives the number of shared
+skills of every pair. Jaccard similarity, coverage of the JD's skills and coverage
+of its must-have skills follow from that product and the row sums, with no Python
+set operations per pair.
+
+Must-have filters are evaluated on bitsets: every resume's skills are packed into
+64-bit words, and a resume qualifies for a JD when ``resume & required ==
+required`` in every word. This rejects candidates before any expensive scoring.
+
+Usage:
+    python src/skill_matrix.py --resumes 10000 --jds 100 --must-have 2
+"""
+
+import argparse
+import json
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import registry
+
+SkillOverlap = namedtuple('SkillOverlap', ['overlap', 'jaccard', 'coverage', 'must_have_coverage'])
+
+
+class SkillMatrix:
+    """
+    Encodes documents as sparse binary skill-incidence rows and compares them in bulk.
+
+    Attributes:
+    -----------
+    matcher : SkillMatcher
+        The compiled skill dictionary.
+    skills : list of str
+        The canonical skill names; column ``i`` of every incidence matrix is ``skills[i]``.
+    columns : dict of str to int
+        The column of each canonical skill name.
+    n_words : int
+        The number of 64-bit words in a bitset.
+    """
+
+    def __init__(self, matcher):
+        """
+        Prepares the encoder for a skill dictionary.
+
+        Parameters:
+        -----------
+        matcher : SkillMatcher
+            The compiled skill dictionary.
+        """
+        self.matcher = matcher
+        self.skills = matcher.skills
+        self.columns = {skill: column for column, skill in enumerate(self.skills)}
+        self._lowercase_names = {skill.lower(): skill for skill in self.skills}
+        self.n_words = max(1, -(-len(self.skills) // 64))
+
+    @classmethod
+    def from_file(cls, skills_path):
+        """
+        Prepares the encoder for the shared matcher of a skills file.
+        """
+        return cls(registry.get_skill_matcher(skills_path))
+
+    def encode_sets(self, skill_sets):
+        """
+        Builds the incidence matrix of sets of canonical skill names.
+
+        Parameters:
+        -----------
+        skill_sets : list of set of str
+            The skills of each document.
+
+        Returns:
+        --------
+        scipy.sparse.csr_matrix
+            A ``(len(skill_sets), len(skills))`` float32 matrix of ones and zeros.
+        """
+        import scipy.sparse
+
+        indptr = np.zeros(len(skill_sets) + 1, dtype=np.int64)
+        np.cumsum([len(skills) for skills in skill_sets], out=indptr[1:])
+        indices = np.fromiter((self.columns[skill] for skills in skill_sets for skill in skills),
+                              dtype=np.int32, count=indptr[-1])
+        incidence = scipy.sparse.csr_matrix((np.ones(indices.size, dtype=np.float32), indices, indptr),
+                                            shape=(len(skill_sets), len(self.skills)))
+        incidence.sort_indices()
+        return incidence
+
+    def encode(self, texts):
+        """
+        Builds the incidence matrix of the dictionary skills mentioned in each raw text.
+
+        Pass raw text, not cleaned text: the matcher relies on casing ("Go", "R") and
+        on "#"/"+" ("C#", "C++"), which cleaning removes.
+        """
+        return self.encode_sets([self.matcher.find(text) for text in texts])
+
+    def encode_documents(self, documents, skills_only=False):
+        """
+        Builds the incidence matrix of Documents, reusing the skills already matched on them.
+
+        Parameters:
+        -----------
+        documents : list of Document
+            The parsed documents.
+        skills_only : bool
+            Use the items of the skills section instead of the whole text.
+        """
+        return self.encode_sets([self.matcher.find_document(document, skills_only) for document in documents])
+
+    def resolve(self, names):
+        """
+        Maps skill names or aliases ("aws", "postgres") to canonical dictionary skills.
+
+        Each name must be a canonical name (in any case) or an alias the matcher recognises,
+        such as those of ``skill_matcher.EXTRA_ALIASES``.
+
+        Raises:
+        -------
+        ValueError
+            If a name is not a dictionary skill, or is an alias of several. An unknown
+            must-have would otherwise be silently ignored, and a phrase such as "senior
+            python developer with aws" would silently become several must-haves.
+        """
+        skills = set()
+        for name in names:
+            stripped = name.strip()
+            skill = self._lowercase_names.get(stripped.lower())
+            if skill is None:
+                candidates = self.matcher.lookup(stripped)
+                if len(candidates) > 1:
+                    raise ValueError(f"Ambiguous skill {name!r}; it is an alias of {sorted(candidates)}")
+                if not candidates:
+                    raise ValueError(f"Unknown skill {name!r}; expected one name or alias from the skills dictionary")
+                skill = candidates.pop()
+            skills.add(skill)
+        return skills
+
+    def encode_must_have(self, must_have):
+        """
+        Builds the incidence matrix of must-have skill lists, one list per job description.
+        """
+        return self.encode_sets([self.resolve(names) for names in must_have])
+
+    def bitsets(self, incidence):
+        """
+        Packs incidence rows into bitsets.
+
+        Parameters:
+        -----------
+        incidence : scipy.sparse.csr_matrix
+            An incidence matrix from ``encode_sets``.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(n_rows, n_words)`` uint64 matrix; bit ``c % 64`` of word ``c // 64`` is column ``c``.
+        """
+        rows = np.repeat(np.arange(incidence.shape[0]), np.diff(incidence.indptr))
+        columns = incidence.indices.astype(np.uint64)
+        bits = np.zeros((incidence.shape[0], self.n_words), dtype=np.uint64)
+        np.bitwise_or.at(bits, (rows, (columns // np.uint64(64)).astype(np.int64)),
+                         np.left_shift(np.uint64(1), columns % np.uint64(64)))
+        return bits
+
+    def eligible(self, resume_bits, must_have_bits):
+        """
+        Tests which resumes hold every must-have skill of each job description.
+
+        Parameters:
+        -----------
+        resume_bits : numpy.ndarray
+            The resume bitsets, from ``bitsets``.
+        must_have_bits : numpy.ndarray
+            The must-have bitsets, one row per job description.
+
+        Returns:
+        --------
+        numpy.ndarray
+            A ``(n_resumes, n_jds)`` boolean mask; a JD without must-haves accepts every resume.
+        """
+        mask = np.empty((resume_bits.shape[0], must_have_bits.shape[0]), dtype=bool)
+        for column, required in enumerate(must_have_bits):
+            mask[:, column] = np.all((resume_bits & required) == required, axis=1)
+        return mask
+
+    def scores(self, resume_incidence, jd_incidence, must_have_incidence=None):
+        """
+        Computes the skill overlap measures of every resume/job description pair.
+
+        Parameters:
+        -----------
+        resume_incidence : scipy.sparse.csr_matrix
+            The resume incidence rows.
+        jd_incidence : scipy.sparse.csr_matrix
+            The job description incidence rows.
+        must_have_incidence : scipy.sparse.csr_matrix, optional
+            The must-have incidence rows, one per job description.
+
+        Returns:
+        --------
+        SkillOverlap
+            ``(n_resumes, n_jds)`` matrices: ``overlap`` (shared skills), ``jaccard``,
+            ``coverage`` (share of the JD's skills the resume has, 0 for a JD without
+            skills) and ``must_have_coverage`` (share of the must-haves the resume has,
+            1 for a JD without must-haves; ``None`` when no must-haves are given).
+        """
+        import scipy.sparse
+
+        n_jds = jd_incidence.shape[0]
+        targets = jd_incidence if must_have_incidence is None else scipy.sparse.vstack([jd_incidence, must_have_incidence])
+        # The single sparse product; its first n_jds columns are the overlaps, the rest the must-have hits
+        product = (resume_incidence @ targets.T.tocsc()).toarray()
+        overlap = product[:, :n_jds]
+
+        resume_counts = np.asarray(resume_incidence.sum(axis=1), dtype=np.float32)
+        jd_counts = np.asarray(jd_incidence.sum(axis=1), dtype=np.float32).ravel()
+        union = resume_counts + jd_counts - overlap
+        jaccard = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+        coverage = np.divide(overlap, jd_counts, out=np.zeros_like(overlap), where=jd_counts > 0)
+
+        must_have_coverage = None
+        if must_have_incidence is not None:
+            required_counts = np.asarray(must_have_incidence.sum(axis=1), dtype=np.float32).ravel()
+            must_have_coverage = np.divide(product[:, n_jds:], required_counts, out=np.ones_like(overlap),
+                                           where=required_counts > 0)
+        return SkillOverlap(overlap.astype(np.int32), jaccard, coverage, must_have_coverage)
+
+
+if __name__ == "__main__":
+    from synthetic_corpus import generate_corpus
+
+    arg_parser = argparse.ArgumentParser(description="Compare per-pair set intersection with the vectorized skill matrix.")
+    arg_parser.add_argument('--resumes', type=int, default=10000)
+    arg_parser.add_argument('--jds', type=int, default=100)
+    arg_parser.add_argument('--must-have', type=int, default=2, help="must-have skills taken from each JD")
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    args = arg_parser.parse_args()
+
+    resumes, jds = generate_corpus(args.resumes, args.jds, args.skills)
+    skill_matrix = SkillMatrix.from_file(args.skills)
+    resume_skills = [skill_matrix.matcher.find(text) for text in resumes]
+    jd_skills = [skill_matrix.matcher.find(text) for text in jds]
+    must_have = [sorted(skills)[:args.must_have] for skills in jd_skills]
+
+    start = time.perf_counter()
+    loop_overlap = [[len(jd & resume) for jd in jd_skills] for resume in resume_skills]
+    loop_eligible = [[set(required) <= resume for required in must_have] for resume in resume_skills]
+    loop_seconds = time.perf_counter() - start
+
+    # Encoding the corpus happens once; the comparison below is what runs per screening
+    start = time.perf_counter()
+    resume_incidence = skill_matrix.encode_sets(resume_skills)
+    resume_bits = skill_matrix.bitsets(resume_incidence)
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    must_have_incidence = skill_matrix.encode_must_have(must_have)
+    overlap = skill_matrix.scores(resume_incidence, skill_matrix.encode_sets(jd_skills), must_have_incidence)
+    eligible = skill_matrix.eligible(resume_bits, skill_matrix.bitsets(must_have_incidence))
+    matrix_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'pairs': args.resumes * args.jds,
+        'loop_seconds': loop_seconds,
+        'encode_seconds': encode_seconds,
+        'matrix_seconds': matrix_seconds,
+        'overlap_matches': bool(np.array_equal(overlap.overlap, loop_overlap)),
+        'eligible_matches': bool(np.array_equal(eligible, loop_eligible)),
+        'eligible_fraction': float(eligible.mean()),
+    }, indent=2))
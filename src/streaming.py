@@ -0,0 +1,143 @@
+"""
+Streaming JSON-lines batch mode shared by the command-line entry points.
+
+Each input line is one record holding a resume and a job description, either inline
+(``"resume"``, ``"jd"``) or as file paths (``"resume_path"``, ``"jd_path"``), plus an
+optional ``"id"`` that is copied to the output. Records are read lazily and scored in
+batches of bounded size, and each batch's results are written and flushed as soon as
+it finishes, so memory use does not grow with the input.
+
+Example:
+    echo '{"id": 1, "resume_path": "resumes/resume_0.txt", "jd_path": "job_descriptions/jd_1.txt"}' \\
+        | python src/ats_transformer.py --stream -
+"""
+
+import json
+import sys
+from itertools import islice
+
+BATCH_SIZE = 64
+
+
+def read_records(source):
+    """
+    Yields the JSON records of a JSON-lines file, or of stdin when ``source`` is ``'-'``.
+
+    Blank lines are skipped; a malformed line yields a ``ValueError`` instead of stopping the stream.
+    """
+    file = sys.stdin if source == '-' else open(source, 'r')
+    try:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield ValueError(f"line {line_number}: {error}")
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def batched(iterable, size):
+    """
+    Yields lists of at most ``size`` consecutive items.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def record_texts(record):
+    """
+    Returns the ``(resume_text, jd_text)`` of a record, reading files where paths are given.
+
+    Raises:
+    -------
+    ValueError
+        If the record holds neither the text nor the path of one of the documents.
+    TypeError
+        If an inline text or a path is not a string.
+    """
+    texts = []
+    for name in ('resume', 'jd'):
+        if name in record:
+            if not isinstance(record[name], str):
+                raise TypeError(f"{name!r} must be a string")
+            texts.append(record[name])
+        elif name + '_path' in record:
+            # open() would accept an integer as a file descriptor
+            if not isinstance(record[name + '_path'], str):
+                raise TypeError(f"{name + '_path'!r} must be a string")
+            with open(record[name + '_path'], 'r') as file:
+                texts.append(file.read())
+        else:
+            raise ValueError(f"record needs {name!r} or {name + '_path'!r}")
+    return tuple(texts)
+
+
+def stream(score_pairs, source, output=None, batch_size=BATCH_SIZE):
+    """
+    Scores a JSON-lines stream of records batch by batch.
+
+    Parameters:
+    -----------
+    score_pairs : callable
+        Called as ``score_pairs(resume_texts, jd_texts)``; returns one score per pair.
+        The engine behind it is created once and reused for every batch.
+    source : str
+        The input file, or ``'-'`` for stdin.
+    output : file, optional
+        Where the result lines are written; defaults to stdout.
+    batch_size : int
+        The maximum number of records scored together.
+
+    Returns:
+    --------
+    int
+        The number of records processed.
+    """
+    output = output or sys.stdout
+    processed = 0
+    for batch in batched(read_records(source), batch_size):
+        results = [{'id': record.get('id')} if isinstance(record, dict) else {'id': None} for record in batch]
+        valid, resumes, jds = [], [], []
+        for result, record in zip(results, batch):
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                if not isinstance(record, dict):
+                    raise ValueError("record must be a JSON object")
+                resume, jd = record_texts(record)
+            except (OSError, ValueError, TypeError) as error:
+                result['error'] = str(error)
+                continue
+            valid.append(result)
+            resumes.append(resume)
+            jds.append(jd)
+
+        if valid:
+            try:
+                for result, score in zip(valid, score_pairs(resumes, jds)):
+                    result['score'] = float(score)
+            except Exception as error:
+                for result in valid:
+                    result['error'] = f"{type(error).__name__}: {error}"
+
+        output.write(''.join(json.dumps(result) + '\n' for result in results))
+        output.flush()
+        processed += len(batch)
+    return processed
+
+
+def add_arguments(arg_parser):
+    """
+    Adds the ``--stream`` and ``--batch-size`` options to an entry point's argument parser.
+    """
+    arg_parser.add_argument('--stream', metavar='FILE', default=None,
+                            help="score JSON-lines records from FILE ('-' for stdin) and write JSON lines")
+    arg_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help="records scored together in streaming mode")
@@ -0,0 +1,180 @@
+"""
+Reproducible synthetic resume and job description generator for benchmarks.
+
+Resumes use section headers from ``ResumeParser.RESUME_SECTIONS`` and mention skills
+from ``meta/skills.txt``; job descriptions ask for a random subset of the same
+skills. The same seed always produces the same corpus.
+
+Usage:
+    python src/synthetic_corpus.py --resumes 1000 --jds 20 --output-dir bench_corpus
+"""
+
+import argparse
+import os
+import random
+
+from skill_matcher import parse_skills_file
+
+FIRST_NAMES = ["Alex", "Jordan", "Priya", "Wei", "Maria", "Tomas", "Aisha", "Kenji", "Olivia", "Samuel"]
+LAST_NAMES = ["Smith", "Patel", "Garcia", "Chen", "Okafor", "Novak", "Kim", "Rossi", "Silva", "Brown"]
+ROLES = ["Software Engineer", "Data Scientist", "Systems Administrator", "DevOps Engineer",
+         "Security Analyst", "Project Manager", "Support Specialist", "Cloud Architect"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech", "Hooli"]
+VERBS = ["Designed", "Built", "Led", "Maintained", "Migrated", "Automated", "Optimised", "Delivered",
+         "Implemented", "Monitored", "Deployed", "Analysed"]
+OBJECTS = ["a customer-facing platform", "internal reporting pipelines", "the billing service",
+           "a data warehouse", "CI/CD workflows", "network infrastructure", "a mobile application",
+           "machine learning models", "incident response runbooks", "the authentication system"]
+OUTCOMES = ["reducing latency by 30%", "serving 2 million users", "cutting costs significantly",
+            "improving reliability", "ahead of schedule", "with a team of five engineers",
+            "across three regions", "in collaboration with product teams"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Electrical Engineering", "BA Mathematics"]
+
+# Header variants drawn from RESUME_SECTIONS for the experience and skills sections
+EXPERIENCE_HEADERS = ["Experience", "Work Experience", "Professional Experience", "Employment History"]
+SKILLS_HEADERS = ["Skills", "Technical Skills", "Computer Skills", "Professional Skills"]
+OPTIONAL_SECTIONS = ["Projects", "Certifications", "Awards", "Publications", "Volunteer Experience"]
+
+
+def _sentence(rng, skills):
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, {rng.choice(OUTCOMES)}."
+
+
+def generate_resume(rng, skills):
+    """
+    Generates one resume.
+
+    Parameters:
+    -----------
+    rng : random.Random
+        The random generator.
+    skills : list of str
+        The skill dictionary.
+
+    Returns:
+    --------
+    str
+        The resume text.
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    own_skills = rng.sample(skills, rng.randint(5, 15))
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience. " + _sentence(rng, own_skills),
+        "",
+        rng.choice(EXPERIENCE_HEADERS),
+    ]
+    for _ in range(rng.randint(1, 4)):
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({rng.randint(2010, 2020)} - {rng.randint(2021, 2025)})")
+        lines.extend(f"- {_sentence(rng, own_skills)}" for _ in range(rng.randint(2, 6)))
+    lines += ["", rng.choice(SKILLS_HEADERS), ", ".join(own_skills), ""]
+    for section in rng.sample(OPTIONAL_SECTIONS, rng.randint(0, 2)):
+        lines += [section, _sentence(rng, own_skills), ""]
+    lines += ["Education", f"{rng.choice(DEGREES)}, University of {rng.choice(LAST_NAMES)}"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_jd(rng, skills):
+    """
+    Generates one job description.
+
+    Parameters:
+    -----------
+    rng : random.Random
+        The random generator.
+    skills : list of str
+        The skill dictionary.
+
+    Returns:
+    --------
+    str
+        The job description text.
+    """
+    role = rng.choice(ROLES)
+    wanted = rng.sample(skills, rng.randint(4, 10))
+    lines = [
+        f"{role} at {rng.choice(COMPANIES)}",
+        "",
+        f"We are looking for a {role} to join our team. You will work on {rng.choice(OBJECTS)} "
+        f"and {rng.choice(OBJECTS)}.",
+        "",
+        "Requirements:",
+    ]
+    lines.extend(f"- Experience with {skill}" for skill in wanted)
+    lines += ["", f"Nice to have: {', '.join(rng.sample(skills, 3))}."]
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(n_resumes, n_jds, skills_path='meta/skills.txt', seed=0):
+    """
+    Generates a reproducible corpus.
+
+    Parameters:
+    -----------
+    n_resumes : int
+        The number of resumes.
+    n_jds : int
+        The number of job descriptions.
+    skills_path : str
+        The path to the skills file.
+    seed : int
+        The random seed.
+
+    Returns:
+    --------
+    tuple of (list of str, list of str)
+        The resumes and the job descriptions.
+    """
+    skills = parse_skills_file(skills_path)
+    rng = random.Random(seed)
+    resumes = [generate_resume(rng, skills) for _ in range(n_resumes)]
+    jds = [generate_jd(rng, skills) for _ in range(n_jds)]
+    return resumes, jds
+
+
+def write_corpus(output_dir, resumes, jds):
+    """
+    Writes a corpus as ``resumes/resume_<i>.txt`` and ``job_descriptions/jd_<i>.txt``.
+
+    Parameters:
+    -----------
+    output_dir : str
+        The root directory to write to.
+    resumes : list of str
+        The resumes.
+    jds : list of str
+        The job descriptions.
+
+    Returns:
+    --------
+    tuple of (str, str)
+        The resume and job description directories.
+    """
+    resume_dir = os.path.join(output_dir, 'resumes')
+    jd_dir = os.path.join(output_dir, 'job_descriptions')
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(jd_dir, exist_ok=True)
+    for index, resume in enumerate(resumes):
+        with open(os.path.join(resume_dir, f'resume_{index}.txt'), 'w') as file:
+            file.write(resume)
+    for index, jd in enumerate(jds):
+        with open(os.path.join(jd_dir, f'jd_{index}.txt'), 'w') as file:
+            file.write(jd)
+    return resume_dir, jd_dir
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic resume/JD corpus.")
+    arg_parser.add_argument('--resumes', type=int, default=1000)
+    arg_parser.add_argument('--jds', type=int, default=20)
+    arg_parser.add_argument('--skills', default='meta/skills.txt')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--output-dir', default='bench_corpus')
+    args = arg_parser.parse_args()
+
+    resumes, jds = generate_corpus(args.resumes, args.jds, args.skills, args.seed)
+    resume_dir, jd_dir = write_corpus(args.output_dir, resumes, jds)
+    print(f"Wrote {len(resumes)} resumes to {resume_dir} and {len(jds)} job descriptions to {jd_dir}")
@@ -1,10 +1,28 @@
 # Importing the necessary libraries
-import string  # For string manipulation and punctuation handling
+import functools  # For the shared lemma cache
+import re  # For the fast regex tokenizer
+
+# NLTK resources (stopwords, WordNet lemmatizer, Punkt tokenizer) are loaded lazily,
+# once per process, through the registry
+import registry
+
+# Maximum number of distinct tokens whose lemma is memoized, shared by all TextCleaner instances
+LEMMA_CACHE_SIZE = 200_000
+
+# Precompiled tokenizer for callers that do not need Punkt-level fidelity: words (with
+# inner apostrophes, hyphens and dots kept together) or single punctuation characters
+FAST_TOKEN_PATTERN = re.compile(r"\w+(?:[-'.]\w+)*|[^\w\s]")
+
+
+@functools.lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(token: str) -> str:
+    """
+    Returns the WordNet lemma of a token, memoized across calls and instances.
+
+    Resume vocabulary is highly repetitive, so most lookups are served from the cache.
+    """
+    return registry.get_lemmatizer().lemmatize(token)
 
-import nltk  # Natural Language Toolkit for text processing
-from nltk.corpus import stopwords  # For stopwords list
-from nltk.stem import WordNetLemmatizer  # For word lemmatization
-from nltk.tokenize import word_tokenize  # For tokenizing sentences
 
 class TextCleaner:
     """
@@ -18,21 +36,36 @@ class TextCleaner:
         A set containing English stopwords and punctuation to be removed from the text.
     lemmatizer : WordNetLemmatizer
         An instance of the WordNetLemmatizer for lemmatizing words.
+    fast_tokenizer : bool
+        Whether to tokenize with FAST_TOKEN_PATTERN instead of NLTK's word_tokenize.
 
     Methods:
     --------
     clean_text() -> str:
         Cleans the raw input text by tokenizing, removing stopwords and punctuation, and lemmatizing the words.
+    clean_many() -> list:
+        Cleans a batch of texts.
     """
 
-    def __init__(self) -> None:
+    # Bump whenever a change to the cleaning steps changes their output, so cached
+    # cleaned text (see manifest.py) is recomputed
+    VERSION = 1
+
+    def __init__(self, fast_tokenizer: bool = False) -> None:
         """
         Constructs all the necessary attributes for the TextCleaner object.
+
+        Parameters:
+        -----------
+        fast_tokenizer : bool
+            Use the precompiled regex tokenizer instead of word_tokenize. The default
+            (compatibility mode) produces exactly the same output as before.
         """
-        # Combine English stopwords and punctuation into a set for efficient lookup
-        self.set_of_stopwords = set(stopwords.words("english") + list(string.punctuation))
-        # Initialize the WordNetLemmatizer
-        self.lemmatizer = WordNetLemmatizer()
+        # Combine English stopwords and punctuation into a set for efficient lookup (shared per process)
+        self.set_of_stopwords = registry.get_stopwords()
+        # The shared WordNetLemmatizer
+        self.lemmatizer = registry.get_lemmatizer()
+        self.fast_tokenizer = fast_tokenizer
 
     def clean_text(self, raw_text: str) -> str:
         """
@@ -54,12 +87,61 @@ class TextCleaner:
             The cleaned text.
         """
         # Convert text to lowercase and tokenize into words
-        tokens = word_tokenize(raw_text.lower())
-        # Remove stopwords and punctuation
-        tokens = [token for token in tokens if token not in self.set_of_stopwords]
-        # Lemmatize the remaining words
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+        tokens = self.tokenize(raw_text.lower())
+        # Remove stopwords and punctuation, then lemmatize
+        tokens = self.clean_tokens(tokens)
         # Join the tokens back into a single string
         cleaned_text = " ".join(tokens)
         return cleaned_text
 
+    def clean_tokens(self, tokens: list) -> list:
+        """
+        Removes stopwords and punctuation from lowercase tokens and lemmatizes the rest.
+
+        Parameters:
+        -----------
+        tokens : list of str
+            The lowercase tokens, as returned by ``tokenize``.
+
+        Returns:
+        --------
+        list of str
+            The lemmas, in order.
+        """
+        # Lemmatize through the shared lemma cache
+        return [lemmatize(token) for token in tokens if token not in self.set_of_stopwords]
+
+    def clean_many(self, raw_texts: list) -> list:
+        """
+        Cleans a batch of texts, sharing the stopword set and lemma cache across them.
+
+        Parameters:
+        -----------
+        raw_texts : list of str
+            The raw texts to be cleaned.
+
+        Returns:
+        --------
+        list of str
+            The cleaned texts, in input order.
+        """
+        return [self.clean_text(raw_text) for raw_text in raw_texts]
+
+    def tokenize(self, text: str) -> list:
+        """
+        Splits text into tokens with word_tokenize, or FAST_TOKEN_PATTERN in fast mode.
+
+        Parameters:
+        -----------
+        text : str
+            The text to tokenize.
+
+        Returns:
+        --------
+        list of str
+            The tokens.
+        """
+        if self.fast_tokenizer:
+            return FAST_TOKEN_PATTERN.findall(text)
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text)
@@ -0,0 +1,438 @@
+"""
+CPU vector indexes for retrieving the resumes closest to a job description embedding.
+
+Both indexes work on L2-normalised float32 vectors and score by inner product, which
+equals cosine similarity for unit vectors. ``FlatIndex`` is exact brute force;
+``IVFIndex`` partitions the vectors around k-means centroids and only scans the
+``n_probe`` partitions closest to each query.
+"""
+
+import time
+
+import numpy as np
+
+from ranking import top_k
+
+# Rows processed per step when assigning vectors to centroids, to bound memory use
+ASSIGN_CHUNK_SIZE = 8192
+
+
+def _as_matrix(vectors, dim):
+    """
+    Converts vectors to a contiguous ``(n, dim)`` float32 matrix.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    if vectors.shape[1] != dim:
+        raise ValueError(f"Expected vectors of dimension {dim}, got {vectors.shape[1]}")
+    return vectors
+
+
+def _last_occurrences(ids):
+    """
+    Returns the positions of the last occurrence of each distinct id, in input order.
+    """
+    _, reversed_first = np.unique(ids[::-1], return_index=True)
+    return np.sort(ids.shape[0] - 1 - reversed_first)
+
+
+class FlatIndex:
+    """
+    An exact index that scores every stored vector for each query.
+
+    Attributes:
+    -----------
+    dim : int
+        The dimension of the stored vectors.
+    ids : numpy.ndarray
+        The int64 id of each stored vector.
+    vectors : numpy.ndarray
+        The ``(n, dim)`` float32 stored vectors.
+    """
+
+    KIND = 'flat'
+
+    def __init__(self, dim):
+        """
+        Initializes an empty flat index.
+
+        Parameters:
+        -----------
+        dim : int
+            The dimension of the vectors.
+        """
+        self.dim = dim
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def add(self, ids, vectors):
+        """
+        Inserts vectors under the given ids, replacing any vector already stored under one of them.
+
+        Parameters:
+        -----------
+        ids : array-like of int
+            One id per vector; when an id repeats, its last vector is kept.
+        vectors : array-like
+            A ``(n, dim)`` matrix of normalised vectors.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _as_matrix(vectors, self.dim)
+        keep = _last_occurrences(ids)
+        ids, vectors = ids[keep], vectors[keep]
+        self.remove(ids)
+        self.ids = np.concatenate([self.ids, ids])
+        self.vectors = np.concatenate([self.vectors, vectors])
+
+    def remove(self, ids):
+        """
+        Deletes the vectors stored under the given ids; unknown ids are ignored.
+
+        Parameters:
+        -----------
+        ids : array-like of int
+            The ids to delete.
+        """
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        self.ids = self.ids[keep]
+        self.vectors = self.vectors[keep]
+
+    def search(self, queries, k=10):
+        """
+        Finds the k best stored vectors for each query.
+
+        Parameters:
+        -----------
+        queries : array-like
+            A ``(n_queries, dim)`` matrix of normalised query vectors.
+        k : int
+            The number of results per query.
+
+        Returns:
+        --------
+        list of list of (int, float)
+            For each query, ``(id, score)`` pairs ordered from best to worst.
+        """
+        scores = self.vectors @ _as_matrix(queries, self.dim).T
+        return [
+            [(int(self.ids[index]), score) for index, score in top_k(scores[:, column], k)]
+            for column in range(scores.shape[1])
+        ]
+
+    def save(self, path):
+        """
+        Saves the index to a ``.npz`` file.
+
+        Parameters:
+        -----------
+        path : str
+            The file to write.
+        """
+        np.savez(path, kind=self.KIND, dim=self.dim, ids=self.ids, vectors=self.vectors)
+
+    @classmethod
+    def _from_arrays(cls, arrays):
+        index = cls(int(arrays['dim']))
+        index.ids = arrays['ids']
+        index.vectors = arrays['vectors']
+        return index
+
+
+class IVFIndex:
+    """
+    An approximate inverted-file index built on k-means centroids.
+
+    Every vector is stored in the list of its nearest centroid. A query is scored
+    against the centroids first and only the ``n_probe`` closest lists are scanned.
+
+    Attributes:
+    -----------
+    dim : int
+        The dimension of the stored vectors.
+    n_lists : int
+        The number of centroids (partitions).
+    n_probe : int
+        The number of partitions scanned per query.
+    centroids : numpy.ndarray
+        The ``(n_lists, dim)`` unit-length centroids, or ``None`` before training.
+    """
+
+    KIND = 'ivf'
+
+    def __init__(self, dim, n_lists=100, n_probe=8):
+        """
+        Initializes an empty, untrained IVF index.
+
+        Parameters:
+        -----------
+        dim : int
+            The dimension of the vectors.
+        n_lists : int
+            The number of partitions.
+        n_probe : int
+            The number of partitions scanned per query.
+        """
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids = None
+        self._list_ids = [np.empty(0, dtype=np.int64) for _ in range(n_lists)]
+        self._list_vectors = [np.empty((0, dim), dtype=np.float32) for _ in range(n_lists)]
+        self._id_to_list = {}
+
+    def __len__(self):
+        return len(self._id_to_list)
+
+    def train(self, vectors, iterations=20, max_samples=256, seed=0):
+        """
+        Learns the centroids with spherical k-means.
+
+        Parameters:
+        -----------
+        vectors : array-like
+            A ``(n, dim)`` matrix of normalised training vectors.
+        iterations : int
+            The number of k-means iterations.
+        max_samples : int
+            The maximum number of training vectors used per centroid.
+        seed : int
+            The seed of the random sampling and initialisation.
+        """
+        vectors = _as_matrix(vectors, self.dim)
+        if vectors.shape[0] < self.n_lists:
+            raise ValueError(f"Need at least {self.n_lists} training vectors, got {vectors.shape[0]}")
+
+        rng = np.random.default_rng(seed)
+        if vectors.shape[0] > self.n_lists * max_samples:
+            vectors = vectors[rng.choice(vectors.shape[0], self.n_lists * max_samples, replace=False)]
+
+        centroids = vectors[rng.choice(vectors.shape[0], self.n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = self._assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            counts = np.bincount(assignment, minlength=self.n_lists)
+            # Re-seed empty partitions from random training vectors
+            empty = counts == 0
+            sums[empty] = vectors[rng.choice(vectors.shape[0], int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+        self.centroids = centroids.astype(np.float32)
+
+    def add(self, ids, vectors):
+        """
+        Inserts vectors under the given ids, replacing any vector already stored under
+        one of them. The index must be trained first.
+
+        Parameters:
+        -----------
+        ids : array-like of int
+            One id per vector; when an id repeats, its last vector is kept.
+        vectors : array-like
+            A ``(n, dim)`` matrix of normalised vectors.
+        """
+        if self.centroids is None:
+            raise RuntimeError("IVFIndex must be trained before vectors are added")
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _as_matrix(vectors, self.dim)
+        keep = _last_occurrences(ids)
+        ids, vectors = ids[keep], vectors[keep]
+        self.remove([id_ for id_ in ids.tolist() if id_ in self._id_to_list])
+
+        assignment = self._assign(vectors, self.centroids)
+        for list_no in np.unique(assignment):
+            members = assignment == list_no
+            self._list_ids[list_no] = np.concatenate([self._list_ids[list_no], ids[members]])
+            self._list_vectors[list_no] = np.concatenate([self._list_vectors[list_no], vectors[members]])
+        self._id_to_list.update(zip(ids.tolist(), assignment.tolist()))
+
+    def remove(self, ids):
+        """
+        Deletes the vectors stored under the given ids; unknown ids are ignored.
+
+        Parameters:
+        -----------
+        ids : array-like of int
+            The ids to delete.
+        """
+        by_list = {}
+        for id_ in np.asarray(ids, dtype=np.int64).tolist():
+            list_no = self._id_to_list.pop(id_, None)
+            if list_no is not None:
+                by_list.setdefault(list_no, []).append(id_)
+        for list_no, list_ids in by_list.items():
+            keep = ~np.isin(self._list_ids[list_no], list_ids)
+            self._list_ids[list_no] = self._list_ids[list_no][keep]
+            self._list_vectors[list_no] = self._list_vectors[list_no][keep]
+
+    def search(self, queries, k=10, n_probe=None):
+        """
+        Finds approximately the k best stored vectors for each query.
+
+        Parameters:
+        -----------
+        queries : array-like
+            A ``(n_queries, dim)`` matrix of normalised query vectors.
+        k : int
+            The number of results per query.
+        n_probe : int, optional
+            Overrides the number of partitions scanned.
+
+        Returns:
+        --------
+        list of list of (int, float)
+            For each query, ``(id, score)`` pairs ordered from best to worst.
+        """
+        queries = _as_matrix(queries, self.dim)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        results = []
+        for query, lists in zip(queries, probes):
+            candidate_ids = np.concatenate([self._list_ids[list_no] for list_no in lists])
+            if candidate_ids.shape[0] == 0:
+                results.append([])
+                continue
+            candidate_vectors = np.concatenate([self._list_vectors[list_no] for list_no in lists])
+            scores = candidate_vectors @ query
+            results.append([(int(candidate_ids[index]), score) for index, score in top_k(scores, k)])
+        return results
+
+    def save(self, path):
+        """
+        Saves the index to a ``.npz`` file.
+
+        Parameters:
+        -----------
+        path : str
+            The file to write.
+        """
+        sizes = np.array([ids.shape[0] for ids in self._list_ids], dtype=np.int64)
+        np.savez(
+            path,
+            kind=self.KIND,
+            dim=self.dim,
+            n_probe=self.n_probe,
+            centroids=self.centroids,
+            list_sizes=sizes,
+            ids=np.concatenate(self._list_ids),
+            vectors=np.concatenate(self._list_vectors),
+        )
+
+    @classmethod
+    def _from_arrays(cls, arrays):
+        centroids = arrays['centroids']
+        index = cls(int(arrays['dim']), n_lists=centroids.shape[0], n_probe=int(arrays['n_probe']))
+        index.centroids = centroids
+        offsets = np.concatenate([[0], np.cumsum(arrays['list_sizes'])])
+        ids, vectors = arrays['ids'], arrays['vectors']
+        for list_no in range(index.n_lists):
+            start, end = offsets[list_no], offsets[list_no + 1]
+            index._list_ids[list_no] = ids[start:end]
+            index._list_vectors[list_no] = vectors[start:end]
+            index._id_to_list.update(dict.fromkeys(ids[start:end].tolist(), list_no))
+        return index
+
+    @staticmethod
+    def _assign(vectors, centroids):
+        """
+        Returns the index of the nearest centroid of every vector.
+        """
+        assignment = np.empty(vectors.shape[0], dtype=np.int64)
+        for start in range(0, vectors.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk = vectors[start:start + ASSIGN_CHUNK_SIZE]
+            assignment[start:start + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignment
+
+
+def load_index(path):
+    """
+    Loads an index written by ``FlatIndex.save`` or ``IVFIndex.save``.
+
+    Parameters:
+    -----------
+    path : str
+        The ``.npz`` file to read.
+
+    Returns:
+    --------
+    FlatIndex or IVFIndex
+        The restored index.
+    """
+    with np.load(path) as arrays:
+        kind = str(arrays['kind'])
+        for cls in (FlatIndex, IVFIndex):
+            if cls.KIND == kind:
+                return cls._from_arrays(arrays)
+    raise ValueError(f"Unknown index kind: {kind}")
+
+
+def recall_report(index, exact_index, queries, k=10, n_probes=(1, 2, 4, 8, 16, 32)):
+    """
+    Measures the recall and latency of an IVF index against exact search.
+
+    Parameters:
+    -----------
+    index : IVFIndex
+        The approximate index.
+    exact_index : FlatIndex
+        An exact index holding the same vectors.
+    queries : array-like
+        A ``(n_queries, dim)`` matrix of normalised query vectors.
+    k : int
+        The number of results per query.
+    n_probes : iterable of int
+        The probe counts to evaluate.
+
+    Returns:
+    --------
+    list of dict
+        One row per probe count with ``n_probe``, ``recall`` (recall@k against the
+        exact results), ``ms_per_query`` and ``exact_ms_per_query``.
+    """
+    queries = _as_matrix(queries, exact_index.dim)
+    start = time.perf_counter()
+    exact = exact_index.search(queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+    truth = [set(id_ for id_, _ in hits) for hits in exact]
+
+    report = []
+    for n_probe in n_probes:
+        start = time.perf_counter()
+        approximate = index.search(queries, k, n_probe=n_probe)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+        found = sum(len(expected & set(id_ for id_, _ in hits)) for expected, hits in zip(truth, approximate))
+        expected_total = sum(len(expected) for expected in truth)
+        report.append({
+            'n_probe': n_probe,
+            'recall': found / expected_total if expected_total else 1.0,
+            'ms_per_query': elapsed_ms,
+            'exact_ms_per_query': exact_ms,
+        })
+    return report
+
+
+# Example usage: recall vs latency on random clustered vectors
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    dim, n_vectors, n_clusters = 384, 100_000, 500
+    centers = rng.normal(size=(n_clusters, dim))
+    data = centers[rng.integers(n_clusters, size=n_vectors)] + 1.0 * rng.normal(size=(n_vectors, dim))
+    data = (data / np.linalg.norm(data, axis=1, keepdims=True)).astype(np.float32)
+    queries = data[rng.choice(n_vectors, 200, replace=False)] + 0.5 * rng.normal(size=(200, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    flat = FlatIndex(dim)
+    flat.add(np.arange(n_vectors), data)
+    ivf = IVFIndex(dim, n_lists=int(np.sqrt(n_vectors)))
+    ivf.train(data)
+    ivf.add(np.arange(n_vectors), data)
+
+    print(f"{'n_probe':>8} {'recall@10':>10} {'ms/query':>10} {'exact ms/query':>15}")
+    for row in recall_report(ivf, flat, queries, k=10):
+        print(f"{row['n_probe']:>8} {row['recall']:>10.3f} {row['ms_per_query']:>10.3f} {row['exact_ms_per_query']:>15.3f}")
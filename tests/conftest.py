@@ -0,0 +1,73 @@
+"""
+Shared test setup.
+
+The modules live flat in ``src`` and import each other by name, as they do when run
+as scripts, so ``src`` is put on the import path here.
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import registry  # noqa: E402
+
+SKILLS_PATH = os.path.join(ROOT, 'meta', 'skills.txt')
+
+
+class WordCleaner:
+    """
+    A lower-casing word splitter with the ``TextCleaner`` interface, needing no NLTK corpora.
+    """
+
+    def tokenize(self, text):
+        return re.findall(r"[a-z0-9+#]+", text.lower())
+
+    def clean_tokens(self, tokens):
+        return list(tokens)
+
+    def clean_text(self, raw_text):
+        return " ".join(self.tokenize(raw_text))
+
+    def clean_many(self, raw_texts):
+        return [self.clean_text(raw_text) for raw_text in raw_texts]
+
+
+class HashingEncoder:
+    """
+    A deterministic stand-in for ``ATSTransformer`` embedding texts by hashed word counts.
+
+    Attributes:
+    -----------
+    calls : list of list of str
+        The texts of every ``encode`` call.
+    """
+
+    def __init__(self, n_features=256):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False)
+        self.calls = []
+
+    def encode(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        if not texts:
+            # SentenceTransformer.encode returns a flat empty array for an empty batch
+            return np.empty(0, dtype=np.float32)
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+@pytest.fixture
+def word_cleaner(monkeypatch):
+    """
+    Makes ``registry.get_text_cleaner`` return a ``WordCleaner``.
+    """
+    cleaner = WordCleaner()
+    monkeypatch.setitem(registry._resources, ('text_cleaner', False), cleaner)
+    return cleaner
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from ats_hashed import HashedTfidfIndex
+
+WORDS = ["python", "java", "sql", "docker", "kubernetes", "pandas", "spark", "react", "aws", "linux",
+         "terraform", "kafka", "django", "flask", "golang", "rust", "scala", "airflow", "tableau", "excel"]
+
+
+def random_texts(n, seed):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=rng.integers(3, 15))) for _ in range(n)]
+
+
+RESUMES = random_texts(23, seed=0)
+IDS = [f"resume_{index}" for index in range(len(RESUMES))]
+JDS = random_texts(4, seed=1)
+
+
+def build(directory, batches):
+    index = HashedTfidfIndex(str(directory), n_features=2 ** 18, chunk_size=4)
+    start = 0
+    for size in batches:
+        index.add(RESUMES[start:start + size], IDS[start:start + size])
+        start += size
+        # Reopen between appends, as a later build run would
+        index = HashedTfidfIndex(str(directory))
+    return index
+
+
+def test_small_appends_fill_the_last_chunk(tmp_path):
+    index = build(tmp_path, [3, 1, 5, 2, 1, 11])
+
+    assert index.n_documents == len(RESUMES)
+    assert index.n_chunks == 6
+    chunk_ids = [list(ids) for ids, _ in index.chunks()]
+    assert [len(ids) for ids in chunk_ids] == [4, 4, 4, 4, 4, 3]
+    assert sum(chunk_ids, []) == IDS
+
+
+def test_appends_rank_like_a_single_build(tmp_path):
+    appended = build(tmp_path / 'appended', [3, 1, 5, 2, 1, 11])
+    single = build(tmp_path / 'single', [len(RESUMES)])
+
+    for expected, actual in zip(single.rank(JDS, 5), appended.rank(JDS, 5)):
+        assert [id_ for id_, _ in actual] == [id_ for id_, _ in expected]
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected], abs=1e-6)
+    np.testing.assert_array_equal(appended.document_frequencies, single.document_frequencies)
+
+
+def test_scores_match_tfidf_vectorizer(tmp_path):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    index = build(tmp_path, [len(RESUMES)])
+    vectorizer = TfidfVectorizer()
+    expected = (vectorizer.fit_transform(RESUMES) @ vectorizer.transform(JDS).T).toarray()
+
+    scores = np.vstack([chunk_scores for _, chunk_scores in index.iter_scores(JDS)])
+
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+
+def test_rank_keeps_the_global_top_k_across_chunks(tmp_path):
+    index = build(tmp_path, [len(RESUMES)])
+    scores = np.vstack([chunk_scores for _, chunk_scores in index.iter_scores(JDS)])
+
+    for column, ranking in enumerate(index.rank(JDS, 7)):
+        assert [score for _, score in ranking] == pytest.approx(np.sort(scores[:, column])[::-1][:7], abs=1e-6)
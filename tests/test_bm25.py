@@ -0,0 +1,88 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from bm25 import BM25Index, pruning_report
+
+
+def zipf_corpus(n_docs, vocabulary=300, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+    return [
+        " ".join(f"t{term}" for term in rng.choice(vocabulary, size=rng.integers(5, 60), p=weights))
+        for _ in range(n_docs)
+    ]
+
+
+def reference_scores(documents, query, k1=1.2, b=0.75):
+    tokenized = [document.split() for document in documents]
+    average_length = sum(map(len, tokenized)) / len(tokenized)
+    document_freqs = Counter(term for tokens in tokenized for term in set(tokens))
+    scores = []
+    for tokens in tokenized:
+        counts = Counter(tokens)
+        score = 0.0
+        for term, weight in Counter(query.split()).items():
+            if counts[term]:
+                idf = math.log1p((len(documents) - document_freqs[term] + 0.5) / (document_freqs[term] + 0.5))
+                norm = k1 * (1 - b + b * len(tokens) / average_length)
+                score += weight * idf * counts[term] * (k1 + 1) / (counts[term] + norm)
+        scores.append(score)
+    return scores
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    documents = zipf_corpus(400)
+    index = BM25Index()
+    index.build(documents)
+    queries = [" ".join(document.split()[:12]) for document in zipf_corpus(40, seed=1)]
+    return documents, index, queries
+
+
+def test_exhaustive_scores_match_the_bm25_formula(corpus):
+    documents, index, queries = corpus
+
+    for query in queries[:5]:
+        expected = reference_scores(documents, query)
+        for document_id, score in index._search(query, 20, exhaustive=True)[0]:
+            assert score == pytest.approx(expected[int(document_id)], rel=1e-4)
+
+
+@pytest.mark.parametrize('k', [1, 5, 10, 50, 1000])
+def test_pruned_search_returns_the_exhaustive_top_k(corpus, k):
+    _, index, queries = corpus
+
+    for query in queries:
+        assert index.search(query, k) == index._search(query, k, exhaustive=True)[0]
+
+
+def test_pruning_skips_postings(corpus):
+    _, index, queries = corpus
+
+    report = pruning_report(index, queries, k=5)
+
+    assert report['identical_results'] == len(queries)
+    assert report['postings_fraction'] < 1.0
+
+
+def test_queries_without_indexed_terms_return_nothing(corpus):
+    _, index, _ = corpus
+
+    assert index.search("unknown words only", 10) == []
+    assert index.search("t0", 0) == []
+
+
+def test_save_and_load_round_trip(corpus, tmp_path):
+    _, index, queries = corpus
+    path = str(tmp_path / 'index.npz')
+
+    index.save(path)
+    loaded = BM25Index.load(path)
+
+    assert len(loaded) == len(index)
+    for query in queries[:10]:
+        assert loaded.search(query, 10) == index.search(query, 10)
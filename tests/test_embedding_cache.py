@@ -0,0 +1,42 @@
+import gc
+import weakref
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache
+
+
+def vectors(n, dim=4, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def test_entries_survive_reopen(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), 'model', max_entries=10)
+    embeddings = vectors(3)
+    cache.put(['a', 'b', 'c'], embeddings)
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), 'model')
+    assert len(reopened) == 3
+    np.testing.assert_array_equal(np.stack(reopened.get(['c', 'a', 'b'])), embeddings[[2, 0, 1]])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), 'model', max_entries=3)
+    cache.put(['a', 'b', 'c'], vectors(3))
+    cache.get(['a'])
+    cache.put(['d'], vectors(1, seed=1))
+
+    assert [vector is None for vector in cache.get(['a', 'b', 'c', 'd'])] == [False, True, False, False]
+
+
+def test_unreferenced_cache_is_collected_and_flushed(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), 'model', flush_every=100)
+    cache.put(['a'], vectors(1))
+    reference = weakref.ref(cache)
+
+    del cache
+    gc.collect()
+
+    assert reference() is None
+    assert len(EmbeddingCache(str(tmp_path), 'model')) == 1
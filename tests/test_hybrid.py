@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import SKILLS_PATH, HashingEncoder
+from document import Document
+from hybrid import HybridRanker
+
+RESUMES = [
+    "Experience\nBuilt Python services on PostgreSQL\nSkills\nPython, SQL, PostgreSQL",
+    "Experience\nMaintained Java backends\nSkills\nJava, Spring, MySQL",
+    "Experience\nTrained PyTorch models in Python\nSkills\nPython, PyTorch, Pandas",
+]
+
+JDS = [
+    "Python developer with PostgreSQL and SQL experience",
+    "Java engineer with MySQL",
+]
+
+
+def make_ranker(prefilter):
+    ranker = HybridRanker(transformer=HashingEncoder(), prefilter=prefilter, candidates=2, skills_path=SKILLS_PATH)
+    ranker.fit(RESUMES)
+    return ranker
+
+
+@pytest.mark.parametrize('prefilter', ['tfidf', 'skills'])
+def test_unsatisfiable_must_have_returns_empty_rankings(word_cleaner, prefilter):
+    ranker = make_ranker(prefilter)
+
+    rankings = ranker.rank(JDS, top_k_resumes=2, must_have=[['Hadoop'], ['Hadoop']])
+
+    assert rankings == [[], []]
+    assert ranker.transformer.calls == []
+
+
+@pytest.mark.parametrize('prefilter', ['tfidf', 'skills'])
+def test_empty_shortlist_next_to_a_satisfiable_one(word_cleaner, prefilter):
+    ranker = make_ranker(prefilter)
+
+    rankings = ranker.rank(JDS, top_k_resumes=2, must_have=[['python', 'postgres'], ['Hadoop']])
+
+    assert [index for index, _ in rankings[0]] == [0]
+    assert rankings[1] == []
+
+
+def test_must_have_needs_one_list_per_jd(word_cleaner):
+    ranker = make_ranker('skills')
+
+    with pytest.raises(ValueError):
+        ranker.shortlist(JDS, must_have=[['Python']])
+
+
+def test_resumes_are_scored_on_their_experience_and_skills(word_cleaner):
+    ranker = make_ranker('tfidf')
+    ranker.fit(RESUMES + ["Python and SQL, with no sections"])
+
+    assert ranker.resume_texts[0] == Document(RESUMES[0]).cleaned_resume
+    assert ranker.resume_texts[-1] == "python and sql with no sections"
@@ -0,0 +1,30 @@
+import tracemalloc
+
+from instrumentation import Instrumentation
+
+
+def test_stages_are_broken_down_per_document_only_when_named():
+    instrumentation = Instrumentation()
+    with instrumentation.stage('cleaning', 'resume_0.txt'):
+        pass
+    with instrumentation.stage('encoding'):
+        pass
+
+    report = instrumentation.report()
+
+    assert set(report['stages']) == {'cleaning', 'encoding'}
+    assert report['documents'] == {'resume_0.txt': {'cleaning': report['documents']['resume_0.txt']['cleaning']}}
+
+
+def test_close_stops_the_tracing_it_started():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    with Instrumentation(track_memory=True) as instrumentation:
+        assert tracemalloc.is_tracing()
+        with instrumentation.stage('cleaning', 'resume_0.txt'):
+            data = [0] * 10_000
+        del data
+
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.report()['stages']['cleaning']['peak_memory_bytes'] > 0
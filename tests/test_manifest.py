@@ -0,0 +1,66 @@
+import pytest
+
+import pipeline
+import skill_matcher
+from conftest import SKILLS_PATH
+from manifest import CorpusManifest, current_versions, refresh_corpus
+
+RESUMES = {
+    'resume_0.txt': "Experience\nBuilt Python services\nSkills\nPython, SQL",
+    'resume_1.txt': "Experience\nMaintained Java backends\nSkills\nJava, MySQL",
+    'resume_2.txt': "Experience\nTrained models\nSkills\nPyTorch, Pandas",
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    resume_dir, jd_dir = tmp_path / 'resumes', tmp_path / 'jds'
+    resume_dir.mkdir()
+    jd_dir.mkdir()
+    for name, text in RESUMES.items():
+        (resume_dir / name).write_text(text)
+    (jd_dir / 'jd_0.txt').write_text("Python developer with SQL")
+    return resume_dir, jd_dir, str(tmp_path / 'manifest.json')
+
+
+def refresh(corpus):
+    resume_dir, jd_dir, manifest_path = corpus
+    manifest = CorpusManifest(manifest_path, current_versions(SKILLS_PATH))
+    records = refresh_corpus(manifest, str(resume_dir), str(jd_dir), SKILLS_PATH, workers=1)
+    manifest.save()
+    return manifest, records
+
+
+def recomputed(manifest, stage):
+    return sorted(path.rsplit('/', 1)[-1] for path in manifest.recomputed.get(stage, []))
+
+
+def test_only_changed_stages_are_recomputed(word_cleaner, corpus, monkeypatch):
+    manifest, first = refresh(corpus)
+    assert recomputed(manifest, 'cleaned') == ['jd_0.txt', 'resume_0.txt', 'resume_1.txt', 'resume_2.txt']
+
+    processed = []
+    process_resume = pipeline.process_resume
+    monkeypatch.setattr(pipeline, 'process_resume', lambda path: processed.append(path) or process_resume(path))
+
+    manifest, second = refresh(corpus)
+    assert manifest.recomputed == {}
+    assert processed == []
+    assert second == first
+
+    (corpus[0] / 'resume_1.txt').write_text("Experience\nMaintained Go backends\nSkills\nGo, PostgreSQL")
+    manifest, third = refresh(corpus)
+    assert recomputed(manifest, 'cleaned') == ['resume_1.txt']
+    assert [path.rsplit('/', 1)[-1] for path in processed] == ['resume_1.txt']
+    assert third[str(corpus[0] / 'resume_1.txt')]['skills'] == ['Go', 'PostgreSQL']
+
+
+def test_alias_table_changes_recompute_skills_only(word_cleaner, corpus, monkeypatch):
+    refresh(corpus)
+
+    monkeypatch.setitem(skill_matcher.EXTRA_ALIASES, 'Pandas', ['pd'])
+    manifest, _ = refresh(corpus)
+
+    assert recomputed(manifest, 'skills') == ['jd_0.txt', 'resume_0.txt', 'resume_1.txt', 'resume_2.txt']
+    assert 'cleaned' not in manifest.recomputed
+    assert 'sections' not in manifest.recomputed
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from ranking import top_k, top_k_per_column
+
+
+def test_returns_the_best_scores_in_order():
+    assert top_k([0.1, 0.9, 0.5, 0.7], 2) == [(1, 0.9), (3, 0.7)]
+
+
+def test_ties_go_to_the_lower_index():
+    scores = [0.5, 0.8, 0.5, 0.8, 0.5]
+
+    assert top_k(scores, 3) == [(1, 0.8), (3, 0.8), (0, 0.5)]
+    assert [index for index, _ in top_k(scores, 5)] == [1, 3, 0, 2, 4]
+
+
+@pytest.mark.parametrize('k', [5, 100])
+def test_k_above_the_number_of_candidates_ranks_them_all(k):
+    assert [index for index, _ in top_k([0.2, 0.4, 0.3], k)] == [1, 2, 0]
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_non_positive_k_returns_nothing(k):
+    assert top_k([0.2, 0.4], k) == []
+
+
+def test_empty_scores():
+    assert top_k(np.empty(0), 3) == []
+
+
+def test_matches_a_full_stable_sort():
+    scores = np.random.default_rng(0).integers(0, 5, size=200).astype(float)
+
+    for k in (1, 7, 50, 200):
+        expected = sorted(range(len(scores)), key=lambda index: (-scores[index], index))[:k]
+        assert [index for index, _ in top_k(scores, k)] == expected
+
+
+def test_per_column():
+    score_matrix = np.array([[0.1, 0.9], [0.8, 0.2], [0.5, 0.5]])
+
+    assert top_k_per_column(score_matrix, 1) == [[(1, 0.8)], [(0, 0.9)]]
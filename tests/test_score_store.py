@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from score_store import ScoreStore
+
+
+def ids(prefix, start, stop):
+    return [f"{prefix}{index}" for index in range(start, stop)]
+
+
+def assert_matches(store, expected, resume_ids, jd_ids):
+    for column, jd_id in enumerate(jd_ids):
+        np.testing.assert_allclose(store.jd_scores(jd_id), expected[:, column], equal_nan=True)
+    for row, resume_id in enumerate(resume_ids):
+        np.testing.assert_allclose(store.resume_scores(resume_id), expected[row], equal_nan=True)
+
+
+def test_blocks_grow_both_axes_and_survive_reopening(tmp_path):
+    rng = np.random.default_rng(0)
+    store = ScoreStore(str(tmp_path), dtype='float32', tile_size=4)
+    resume_ids, jd_ids = ids('r', 0, 30), ids('j', 0, 30)
+    expected = np.full((30, 30), np.nan, dtype=np.float32)
+
+    # Grow the rows, then the columns, then fill a block straddling tile edges; 64 tiles
+    # outgrow the initial reservation of 16
+    for rows, columns in [((0, 10), (0, 3)), ((10, 30), (0, 3)), ((0, 30), (3, 30)), ((5, 13), (1, 7))]:
+        block = rng.random((rows[1] - rows[0], columns[1] - columns[0]), dtype=np.float32)
+        store.write(resume_ids[slice(*rows)], jd_ids[slice(*columns)], block)
+        expected[slice(*rows), slice(*columns)] = block
+        n_resumes, n_jds = store.shape
+        assert_matches(store, expected[:n_resumes, :n_jds], resume_ids[:n_resumes], jd_ids[:n_jds])
+
+    assert store.shape == (30, 30)
+    reopened = ScoreStore(str(tmp_path))
+    assert (reopened.dtype, reopened.tile_size) == (np.float32, 4)
+    assert_matches(reopened, expected, resume_ids, jd_ids)
+
+
+def test_unwritten_cells_are_nan_and_skipped_by_top_k(tmp_path):
+    store = ScoreStore(str(tmp_path), tile_size=2)
+    store.write(['r0', 'r1', 'r2'], ['j0'], [[0.5], [0.9], [0.1]])
+    store.write(['r3'], ['j1'], [[0.7]])
+
+    assert np.isnan(store.get('r0', 'j1'))
+    assert [id_ for id_, _ in store.top_resumes('j0', k=10)] == ['r1', 'r0', 'r2']
+    assert store.top_jds('r3', k=10) == [('j1', pytest.approx(0.7, abs=1e-3))]
+
+
+def test_rewriting_a_cell_keeps_its_position(tmp_path):
+    store = ScoreStore(str(tmp_path), tile_size=2)
+    store.write(['r0', 'r1'], ['j0'], [[0.1], [0.2]])
+    store.write(['r1'], ['j0'], [[0.8]])
+
+    assert store.resume_ids == ['r0', 'r1']
+    assert store.get('r1', 'j0') == pytest.approx(0.8, abs=1e-3)
+
+
+def test_rejects_a_block_of_the_wrong_shape(tmp_path):
+    store = ScoreStore(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        store.write(['r0', 'r1'], ['j0'], [[0.1, 0.2]])
+
+
+def test_rejects_an_unknown_dtype(tmp_path):
+    with pytest.raises(ValueError):
+        ScoreStore(str(tmp_path), dtype='float64')
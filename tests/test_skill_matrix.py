@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import SKILLS_PATH
+from skill_matrix import SkillMatrix
+
+
+@pytest.fixture(scope='module')
+def skill_matrix():
+    return SkillMatrix.from_file(SKILLS_PATH)
+
+
+@pytest.mark.parametrize('name, skill', [
+    ('Python', 'Python'),
+    ('python ', 'Python'),
+    ('go', 'Go'),
+    ('golang', 'Go'),
+    ('C#', 'C#'),
+    ('csharp', 'C#'),
+    ('postgres', 'PostgreSQL'),
+    ('sql server', 'Microsoft SQL Server'),
+    ('SQL Server', 'Microsoft SQL Server'),
+    ('mssql', 'Microsoft SQL Server'),
+    ('aws', 'Amazon Web Services (AWS)'),
+    ('Amazon Web Services', 'Amazon Web Services (AWS)'),
+    ('bash', 'Scripting (Bash, PowerShell)'),
+])
+def test_resolve_names_and_aliases(skill_matrix, name, skill):
+    assert skill_matrix.resolve([name]) == {skill}
+
+
+@pytest.mark.parametrize('name', ['Hadoop developer', 'senior python developer', 'python, sql', 'cobol', ''])
+def test_resolve_rejects_phrases_and_unknown_names(skill_matrix, name):
+    with pytest.raises(ValueError):
+        skill_matrix.resolve([name])
+
+
+def test_resolve_follows_matcher_case_rules(skill_matrix):
+    # Aliases of two characters or fewer only match with their dictionary casing
+    assert skill_matrix.resolve(['js']) == {'JavaScript'}
+    assert skill_matrix.matcher.find('JS') == set()
+    with pytest.raises(ValueError):
+        skill_matrix.resolve(['JS'])
+
+
+def test_eligible_requires_every_must_have(skill_matrix):
+    resumes = skill_matrix.encode(["Python and PostgreSQL", "Python only", "Java with Postgres"])
+    must_have = skill_matrix.encode_must_have([['python', 'postgres'], ['sql server']])
+
+    mask = skill_matrix.eligible(skill_matrix.bitsets(resumes), skill_matrix.bitsets(must_have))
+
+    assert mask.tolist() == [[True, False], [False, False], [False, False]]